@@ -0,0 +1,130 @@
+"""
+handshake.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# Measure the latency of the first message after connecting, against a local
+# server that sends it in the same write as its handshake response.
+#
+# Usage: python benchmarks/handshake.py [connections]
+#
+# The wss:// case needs the openssl command, to create a self-signed
+# certificate.
+
+import hashlib
+import os
+import shutil
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from base64 import encodebytes as base64encode
+
+import websocket
+from websocket._abnf import ABNF
+
+# Headers a typical server sends, for a response of about 1 KB.
+EXTRA_HEADERS = "".join(f"X-Header-{i}: {'x' * 40}\r\n" for i in range(15))
+
+
+def serve(server: socket.socket, context) -> None:
+    while True:
+        try:
+            conn, _ = server.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if context:
+                conn = context.wrap_socket(conn, server_side=True)
+        except OSError:
+            return
+        with conn:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            key = request.split(b"Sec-WebSocket-Key: ")[1].split(b"\r\n")[0]
+            key += b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+            accept = base64encode(hashlib.sha1(key).digest()).strip().decode()
+            conn.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                    f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n"
+                    f"{EXTRA_HEADERS}\r\n"
+                ).encode()
+                + ABNF(1, 0, 0, 0, ABNF.OPCODE_TEXT, 0, b"welcome").format()
+            )
+            try:
+                conn.recv(4096)
+            except OSError:
+                pass
+
+
+def measure(url: str, connections: int, sslopt: dict) -> list:
+    latencies = []
+    for _ in range(connections):
+        start = time.perf_counter()
+        ws = websocket.create_connection(url, sslopt=sslopt)
+        ws.recv()
+        latencies.append(time.perf_counter() - start)
+        ws.shutdown()
+    return latencies
+
+
+def create_context(directory: str):
+    if not shutil.which("openssl"):
+        return None
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "ec", "-nodes", "-days", "1"]
+        + ["-pkeyopt", "ec_paramgen_curve:prime256v1", "-subj", "/CN=localhost"]
+        + ["-keyout", keyfile, "-out", certfile],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def main() -> None:
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [("ws", None)]
+        context = create_context(directory)
+        if context:
+            cases.append(("wss", context))
+        else:
+            print("openssl not found, skipping wss://")
+        print(f"{'':>6}{'median':>12}{'p99':>12}")
+        for scheme, context in cases:
+            server = socket.create_server(("127.0.0.1", 0))
+            threading.Thread(target=serve, args=(server, context), daemon=True).start()
+            url = f"{scheme}://127.0.0.1:{server.getsockname()[1]}/"
+            latencies = measure(url, connections, {"cert_reqs": ssl.CERT_NONE})
+            server.close()
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(
+                f"{scheme:>6}{statistics.median(latencies) * 1e3:>10.3f}ms"
+                f"{p99 * 1e3:>10.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+mask.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# Compare the available payload masking backends.
+#
+# Usage: python benchmarks/mask.py
+#
+# Install numpy and/or wsaccel to include their backends in the comparison.
+
+import os
+import timeit
+
+from websocket._abnf import _mask, _mask_backends, _mask_small
+
+SIZES = (16, 125, 1024, 4096, 65536, 1 << 20, 16 << 20)
+
+
+def main() -> None:
+    mask_key = os.urandom(4)
+    backends = {"bigint": _mask_small}
+    backends.update(_mask_backends)
+    print(f"default backend: {_mask.__name__}")
+    print(f"{'size':>10}" + "".join(f"{name:>14}" for name in backends))
+    for size in SIZES:
+        data = os.urandom(size)
+        number = max(3, (4 << 20) // size)
+        row = f"{size:>10}"
+        for backend in backends.values():
+            seconds = min(
+                timeit.repeat(lambda: backend(mask_key, data), number=number, repeat=3)
+            )
+            row += f"{seconds / number * 1e6:>12.1f}us"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,9 +22,14 @@
     WebSocketApp as WebSocketApp,
     set_reconnect as set_reconnect,
 )
+from ._asyncio import *  # noqa: F401,F403
 from ._core import *  # noqa: F401,F403
+from ._dispatcher import WebSocketHub as WebSocketHub  # noqa: F401
+from ._dns import *  # noqa: F401,F403
 from ._exceptions import *  # noqa: F401,F403
 from ._logging import *  # noqa: F401,F403
+from ._metrics import *  # noqa: F401,F403
+from ._pool import *  # noqa: F401,F403
 from ._socket import *  # noqa: F401,F403
 
 __version__ = "1.9.0"
@@ -1,12 +1,19 @@
 import array
 import os
+import random
 import struct
 import sys
+from collections import deque
 from threading import Lock
 from typing import Callable, Optional, Union, Any
 
-from ._exceptions import WebSocketPayloadException, WebSocketProtocolException
-from ._utils import validate_utf8
+from ._exceptions import (
+    WebSocketMessageTooBigException,
+    WebSocketPayloadException,
+    WebSocketProtocolException,
+)
+from ._logging import FrameCapture
+from ._utils import Utf8Validator, validate_utf8
 
 """
 _abnf.py
@@ -27,32 +34,100 @@
 limitations under the License.
 """
 
+native_byteorder = sys.byteorder
+
+# Payloads smaller than this are masked as a single big integer. Larger
+# payloads are masked in place in a bytearray, which is returned as is: it
+# avoids building a mask as long as the payload, and keeps the peak memory
+# close to a single copy of the payload.
+_MASK_SMALL_SIZE = 4096
+_MASK_CHUNK_SIZE = 1 << 18
+
+# bytes.translate() tables, as integers: the identity table and the
+# multiplier that repeats a byte over the whole table.
+_IDENTITY_TABLE = int.from_bytes(bytes(range(256)), "big")
+_REPEAT_TABLE = int.from_bytes(b"\x01" * 256, "big")
+
+
+def _mask_small(mask_value: bytes, data_value: bytes) -> bytes:
+    datalen = len(data_value)
+    int_data_value = int.from_bytes(data_value, native_byteorder)
+    int_mask_value = int.from_bytes(
+        mask_value * (datalen // 4) + mask_value[: datalen % 4], native_byteorder
+    )
+    return (int_data_value ^ int_mask_value).to_bytes(datalen, native_byteorder)
+
+
+def _mask_python(mask_value: bytes, data_value: bytes) -> Union[bytes, bytearray]:
+    datalen = len(data_value)
+    if datalen < _MASK_SMALL_SIZE:
+        return _mask_small(mask_value, data_value)
+
+    # Every 4th byte is xored with the same mask byte, so each of the 4
+    # strides is masked with a bytes.translate() table.
+    tables = [
+        (_IDENTITY_TABLE ^ key * _REPEAT_TABLE).to_bytes(256, "big")
+        for key in mask_value
+    ]
+    masked = bytearray(data_value)
+    for start in range(0, datalen, _MASK_CHUNK_SIZE):
+        end = min(start + _MASK_CHUNK_SIZE, datalen)
+        for i, table in enumerate(tables):
+            masked[start + i : end : 4] = masked[start + i : end : 4].translate(table)
+    return masked
+
+
+# Available masking backends, by name. _mask is the fastest one available.
+_mask_backends: dict[str, Callable[[bytes, bytes], Union[bytes, bytearray]]] = {
+    "python": _mask_python
+}
+_mask = _mask_python
+
 try:
-    # If wsaccel is available, use compiled routines to mask data.
-    # wsaccel only provides around a 10% speed boost compared
-    # to the websocket-client _mask() implementation.
+    # If wsaccel is available, use compiled routines to mask small data.
+    # wsaccel only provides around a 10% speed boost compared to
+    # _mask_small(), so larger payloads are left to _mask_python().
     # Note that wsaccel is unmaintained.
     from wsaccel.xormask import XorMaskerSimple
 
-    def _mask(mask_value: array.array, data_value: array.array) -> bytes:
-        mask_result: bytes = XorMaskerSimple(mask_value).process(data_value)
+    def _mask_wsaccel(mask_value: bytes, data_value: bytes) -> Union[bytes, bytearray]:
+        if len(data_value) >= _MASK_SMALL_SIZE:
+            return _mask_python(mask_value, data_value)
+        mask_result: bytes = XorMaskerSimple(array.array("B", mask_value)).process(
+            array.array("B", data_value)
+        )
         return mask_result
 
+    _mask_backends["wsaccel"] = _mask = _mask_wsaccel
 except ImportError:
-    # wsaccel is not available, use websocket-client _mask()
-    native_byteorder = sys.byteorder
+    pass
+
+try:
+    # If numpy is available, large payloads are xored 8 bytes at a time.
+    # For small payloads the call overhead of numpy outweighs the gain.
+    import numpy
 
-    def _mask(mask_value: array.array, data_value: array.array) -> bytes:
+    def _mask_numpy(mask_value: bytes, data_value: bytes) -> Union[bytes, bytearray]:
         datalen = len(data_value)
-        int_data_value = int.from_bytes(data_value, native_byteorder)
-        int_mask_value = int.from_bytes(
-            mask_value * (datalen // 4) + mask_value[: datalen % 4], native_byteorder
-        )
-        return (int_data_value ^ int_mask_value).to_bytes(datalen, native_byteorder)
+        if datalen < _MASK_SMALL_SIZE:
+            return _mask_small(mask_value, data_value)
+
+        masked = bytearray(data_value)
+        words = datalen // 8
+        view = numpy.frombuffer(masked, dtype=numpy.uint64, count=words)
+        view ^= numpy.frombuffer(mask_value * 2, dtype=numpy.uint64)
+        for i in range(words * 8, datalen):
+            masked[i] ^= mask_value[i % 4]
+        return masked
+
+    _mask_backends["numpy"] = _mask = _mask_numpy
+except ImportError:
+    pass
 
 
 __all__ = [
     "ABNF",
+    "fast_mask_key",
     "continuous_frame",
     "frame_buffer",
     "STATUS_NORMAL",
@@ -103,6 +178,30 @@ def _mask(mask_value: array.array, data_value: array.array) -> bytes:
 )
 
 
+_ZERO_MASK_KEY = b"\x00\x00\x00\x00"
+
+# Extended payload lengths of the frame header.
+_UNPACK_LENGTH_16 = struct.Struct("!H").unpack_from
+_UNPACK_LENGTH_63 = struct.Struct("!Q").unpack_from
+
+
+def fast_mask_key(length: int) -> bytes:
+    """
+    Create a mask key without a syscall, using a non-cryptographic
+    pseudo-random generator. See WebSocket.set_mask_key.
+
+    RFC 6455 requires unpredictable mask keys, to protect intermediaries
+    from cache poisoning by malicious payloads. Only use this generator
+    when talking to trusted servers without untrusted proxies in between.
+
+    Parameters
+    ----------
+    length: int
+        length of the mask key.
+    """
+    return random.randbytes(length)
+
+
 class ABNF:
     """
     ABNF frame class.
@@ -143,6 +242,18 @@ class ABNF:
     LENGTH_16 = 1 << 16
     LENGTH_63 = 1 << 63
 
+    # A frame is created for every frame received, slots keep them small.
+    __slots__ = (
+        "fin",
+        "rsv1",
+        "rsv2",
+        "rsv3",
+        "opcode",
+        "mask_value",
+        "data",
+        "get_mask_key",
+    )
+
     def __init__(
         self,
         fin: int = 0,
@@ -167,15 +278,23 @@ def __init__(
         self.data = data
         self.get_mask_key = os.urandom
 
-    def validate(self, skip_utf8_validation: bool = False) -> None:
+    def validate(
+        self, skip_utf8_validation: bool = False, allow_rsv1: bool = False
+    ) -> None:
         """
         Validate the ABNF frame.
 
         Parameters
         ----------
         skip_utf8_validation: skip utf8 validation.
+        allow_rsv1: allow the RSV1 bit on the first frame of a message,
+            which permessage-deflate uses to flag compressed messages.
         """
-        if self.rsv1 or self.rsv2 or self.rsv3:
+        if self.rsv1 and not (
+            allow_rsv1 and self.opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY)
+        ):
+            raise WebSocketProtocolException("rsv is not implemented, yet")
+        if self.rsv2 or self.rsv3:
             raise WebSocketProtocolException("rsv is not implemented, yet")
 
         if self.opcode not in ABNF.OPCODES:
@@ -239,6 +358,19 @@ def format(self) -> bytes:
         """
         Format this object to string(byte array) to send data to server.
         """
+        return b"".join(self.format_buffers())
+
+    def format_buffers(self) -> list:
+        """
+        Format this object to the buffers to send to the server, without
+        copying the payload into the same bytes object as the frame header.
+
+        Returns
+        -------
+        buffers: list
+            the frame header (including the mask key), followed by the
+            (masked) payload if it is not empty.
+        """
         if any(x not in (0, 1) for x in [self.fin, self.rsv1, self.rsv2, self.rsv3]):
             raise ValueError("not 0 or 1")
         if self.opcode not in ABNF.OPCODES:
@@ -266,9 +398,17 @@ def format(self) -> bytes:
         if not self.mask_value:
             if isinstance(self.data, str):
                 self.data = self.data.encode("utf-8")
-            return frame_header + self.data
-        mask_key = self.get_mask_key(4)
-        return frame_header + self._get_masked(mask_key)
+            payload = self.data
+        else:
+            mask_key = self.get_mask_key(4)
+            payload = ABNF.mask(mask_key, self.data)
+            if isinstance(mask_key, str):
+                mask_key = mask_key.encode("utf-8")
+            frame_header += mask_key
+
+        if not length:
+            return [frame_header]
+        return [frame_header, payload]
 
     def _get_masked(self, mask_key: Union[str, bytes]) -> bytes:
         s = ABNF.mask(mask_key, self.data)
@@ -279,7 +419,9 @@ def _get_masked(self, mask_key: Union[str, bytes]) -> bytes:
         return mask_key + s
 
     @staticmethod
-    def mask(mask_key: Union[str, bytes], data: Union[str, bytes]) -> bytes:
+    def mask(
+        mask_key: Union[str, bytes], data: Union[str, bytes]
+    ) -> Union[bytes, bytearray]:
         """
         Mask or unmask data. Just do xor for each byte
 
@@ -289,6 +431,12 @@ def mask(mask_key: Union[str, bytes], data: Union[str, bytes]) -> bytes:
             4 byte mask.
         data: bytes or str
             data to mask/unmask.
+
+        Returns
+        -------
+        masked: bytes or bytearray
+            Large payloads are returned as the bytearray they were masked
+            in, rather than copied to bytes.
         """
         if data is None:
             data = ""
@@ -299,21 +447,55 @@ def mask(mask_key: Union[str, bytes], data: Union[str, bytes]) -> bytes:
         if isinstance(data, str):
             data = data.encode("latin-1")
 
-        return _mask(array.array("B", mask_key), array.array("B", data))
+        if mask_key == _ZERO_MASK_KEY:
+            # Masking with an all-zero key leaves the data unchanged.
+            return bytes(data)
+
+        return _mask(mask_key, data)
 
 
 class frame_buffer:
     _HEADER_MASK_INDEX = 5
     _HEADER_LENGTH_INDEX = 6
+    # Initial capacity of the receive buffer. It grows to fit the largest
+    # frame received and is shrunk back once drained, if it grew beyond
+    # _MAX_RETAINED_BUFFER_SIZE.
+    _BUFFER_SIZE = 16384
+    _MAX_RETAINED_BUFFER_SIZE = 1 << 20
 
     def __init__(
-        self, recv_fn: Callable[[int], int], skip_utf8_validation: bool
+        self,
+        recv_fn: Optional[Callable[[int], int]],
+        skip_utf8_validation: bool,
+        recv_into_fn: Optional[Callable[[memoryview], int]] = None,
+        max_payload_size: Optional[int] = None,
     ) -> None:
+        # recv_fn may be None if the data is passed to feed() instead.
         self.recv = recv_fn
+        self.recv_into = recv_into_fn
         self.skip_utf8_validation = skip_utf8_validation
+        # Frames announcing a larger payload are refused before it is read.
+        self.max_payload_size = max_payload_size
+        # Set once permessage-deflate is negotiated.
+        self.allow_rsv1 = False
         # Buffers over the packets from the layer beneath until desired amount
-        # bytes of bytes are received.
-        self.recv_buffer: list = []
+        # bytes of bytes are received. Unread bytes are kept in
+        # recv_buffer[_buffer_start:_buffer_end], the rest is free space
+        # that recv_into_fn reads into.
+        self.recv_buffer = bytearray(self._BUFFER_SIZE)
+        self._buffer_start = 0
+        self._buffer_end = 0
+        # Complete frames parsed from the buffer, waiting to be returned.
+        self.frames: deque = deque()
+        # Payload bytes of the frame started by recv_frame_start() that
+        # recv_payload() has not returned yet.
+        self.payload_remaining = 0
+        self._payload_mask: Optional[Union[bytes, str]] = None
+        self._payload_offset = 0
+        # Records the raw bytes of the received frames when set, see
+        # FrameCapture. _raw collects the parts of the frame being read.
+        self.capture: Optional[FrameCapture] = None
+        self._raw: Optional[list] = None
         self.clear()
         self.lock = Lock()
 
@@ -326,6 +508,8 @@ def needs_header(self) -> bool:
         return self.header is None
 
     def recv_header(self) -> None:
+        if self.capture is not None and self.capture.sample():
+            self._raw = []
         header = self.recv_strict(2)
         b1 = header[0]
         fin = b1 >> 7 & 1
@@ -370,44 +554,241 @@ def recv_mask(self) -> None:
 
     def recv_frame(self) -> ABNF:
         with self.lock:
-            # Header
-            if self.needs_header():
-                self.recv_header()
-            if self.header is None:
-                raise WebSocketProtocolException("Header not received")
-            (fin, rsv1, rsv2, rsv3, opcode, has_mask, _) = self.header
-
-            # Frame length
-            if self.needs_length():
-                self.recv_length()
-            length = self.length
-
-            # Mask
-            if self.needs_mask():
-                self.recv_mask()
-            mask_value = self.mask_value
-
-            # Payload
-            if length is None:
-                raise WebSocketProtocolException("Length not received")
-            payload = self.recv_strict(length)
-            if has_mask:
-                if mask_value is None:
-                    raise WebSocketProtocolException("Mask not received")
-                payload = ABNF.mask(mask_value, payload)
+            if self.frames:
+                frame = self.frames.popleft()
+            else:
+                frame = self._recv_frame()
+                # Queue every other complete frame that arrived with the
+                # same read(s), so they are returned without more syscalls.
+                while buffered_frame := self._recv_buffered_frame():
+                    self.frames.append(buffered_frame)
+            frame.validate(self.skip_utf8_validation, self.allow_rsv1)
 
-            # Reset for next frame
-            self.clear()
+        return frame
 
-            frame = ABNF(fin, rsv1, rsv2, rsv3, opcode, has_mask, payload)
-            frame.validate(self.skip_utf8_validation)
+    def recv_frame_start(self) -> ABNF:
+        """
+        Receive the next frame, without the payload of a data frame that
+        has not been received yet. Its data is then empty, and
+        payload_remaining bytes of payload are to be read with
+        recv_payload() before the next frame.
+        """
+        with self.lock:
+            if self.frames:
+                frame = self.frames.popleft()
+            else:
+                if self.needs_header():
+                    self.recv_header()
+                if self.header is None:
+                    raise WebSocketProtocolException("Header not received")
+                fin, rsv1, rsv2, rsv3, opcode, has_mask, _ = self.header
+                if opcode & 0x8:
+                    # Control frames are small and always read at once.
+                    frame = self._recv_frame()
+                else:
+                    if self.needs_length():
+                        self.recv_length()
+                    if self.needs_mask():
+                        self.recv_mask()
+                    self._check_length(self.length or 0)
+                    frame = ABNF(fin, rsv1, rsv2, rsv3, opcode, has_mask, b"")
+                    self.payload_remaining = self.length or 0
+                    self._payload_mask = self.mask_value
+                    self._payload_offset = 0
+                    self.clear()
+                    if not self.payload_remaining:
+                        self._record_raw()
+            frame.validate(self.skip_utf8_validation, self.allow_rsv1)
 
         return frame
 
+    def feed(self, data: bytes) -> None:
+        """
+        Add data received from the server by other means than recv_fn,
+        e.g. from an asyncio stream or along with the handshake response.
+        The frames it completes are queued, see next_frame().
+        """
+        with self.lock:
+            self._reserve(len(data))
+            end = self._buffer_end
+            self.recv_buffer[end : end + len(data)] = data
+            self._buffer_end += len(data)
+            while buffered_frame := self._recv_buffered_frame():
+                self.frames.append(buffered_frame)
+
+    def next_frame(self) -> Optional[ABNF]:
+        """
+        Parse the next frame from the data passed to feed(), without
+        receiving anything. Returns None if the frame is not complete yet.
+        """
+        with self.lock:
+            if self.frames:
+                frame = self.frames.popleft()
+            else:
+                frame = self._recv_buffered_frame()
+                if frame is None:
+                    if self.length is not None:
+                        # Refuse a too large frame before its payload arrives.
+                        self._check_length(self.length)
+                    return None
+            frame.validate(self.skip_utf8_validation, self.allow_rsv1)
+
+        return frame
+
+    def recv_payload(self, bufsize: int) -> bytes:
+        """
+        Receive up to bufsize bytes of the payload of the frame started by
+        recv_frame_start().
+        """
+        with self.lock:
+            data = self.recv_strict(min(bufsize, self.payload_remaining))
+            if self._payload_mask:
+                # Rotate the mask key to where this chunk starts.
+                offset = self._payload_offset % 4
+                mask = self._payload_mask[offset:] + self._payload_mask[:offset]
+                data = bytes(ABNF.mask(mask, data))
+            self._payload_offset += len(data)
+            self.payload_remaining -= len(data)
+            if not self.payload_remaining:
+                self._record_raw()
+
+        return data
+
+    def _recv_frame(self) -> ABNF:
+        # Header
+        if self.needs_header():
+            self.recv_header()
+        if self.header is None:
+            raise WebSocketProtocolException("Header not received")
+        (fin, rsv1, rsv2, rsv3, opcode, has_mask, _) = self.header
+
+        # Frame length
+        if self.needs_length():
+            self.recv_length()
+        length = self.length
+
+        # Mask
+        if self.needs_mask():
+            self.recv_mask()
+        mask_value = self.mask_value
+
+        # Payload
+        if length is None:
+            raise WebSocketProtocolException("Length not received")
+        self._check_length(length)
+        payload = self.recv_strict(length)
+        if has_mask:
+            if mask_value is None:
+                raise WebSocketProtocolException("Mask not received")
+            payload = bytes(ABNF.mask(mask_value, payload))
+
+        # Reset for next frame
+        self.clear()
+        self._record_raw()
+
+        return ABNF(fin, rsv1, rsv2, rsv3, opcode, has_mask, payload)
+
+    def _record_raw(self) -> None:
+        if self._raw is not None:
+            if self.capture is not None:
+                self.capture.record("recv", self._raw)
+            self._raw = None
+
+    def _recv_buffered_frame(self) -> Optional[ABNF]:
+        # Parse the next frame only if it has been received completely.
+        # Otherwise the parts already buffered are consumed and the frame
+        # is completed by the next recv_frame() call.
+        if self.needs_header():
+            frame = self._parse_buffered_frame()
+            if frame is not None:
+                return frame
+            if self.buffered() < 2:
+                return None
+            self.recv_header()
+        if self.header is None:
+            raise WebSocketProtocolException("Header not received")
+
+        if self.needs_length():
+            length_bits = self.header[frame_buffer._HEADER_LENGTH_INDEX] & 0x7F
+            if self.buffered() < {0x7E: 2, 0x7F: 8}.get(length_bits, 0):
+                return None
+            self.recv_length()
+
+        if self.needs_mask():
+            if self.has_mask() and self.buffered() < 4:
+                return None
+            self.recv_mask()
+
+        if self.buffered() < (self.length or 0):
+            return None
+        if self.max_payload_size and self.length > self.max_payload_size:
+            # Refused by the next recv_frame() call, once the frames
+            # before it have been returned.
+            return None
+        return self._recv_frame()
+
+    def _parse_buffered_frame(self) -> Optional[ABNF]:
+        # Parse a frame that is in the buffer as a whole in one go, without
+        # the header state of recv_header(), recv_length() and recv_mask().
+        # Returns None to leave other frames to them.
+        start = self._buffer_start
+        available = self._buffer_end - start
+        if available < 2:
+            return None
+        buf = self.recv_buffer
+        b1 = buf[start]
+        b2 = buf[start + 1]
+        length = b2 & 0x7F
+        offset = start + 2
+        if length == 0x7E:
+            if available < 4:
+                return None
+            length = _UNPACK_LENGTH_16(buf, offset)[0]
+            offset += 2
+        elif length == 0x7F:
+            if available < 10:
+                return None
+            length = _UNPACK_LENGTH_63(buf, offset)[0]
+            offset += 8
+        has_mask = b2 >> 7
+        end = offset + has_mask * 4 + length
+        if end > self._buffer_end or (
+            self.max_payload_size and length > self.max_payload_size
+        ):
+            return None
+        with memoryview(buf) as view:
+            if self.capture is not None and self.capture.sample():
+                self.capture.record("recv", [view[start:end]])
+            if has_mask:
+                mask_key = bytes(view[offset : offset + 4])
+                payload = bytes(ABNF.mask(mask_key, view[offset + 4 : end]))
+            else:
+                payload = bytes(view[offset:end])
+        self._consume(end - start)
+        return ABNF(
+            b1 >> 7, b1 >> 6 & 1, b1 >> 5 & 1, b1 >> 4 & 1, b1 & 0xF, has_mask, payload
+        )
+
+    def _check_length(self, length: int) -> None:
+        if self.max_payload_size and length > self.max_payload_size:
+            raise WebSocketMessageTooBigException(
+                f"Frame payload is larger than {self.max_payload_size} bytes"
+            )
+
+    def buffered(self) -> int:
+        """
+        Number of received bytes that have not been consumed yet.
+        """
+        return self._buffer_end - self._buffer_start
+
     def recv_strict(self, bufsize: int) -> bytes:
         if not isinstance(bufsize, int):
             raise ValueError("bufsize must be an integer")
-        shortage = bufsize - sum(len(buf) for buf in self.recv_buffer)
+        shortage = bufsize - self.buffered()
+        if shortage > 0:
+            # Read ahead, so that small frames following this one can be
+            # parsed from the buffer without further recv() calls.
+            self._reserve(max(shortage, self._BUFFER_SIZE))
         while shortage > 0:
             # Limit buffer size that we pass to socket.recv() to avoid
             # fragmenting the heap -- the number of bytes recv() actually
@@ -415,30 +796,80 @@ def recv_strict(self, bufsize: int) -> bytes:
             # yet passing large numbers repeatedly causes lots of large
             # buffers allocated and then shrunk, which results in
             # fragmentation.
-            bytes_ = self.recv(min(16384, shortage))
-            if isinstance(bytes_, bytes):
-                self.recv_buffer.append(bytes_)
-                shortage -= len(bytes_)
-            else:
-                # Handle case where recv returns int or other type
+            free = len(self.recv_buffer) - self._buffer_end
+            received = self._fill(min(16384, free))
+            if not received:
                 break
-
-        unified = b"".join(self.recv_buffer)
-
-        if shortage == 0:
-            self.recv_buffer = []
-            return unified
+            shortage -= received
+
+        start = self._buffer_start
+        end = min(start + bufsize, self._buffer_end)
+        # This is the only copy of the received bytes.
+        with memoryview(self.recv_buffer) as view:
+            data = bytes(view[start:end])
+        self._consume(end - start)
+        if self._raw is not None:
+            self._raw.append(data)
+        return data
+
+    def _reserve(self, size: int) -> None:
+        # Make room for size more bytes after the unread data, moving the
+        # unread data to the front of the buffer and growing it if needed.
+        buf = self.recv_buffer
+        if self._buffer_end + size <= len(buf):
+            return
+        if self._buffer_start:
+            del buf[: self._buffer_start]
+            self._buffer_end -= self._buffer_start
+            self._buffer_start = 0
+        missing = self._buffer_end + size - len(buf)
+        if missing > 0:
+            buf.extend(bytes(missing))
+
+    def _fill(self, size: int) -> int:
+        # Read up to size bytes into the free space of the buffer, which
+        # must have been made available with _reserve().
+        end = self._buffer_end
+        if self.recv_into is not None:
+            with memoryview(self.recv_buffer) as view, view[end : end + size] as free:
+                received = self.recv_into(free)
+            if not isinstance(received, int):
+                return 0
         else:
-            self.recv_buffer = [unified[bufsize:]]
-            return unified[:bufsize]
+            bytes_ = self.recv(size)
+            if not isinstance(bytes_, bytes):
+                # Handle case where recv returns int or other type
+                return 0
+            received = len(bytes_)
+            self.recv_buffer[end : end + received] = bytes_
+        self._buffer_end += received
+        return received
+
+    def _consume(self, size: int) -> None:
+        self._buffer_start += size
+        if self._buffer_start == self._buffer_end:
+            self._buffer_start = self._buffer_end = 0
+            if len(self.recv_buffer) > self._MAX_RETAINED_BUFFER_SIZE:
+                del self.recv_buffer[self._BUFFER_SIZE :]
 
 
 class continuous_frame:
-    def __init__(self, fire_cont_frame: bool, skip_utf8_validation: bool) -> None:
+    def __init__(
+        self,
+        fire_cont_frame: bool,
+        skip_utf8_validation: bool,
+        max_message_size: Optional[int] = None,
+    ) -> None:
         self.fire_cont_frame = fire_cont_frame
         self.skip_utf8_validation = skip_utf8_validation
+        self.max_message_size = max_message_size
+        # Opcode and list of the fragments received so far, joined once
+        # the message is extracted.
         self.cont_data: Optional[list[Any]] = None
         self.recving_frames: Optional[int] = None
+        self.message_size = 0
+        # Text messages are validated fragment by fragment as they arrive.
+        self.utf8_validator = Utf8Validator()
 
     def validate(self, frame: ABNF) -> None:
         if not self.recving_frames and frame.opcode == ABNF.OPCODE_CONT:
@@ -450,12 +881,27 @@ def validate(self, frame: ABNF) -> None:
             raise WebSocketProtocolException("Illegal frame")
 
     def add(self, frame: ABNF) -> None:
+        if frame.opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+            self.message_size = 0
+            self.utf8_validator.reset()
+        self.message_size += len(frame.data)
+        if self.max_message_size and self.message_size > self.max_message_size:
+            raise WebSocketMessageTooBigException(
+                f"Message is larger than {self.max_message_size} bytes"
+            )
+        if (
+            ABNF.OPCODE_TEXT in (frame.opcode, self.recving_frames)
+            and not self.skip_utf8_validation
+            and not self.utf8_validator.validate(frame.data, frame.fin)
+        ):
+            raise WebSocketPayloadException(f"cannot decode: {repr(frame.data)}")
+
         if self.cont_data:
-            self.cont_data[1] += frame.data
+            self.cont_data[1].append(frame.data)
         else:
             if frame.opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
                 self.recving_frames = frame.opcode
-            self.cont_data = [frame.opcode, frame.data]
+            self.cont_data = [frame.opcode, [frame.data]]
 
         if frame.fin:
             self.recving_frames = None
@@ -468,15 +914,5 @@ def extract(self, frame: ABNF) -> tuple:
         if data is None:
             raise WebSocketProtocolException("No continuation data available")
         self.cont_data = None
-        frame.data = data[1]
-        if (
-            not self.fire_cont_frame
-            and data is not None
-            and data[0] == ABNF.OPCODE_TEXT
-            and not self.skip_utf8_validation
-            and not validate_utf8(frame.data)
-        ):
-            raise WebSocketPayloadException(f"cannot decode: {repr(frame.data)}")
-        if data is None:
-            raise WebSocketProtocolException("No continuation data available")
+        frame.data = b"".join(data[1])
         return data[0], frame
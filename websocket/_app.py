@@ -1,20 +1,33 @@
+import heapq
 import inspect
+import itertools
+import math
 import socket
+import struct
 import threading
 import time
-from typing import Any, Callable, Optional, Union
+from collections import deque
+from typing import Any, Callable, Iterable, Optional, Union
 
 from . import _logging
 from ._abnf import ABNF
-from ._core import WebSocket, getdefaulttimeout
+from ._core import DEFAULT_FRAGMENT_SIZE, WebSocket, getdefaulttimeout
 from ._exceptions import (
     WebSocketConnectionClosedException,
     WebSocketException,
     WebSocketTimeoutException,
 )
+from ._metrics import Metrics
 from ._ssl_compat import SSLEOFError
 from ._url import parse_url
-from ._dispatcher import Dispatcher, DispatcherBase, SSLDispatcher, WrappedDispatcher
+from ._dispatcher import (
+    Dispatcher,
+    DispatcherBase,
+    HubDispatcher,
+    SSLDispatcher,
+    WebSocketHub,
+    WrappedDispatcher,
+)
 
 """
 _app.py
@@ -45,6 +58,94 @@ def set_reconnect(reconnectInterval: int) -> None:
     RECONNECT = reconnectInterval
 
 
+class _PingScheduler:
+    """
+    Timers for the pings of all WebSocketApps, run by one thread that is
+    started on demand and exits when no timer is left.
+    """
+
+    def __init__(self) -> None:
+        # Heap of timers: deadline, sequence number, interval, callback.
+        self.timers: list = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+    def schedule(self, seconds: float, callback: Callable[[], bool]) -> None:
+        """
+        Call callback in seconds, and again every seconds as long as it
+        returns True.
+        """
+        with self.condition:
+            heapq.heappush(
+                self.timers,
+                (time.monotonic() + seconds, next(self.sequence), seconds, callback),
+            )
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name="websocket-ping", daemon=True
+                )
+                self.thread.start()
+            else:
+                self.condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while True:
+                    if not self.timers:
+                        self.thread = None
+                        return
+                    deadline = self.timers[0][0]
+                    now = time.monotonic()
+                    if deadline <= now:
+                        break
+                    self.condition.wait(deadline - now)
+                _, _, seconds, callback = heapq.heappop(self.timers)
+            try:
+                again = callback()
+            except Exception as e:
+                _logging.error(f"error from ping timer {callback}: {e}")
+                again = False
+            if again:
+                self.schedule(seconds, callback)
+
+
+_ping_scheduler = _PingScheduler()
+
+# Appended to the ping payload of WebSocketApp, and echoed in the pong: the
+# sequence number of the ping and time.monotonic_ns() when it was sent.
+_PING_TAG = struct.Struct("!QQ")
+_MAX_PING_PAYLOAD = 125 - _PING_TAG.size
+# Pings kept waiting for their pong, when the server doesn't answer.
+_MAX_OUTSTANDING_PINGS = 16
+
+
+class _RTTWindow:
+    """
+    Round trip times of the last pings, in seconds.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.samples: deque = deque(maxlen=size)
+
+    def add(self, rtt: float) -> None:
+        self.samples.append(rtt)
+
+    def stats(self) -> dict:
+        samples = list(self.samples)
+        if not samples:
+            return {"count": 0, "last": None, "min": None, "avg": None, "p99": None}
+        ordered = sorted(samples)
+        return {
+            "count": len(samples),
+            "last": samples[-1],
+            "min": ordered[0],
+            "avg": sum(samples) / len(samples),
+            "p99": ordered[math.ceil(len(ordered) * 0.99) - 1],
+        }
+
+
 class WebSocketApp:
     """
     Higher level of APIs are provided. The interface is like JavaScript WebSocket object.
@@ -74,6 +175,10 @@ def __init__(
         subprotocols: Optional[list[str]] = None,
         on_data: Optional[Callable] = None,
         socket: Optional[socket.socket] = None,
+        permessage_deflate: Union[bool, dict, None] = None,
+        frame_capture: Optional[_logging.FrameCapture] = None,
+        metrics: Optional[Metrics] = None,
+        rtt_window: int = 100,
     ) -> None:
         """
         WebSocketApp initialization
@@ -139,6 +244,19 @@ def __init__(
             List of available sub protocols. Default is None.
         socket: socket
             Pre-initialized stream socket.
+        permessage_deflate: bool or dict
+            Offer the permessage-deflate extension (RFC 7692), see
+            WebSocket.connect's docstring for the dict keys. Default is None.
+        frame_capture: FrameCapture
+            Keeps the raw bytes of the last frames sent and received, across
+            reconnects. Default is None.
+        metrics: Metrics
+            Counts the frames, bytes and socket calls of the connection,
+            across reconnects, and times its handshakes, pings and
+            callbacks. Default is None.
+        rtt_window: int
+            Number of ping round trip times kept for getrtt(). Default is
+            100.
         """
         self.url = url
         self.header = header if header is not None else []
@@ -158,12 +276,22 @@ def __init__(
         self.sock: Optional[WebSocket] = None
         self.last_ping_tm = float(0)
         self.last_pong_tm = float(0)
-        self.ping_thread: Optional[threading.Thread] = None
+        # time.monotonic() by which a pong must have arrived, if any.
+        self.pong_deadline: Optional[float] = None
+        # time.monotonic_ns() when the pings waiting for a pong were sent,
+        # by sequence number.
+        self.outstanding_pings: dict = {}
+        self.ping_sequence = itertools.count(1)
+        self.ping_lock = threading.Lock()
+        self.rtt_window = _RTTWindow(rtt_window)
         self.stop_ping: Optional[threading.Event] = None
         self.ping_interval = float(0)
         self.ping_timeout: Optional[Union[float, int]] = None
         self.ping_payload = ""
         self.subprotocols = subprotocols
+        self.permessage_deflate = permessage_deflate
+        self.frame_capture = frame_capture
+        self.metrics = metrics
         self.prepared_socket = socket
         self.has_errored = False
         self.has_done_teardown = False
@@ -199,56 +327,155 @@ def send_bytes(self, data: Union[bytes, bytearray]) -> None:
         if not self.sock or self.sock.send(data, ABNF.OPCODE_BINARY) == 0:
             raise WebSocketConnectionClosedException("Connection is already closed.")
 
+    def send_many(
+        self, data: Iterable[Union[bytes, str]], opcode: int = ABNF.OPCODE_TEXT
+    ) -> None:
+        """
+        send several messages at once, see WebSocket.send_many
+
+        Parameters
+        ----------
+        data: iterable of str or bytes
+            Messages to send. If you set opcode to OPCODE_TEXT,
+            each message must be utf-8 string or unicode.
+        opcode: int
+            Operation code of data. Default is OPCODE_TEXT.
+        """
+        if not self.sock:
+            raise WebSocketConnectionClosedException("Connection is already closed.")
+        self.sock.send_many(data, opcode)
+
+    def send_stream(
+        self,
+        source,
+        opcode: int = ABNF.OPCODE_BINARY,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+    ) -> None:
+        """
+        send a message read piece by piece from a file object, an mmap or
+        an iterable of chunks, see WebSocket.send_stream
+
+        Parameters
+        ----------
+        source: file object, bytes-like object or iterable
+            Source of the message payload.
+        opcode: int
+            Operation code of data. Default is OPCODE_BINARY.
+        fragment_size: int
+            Maximum payload size of each frame.
+        """
+        if not self.sock:
+            raise WebSocketConnectionClosedException("Connection is already closed.")
+        self.sock.send_stream(source, opcode, fragment_size)
+
     def close(self, **kwargs) -> None:
         """
         Close websocket connection.
         """
         self.keep_running = False
         if self.sock:
-            self.sock.close(**kwargs)
+            self._close_socket(self.sock, **kwargs)
             self.sock = None
 
-    def _start_ping_thread(self) -> None:
-        self.last_ping_tm = self.last_pong_tm = float(0)
-        self.stop_ping = threading.Event()
-        self.ping_thread = threading.Thread(target=self._send_ping)
-        self.ping_thread.daemon = True
-        self.ping_thread.start()
+    def _close_socket(self, sock: WebSocket, **kwargs) -> None:
+        # A hub must not wait for the close frame of the server.
+        if isinstance(sock.dispatcher, HubDispatcher):
+            sock.dispatcher.close(sock, **kwargs)
+        else:
+            sock.close(**kwargs)
+
+    def _start_ping(self) -> None:
+        self._reset_ping()
+        stop_ping = self.stop_ping = threading.Event()
+
+        def ping() -> bool:
+            if stop_ping.is_set() or not self.keep_running:
+                return False
+            self._ping()
+            return True
+
+        _ping_scheduler.schedule(self.ping_interval, ping)
 
-    def _stop_ping_thread(self) -> None:
+    def _stop_ping(self) -> None:
         if self.stop_ping:
             self.stop_ping.set()
-        if self.ping_thread and self.ping_thread.is_alive():
-            self.ping_thread.join(3)
-            # Handle thread leak - if thread doesn't terminate within timeout,
-            # force cleanup and log warning instead of abandoning the thread
-            if self.ping_thread.is_alive():
-                _logging.warning(
-                    "Ping thread failed to terminate within 3 seconds, "
-                    "forcing cleanup. Thread may be blocked."
-                )
-                # Force cleanup by clearing references even if thread is still alive
-                # The daemon thread will eventually be cleaned up by Python's GC
-                # but we prevent resource leaks by not holding references
-
-        # Always clean up references regardless of thread state
-        self.ping_thread = None
         self.stop_ping = None
+        self._reset_ping()
+
+    def _reset_ping(self) -> None:
         self.last_ping_tm = self.last_pong_tm = float(0)
+        with self.ping_lock:
+            self.pong_deadline = None
+            self.outstanding_pings.clear()
 
-    def _send_ping(self) -> None:
-        if self.stop_ping is None:
-            return
-        if self.stop_ping.wait(self.ping_interval) or self.keep_running is False:
+    def _ping_prefix(self) -> bytes:
+        if isinstance(self.ping_payload, str):
+            return self.ping_payload.encode("utf-8")
+        return self.ping_payload
+
+    def _ping(self) -> None:
+        if self.sock:
+            self.last_ping_tm = time.time()
+            sent = time.monotonic_ns()
+            with self.ping_lock:
+                sequence = next(self.ping_sequence)
+                self.outstanding_pings[sequence] = sent
+                if len(self.outstanding_pings) > _MAX_OUTSTANDING_PINGS:
+                    del self.outstanding_pings[next(iter(self.outstanding_pings))]
+                if self.ping_timeout and self.pong_deadline is None:
+                    self.pong_deadline = sent / 1e9 + self.ping_timeout
+            try:
+                _logging.debug("Sending ping")
+                # Pings are sent by timers shared with other connections,
+                # which must not wait for this one. A dropped ping still
+                # counts for the ping timeout, like a ping stuck in a full
+                # send buffer would.
+                payload = self._ping_prefix() + _PING_TAG.pack(sequence, sent)
+                if not self.sock.ping(payload, blocking=False):
+                    _logging.debug("Ping dropped, the connection is busy sending")
+            except Exception as e:
+                _logging.debug(f"Failed to send ping: {e}")
+
+    def _pong(self, data: bytes) -> None:
+        received = time.monotonic_ns()
+        self.last_pong_tm = time.time()
+        prefix = self._ping_prefix()
+        if len(data) != len(prefix) + _PING_TAG.size or not data.startswith(prefix):
+            # Unsolicited pongs don't answer the pings.
             return
-        while not self.stop_ping.wait(self.ping_interval) and self.keep_running is True:
-            if self.sock:
-                self.last_ping_tm = time.time()
-                try:
-                    _logging.debug("Sending ping")
-                    self.sock.ping(self.ping_payload)
-                except Exception as e:
-                    _logging.debug(f"Failed to send ping: {e}")
+        sequence, sent = _PING_TAG.unpack_from(data, len(prefix))
+        with self.ping_lock:
+            if self.outstanding_pings.get(sequence) != sent:
+                return
+            # The server may answer only the last of several pings.
+            for answered in [s for s in self.outstanding_pings if s <= sequence]:
+                del self.outstanding_pings[answered]
+            # A pong that arrives too late doesn't clear the deadline, so that
+            # the next check still reports the timeout.
+            if self.pong_deadline is not None and received / 1e9 <= self.pong_deadline:
+                self.pong_deadline = None
+                if self.outstanding_pings:
+                    oldest = next(iter(self.outstanding_pings.values()))
+                    self.pong_deadline = oldest / 1e9 + self.ping_timeout
+        rtt = (received - sent) / 1e9
+        self.rtt_window.add(rtt)
+        if self.metrics is not None:
+            self.metrics.ping_rtt.record(rtt)
+
+    def getrtt(self) -> dict:
+        """
+        Get the round trip times of the last pings, measured from the
+        sequence number and send time carried by each ping to its pong.
+
+        Returns
+        -------
+        rtt: dict
+            count, last, min, avg and p99 of the last rtt_window round trip
+            times, in seconds. The times are None until a pong arrives.
+        """
+        return self.rtt_window.stats()
+
+    rtt = property(getrtt)
 
     def ready(self):
         return self.sock and self.sock.connected
@@ -259,7 +486,7 @@ def run_forever(
         sslopt: dict = None,
         ping_interval: Union[float, int] = 0,
         ping_timeout: Optional[Union[float, int]] = None,
-        ping_payload: str = "",
+        ping_payload: Union[str, bytes] = "",
         http_proxy_host: str = None,
         http_proxy_port: Union[int, str] = None,
         http_no_proxy: list = None,
@@ -272,6 +499,8 @@ def run_forever(
         suppress_origin: bool = False,
         proxy_type: str = None,
         reconnect: int = None,
+        max_message_size: Optional[int] = None,
+        happy_eyeballs_delay: Optional[float] = None,
     ) -> bool:
         """
         Run event loop for WebSocket framework.
@@ -292,8 +521,10 @@ def run_forever(
             If set to 0, no ping is sent periodically.
         ping_timeout: int or float
             Timeout (in seconds) if the pong message is not received.
-        ping_payload: str
-            Payload message to send with each ping.
+        ping_payload: str or bytes
+            Payload message to send with each ping, at most 109 bytes. A
+            sequence number and send time (16 bytes) are appended to it, to
+            match the pongs to their pings, see getrtt().
         http_proxy_host: str
             HTTP proxy host name.
         http_proxy_port: int or str
@@ -311,13 +542,23 @@ def run_forever(
         origin: str
             update origin header.
         dispatcher: Dispatcher object
-            customize reading data from socket.
+            customize reading data from socket. With a WebSocketHub,
+            run_forever() returns right away, and the hub runs the
+            connection, which is made by a thread of its own.
         suppress_origin: bool
             suppress outputting origin header.
         proxy_type: str
             type of proxy from: http, socks4, socks4a, socks5, socks5h
         reconnect: int
             delay interval when reconnecting
+        max_message_size: int
+            Maximum size of a received message. Larger messages fail the
+            connection with status 1009 (message too big).
+            Default is None, no limit.
+        happy_eyeballs_delay: int or float
+            Race the connection attempts to the addresses of the host,
+            starting one every happy_eyeballs_delay seconds (RFC 8305).
+            Default is None, try them one after the other.
 
         Returns
         -------
@@ -335,6 +576,12 @@ def run_forever(
             raise WebSocketException("Ensure ping_interval >= 0")
         if ping_timeout and ping_interval and ping_interval <= ping_timeout:
             raise WebSocketException("Ensure ping_interval > ping_timeout")
+        if isinstance(ping_payload, str):
+            ping_prefix = ping_payload.encode("utf-8")
+        else:
+            ping_prefix = ping_payload
+        if len(ping_prefix) > _MAX_PING_PAYLOAD:
+            raise WebSocketException(f"Ensure len(ping_payload) <= {_MAX_PING_PAYLOAD}")
         if not sockopt:
             sockopt = ()
         if not sslopt:
@@ -366,7 +613,7 @@ def teardown(close_frame: ABNF = None):
                     return
                 self.has_done_teardown = True
 
-            self._stop_ping_thread()
+            self._stop_ping()
             self.keep_running = False
 
             if self.sock:
@@ -376,7 +623,7 @@ def teardown(close_frame: ABNF = None):
                 # specifically calling "run_forever" again, since is checks if "self.sock" is set.
                 current_sock = self.sock
                 self.sock = None
-                current_sock.close()
+                self._close_socket(current_sock)
 
             close_status_code, close_reason = self._get_close_args(
                 close_frame if close_frame else None
@@ -387,6 +634,8 @@ def teardown(close_frame: ABNF = None):
         def initialize_socket(reconnecting: bool = False) -> None:
             if reconnecting and self.sock:
                 self.sock.shutdown()
+            if reconnecting and self.metrics is not None:
+                self.metrics.reconnects += 1
 
             self.sock = WebSocket(
                 self.get_mask_key,
@@ -396,40 +645,24 @@ def initialize_socket(reconnecting: bool = False) -> None:
                 skip_utf8_validation=skip_utf8_validation,
                 enable_multithread=True,
                 dispatcher=dispatcher,
+                max_message_size=max_message_size,
+                frame_capture=self.frame_capture,
+                metrics=self.metrics,
             )
 
             self.sock.settimeout(getdefaulttimeout())
-            try:
-                header = self.header() if callable(self.header) else self.header
-
-                self.sock.connect(
-                    self.url,
-                    header=header,
-                    cookie=self.cookie,
-                    http_proxy_host=http_proxy_host,
-                    http_proxy_port=http_proxy_port,
-                    http_no_proxy=http_no_proxy,
-                    http_proxy_auth=http_proxy_auth,
-                    http_proxy_timeout=http_proxy_timeout,
-                    subprotocols=self.subprotocols,
-                    host=host,
-                    origin=origin,
-                    suppress_origin=suppress_origin,
-                    proxy_type=proxy_type,
-                    socket=self.prepared_socket,
+            if isinstance(dispatcher, HubDispatcher):
+                websock = self.sock
+                dispatcher.connect(
+                    websock,
+                    lambda: connect(websock),
+                    lambda: opened(reconnecting),
+                    lambda e: handleDisconnect(e, reconnecting),
                 )
-
-                _logging.info("Websocket connected")
-
-                if self.ping_interval:
-                    self._start_ping_thread()
-
-                if reconnecting and self.on_reconnect:
-                    self._callback(self.on_reconnect)
-                else:
-                    self._callback(self.on_open)
-
-                dispatcher.read(self.sock.sock, read, check)
+                return
+            try:
+                connect(self.sock)
+                opened(reconnecting)
             except (
                 WebSocketConnectionClosedException,
                 ConnectionRefusedError,
@@ -439,6 +672,51 @@ def initialize_socket(reconnecting: bool = False) -> None:
             ) as e:
                 handleDisconnect(e, reconnecting)
 
+        def connect(websock: WebSocket) -> None:
+            header = self.header() if callable(self.header) else self.header
+
+            websock.connect(
+                self.url,
+                header=header,
+                cookie=self.cookie,
+                http_proxy_host=http_proxy_host,
+                http_proxy_port=http_proxy_port,
+                http_no_proxy=http_no_proxy,
+                http_proxy_auth=http_proxy_auth,
+                http_proxy_timeout=http_proxy_timeout,
+                subprotocols=self.subprotocols,
+                permessage_deflate=self.permessage_deflate,
+                host=host,
+                origin=origin,
+                suppress_origin=suppress_origin,
+                proxy_type=proxy_type,
+                happy_eyeballs_delay=happy_eyeballs_delay,
+                socket=self.prepared_socket,
+            )
+
+            _logging.info("Websocket connected")
+
+        def opened(reconnecting: bool) -> None:
+            if self.ping_interval:
+                if isinstance(dispatcher, HubDispatcher):
+                    self._reset_ping()
+                    dispatcher.start_ping(self.sock)
+                else:
+                    self._start_ping()
+
+            if reconnecting and self.on_reconnect:
+                self._callback(self.on_reconnect)
+            else:
+                self._callback(self.on_open)
+
+            # Frames that arrived with the handshake response don't wake
+            # up the dispatcher.
+            if self.sock.pending():
+                read()
+                if not (self.sock and self.sock.connected):
+                    return
+            dispatcher.read(self.sock.sock, read, check)
+
         def read() -> bool:
             if not self.keep_running:
                 teardown()
@@ -447,58 +725,48 @@ def read() -> bool:
             if self.sock is None:
                 return False
 
-            try:
-                op_code, frame = self.sock.recv_data_frame(True)
-            except (
-                WebSocketConnectionClosedException,
-                KeyboardInterrupt,
-                SSLEOFError,
-            ) as e:
-                if custom_dispatcher:
-                    return closed(e)
+            # Frames received together are dispatched together, since the
+            # dispatcher is only woken up again once more data arrives.
+            while True:
+                try:
+                    op_code, frame = self.sock.recv_data_frame(True)
+                except (
+                    WebSocketConnectionClosedException,
+                    KeyboardInterrupt,
+                    SSLEOFError,
+                ) as e:
+                    if custom_dispatcher:
+                        return closed(e)
+                    else:
+                        raise e
+
+                if op_code == ABNF.OPCODE_CLOSE:
+                    return closed(frame)
+                elif op_code == ABNF.OPCODE_PING:
+                    self._callback(self.on_ping, frame.data)
+                elif op_code == ABNF.OPCODE_PONG:
+                    self._pong(frame.data)
+                    self._callback(self.on_pong, frame.data)
+                elif op_code == ABNF.OPCODE_CONT and self.on_cont_message:
+                    self._callback(self.on_data, frame.data, frame.opcode, frame.fin)
+                    self._callback(self.on_cont_message, frame.data, frame.fin)
                 else:
-                    raise e
-
-            if op_code == ABNF.OPCODE_CLOSE:
-                return closed(frame)
-            elif op_code == ABNF.OPCODE_PING:
-                self._callback(self.on_ping, frame.data)
-            elif op_code == ABNF.OPCODE_PONG:
-                self.last_pong_tm = time.time()
-                self._callback(self.on_pong, frame.data)
-            elif op_code == ABNF.OPCODE_CONT and self.on_cont_message:
-                self._callback(self.on_data, frame.data, frame.opcode, frame.fin)
-                self._callback(self.on_cont_message, frame.data, frame.fin)
-            else:
-                data = frame.data
-                if op_code == ABNF.OPCODE_TEXT and not skip_utf8_validation:
-                    data = data.decode("utf-8")
-                self._callback(self.on_data, data, frame.opcode, True)
-                self._callback(self.on_message, data)
+                    data = frame.data
+                    if op_code == ABNF.OPCODE_TEXT and not skip_utf8_validation:
+                        data = data.decode("utf-8")
+                    self._callback(self.on_data, data, frame.opcode, True)
+                    self._callback(self.on_message, data)
 
-            return True
+                if not (self.keep_running and self.sock and self.sock.pending()):
+                    return True
 
         def check() -> bool:
-            if self.ping_timeout:
-                has_timeout_expired = (
-                    time.time() - self.last_ping_tm > self.ping_timeout
-                )
-                has_pong_not_arrived_after_last_ping = (
-                    self.last_pong_tm - self.last_ping_tm < 0
-                )
-                has_pong_arrived_too_late = (
-                    self.last_pong_tm - self.last_ping_tm > self.ping_timeout
-                )
-
-                if (
-                    self.last_ping_tm
-                    and has_timeout_expired
-                    and (
-                        has_pong_not_arrived_after_last_ping
-                        or has_pong_arrived_too_late
-                    )
-                ):
-                    raise WebSocketTimeoutException("ping/pong timed out")
+            if (
+                self.ping_timeout
+                and self.pong_deadline is not None
+                and time.monotonic() > self.pong_deadline
+            ):
+                raise WebSocketTimeoutException("ping/pong timed out")
             return True
 
         def closed(
@@ -526,7 +794,7 @@ def handleDisconnect(
             reconnecting: bool = False,
         ) -> bool:
             self.has_errored = True
-            self._stop_ping_thread()
+            self._stop_ping()
             if not reconnecting:
                 self._callback(self.on_error, e)
 
@@ -577,6 +845,8 @@ def create_dispatcher(
         is_ssl: bool = False,
         handleDisconnect: Callable = None,
     ) -> Union[Dispatcher, SSLDispatcher, WrappedDispatcher]:
+        if isinstance(dispatcher, WebSocketHub):
+            return HubDispatcher(self, ping_timeout, dispatcher, handleDisconnect)
         if dispatcher:  # If custom dispatcher is set, use WrappedDispatcher
             return WrappedDispatcher(self, ping_timeout, dispatcher, handleDisconnect)
         timeout = ping_timeout or 10
@@ -609,6 +879,7 @@ def _get_close_args(self, close_frame: ABNF) -> list:
 
     def _callback(self, callback, *args) -> None:
         if callback:
+            start = time.perf_counter()
             try:
                 callback(self, *args)
 
@@ -618,3 +889,6 @@ def _callback(self, callback, *args) -> None:
                 # when the failing callback IS on_error itself
                 if self.on_error and callback is not self.on_error:
                     self.on_error(self, e)
+            finally:
+                if self.metrics is not None:
+                    self.metrics.callback_time.record(time.perf_counter() - start)
@@ -0,0 +1,751 @@
+import asyncio
+import socket
+import struct
+from typing import Optional, Union
+
+from ._abnf import (
+    ABNF,
+    STATUS_MESSAGE_TOO_BIG,
+    STATUS_NORMAL,
+    continuous_frame,
+    frame_buffer,
+)
+from ._compression import PerMessageDeflate
+from ._exceptions import (
+    WebSocketConnectionClosedException,
+    WebSocketException,
+    WebSocketMessageTooBigException,
+    WebSocketProtocolException,
+    WebSocketProxyException,
+    WebSocketTimeoutException,
+)
+from ._handshake import (
+    SUCCESS_STATUSES,
+    SUPPORTED_REDIRECT_STATUSES,
+    _bad_status,
+    _get_handshake_headers,
+    _get_handshake_response,
+    handshake_response,
+)
+from ._http import (
+    _get_socks_proxy_options,
+    _get_ssl_context,
+    _get_sslopt,
+    _get_tunnel_header,
+    parse_headers,
+    proxy_info,
+)
+from ._logging import (
+    FrameCapture,
+    debug,
+    dump,
+    error,
+    trace,
+    isEnabledForError,
+    isEnabledForTrace,
+)
+from ._socket import DEFAULT_SOCKET_OPTION, getdefaulttimeout, sock_opt
+from ._ssl_compat import HAVE_SSL
+from ._url import get_proxy_info, parse_url
+
+"""
+_asyncio.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+try:
+    from python_socks.async_.asyncio import Proxy as AsyncProxy
+
+    HAVE_PYTHON_SOCKS = True
+except ImportError:
+    HAVE_PYTHON_SOCKS = False
+
+__all__ = ["AsyncWebSocket", "async_create_connection"]
+
+# Number of bytes requested from the stream at a time.
+_READ_SIZE = 65536
+
+
+class AsyncWebSocket:
+    """
+    WebSocket interface for asyncio.
+
+    It implements the same protocol as WebSocket, with coroutines instead of
+    blocking calls, so a single event loop can serve many connections.
+
+    >>> import websocket
+    >>> async def main():
+    ...     async with await websocket.async_create_connection(
+    ...         "ws://echo.websocket.events"
+    ...     ) as ws:
+    ...         await ws.send("Hello, Server")
+    ...         async for message in ws:
+    ...             print(message)
+
+    Parameters
+    ----------
+    get_mask_key: func
+        A callable function to get new mask keys, see
+        WebSocket.set_mask_key's docstring for more information.
+    sockopt: tuple
+        Values for socket.setsockopt.
+        sockopt must be tuple and each element is argument of sock.setsockopt.
+    sslopt: dict
+        Optional dict object for ssl socket options. See FAQ for details.
+    fire_cont_frame: bool
+        Fire recv event for each cont frame. Default is False.
+    skip_utf8_validation: bool
+        Skip utf8 validation.
+    max_message_size: int
+        Maximum size of a received message. Larger messages (or frames)
+        fail the connection with status 1009 (message too big).
+        Default is None, no limit.
+    frame_capture: FrameCapture
+        Keeps the raw bytes of the last frames sent and received. Default
+        is None, or a FrameCapture() created once trace is enabled.
+    """
+
+    def __init__(
+        self,
+        get_mask_key=None,
+        sockopt=None,
+        sslopt=None,
+        fire_cont_frame: bool = False,
+        skip_utf8_validation: bool = False,
+        max_message_size: Optional[int] = None,
+        frame_capture: Optional[FrameCapture] = None,
+        **_,
+    ):
+        self.sock_opt = sock_opt(sockopt, sslopt)
+        self.handshake_response: Optional[handshake_response] = None
+        self.permessage_deflate: Optional[PerMessageDeflate] = None
+        self.connected = False
+        self.get_mask_key = get_mask_key
+        # Data read from the stream is fed to the frame buffer, which parses
+        # the frames once they are complete.
+        self.frame_buffer = frame_buffer(
+            None, skip_utf8_validation, max_payload_size=max_message_size
+        )
+        self.frame_buffer.capture = frame_capture
+        self.cont_frame = continuous_frame(
+            fire_cont_frame, skip_utf8_validation, max_message_size
+        )
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Created by connect(), in the event loop. close_received is set
+        # once the server's close frame is received, or the connection lost.
+        self.lock: Optional[asyncio.Lock] = None
+        self.readlock: Optional[asyncio.Lock] = None
+        self.close_received: Optional[asyncio.Event] = None
+
+    def __aiter__(self):
+        """
+        Allow iteration over the received messages with async for, until
+        the server closes the connection.
+        """
+        return self
+
+    async def __anext__(self) -> Union[str, bytes]:
+        # Messages are received until the server's close frame, even after
+        # close() sent ours.
+        if self.close_received is None or self.close_received.is_set():
+            raise StopAsyncIteration
+        opcode, data = await self.recv_data()
+        if opcode == ABNF.OPCODE_CLOSE:
+            raise StopAsyncIteration
+        return data.decode("utf-8") if opcode == ABNF.OPCODE_TEXT else data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def gettimeout(self) -> Optional[Union[float, int]]:
+        """
+        Get the timeout (in seconds) of connect() and close().
+
+        Returns
+        ----------
+        timeout: int or float
+             returns timeout value (in seconds). This value could be either
+             float/integer.
+        """
+        return self.sock_opt.timeout
+
+    def settimeout(self, timeout: Optional[Union[float, int]]):
+        """
+        Set the timeout of connect() and close(). Use asyncio.wait_for() to
+        limit how long other calls wait.
+
+        Parameters
+        ----------
+        timeout: int or float
+            timeout time (in seconds). This value could be either float/integer.
+        """
+        self.sock_opt.timeout = timeout
+
+    timeout = property(gettimeout, settimeout)
+
+    def getsubprotocol(self):
+        """
+        Get subprotocol
+        """
+        if self.handshake_response:
+            return self.handshake_response.subprotocol
+        else:
+            return None
+
+    subprotocol = property(getsubprotocol)
+
+    def getstatus(self):
+        """
+        Get handshake status
+        """
+        if self.handshake_response:
+            return self.handshake_response.status
+        else:
+            return None
+
+    status = property(getstatus)
+
+    def getheaders(self):
+        """
+        Get handshake response header
+        """
+        if self.handshake_response:
+            return self.handshake_response.headers
+        else:
+            return None
+
+    headers = property(getheaders)
+
+    async def connect(self, url: str, **options):
+        """
+        Connect to url. url is websocket url scheme.
+        ie. ws://host:port/resource
+
+        Parameters
+        ----------
+        options:
+            The options of WebSocket.connect(). The timeout applies to
+            connecting and to the opening handshake as a whole.
+        """
+        self.sock_opt.timeout = options.get("timeout", self.sock_opt.timeout)
+        self.lock = asyncio.Lock()
+        self.readlock = asyncio.Lock()
+        self.close_received = None
+        try:
+            await asyncio.wait_for(self._connect(url, options), self.sock_opt.timeout)
+        except asyncio.TimeoutError:
+            self.shutdown()
+            raise WebSocketTimeoutException("Opening handshake timed out")
+        except:
+            self.shutdown()
+            raise
+        self.close_received = asyncio.Event()
+
+    async def _connect(self, url: str, options: dict) -> None:
+        await self._open_connection(url, options)
+        self.handshake_response = await self._handshake(url, options)
+        for _ in range(options.pop("redirect_limit", 3)):
+            if self.handshake_response.status in SUPPORTED_REDIRECT_STATUSES:
+                url = self.handshake_response.headers["location"]
+                self.shutdown()
+                await self._open_connection(url, options)
+                self.handshake_response = await self._handshake(url, options)
+        self.permessage_deflate = self.handshake_response.permessage_deflate
+        self.frame_buffer.allow_rsv1 = self.permessage_deflate is not None
+        self.connected = True
+
+    async def _open_connection(self, url: str, options: dict) -> None:
+        hostname, port, _, is_secure = parse_url(url)
+        ssl_options: dict = {}
+        if is_secure:
+            if not HAVE_SSL:
+                raise WebSocketException("SSL not available.")
+            sslopt = _get_sslopt(self.sock_opt.sslopt)
+            ssl_options = {
+                "ssl": _get_ssl_context(sslopt),
+                "server_hostname": sslopt.get("server_hostname", None) or hostname,
+            }
+
+        sock = options.pop("socket", None)
+        proxy = proxy_info(**options)
+        if sock is None and proxy.proxy_host and proxy.proxy_protocol != "http":
+            if not HAVE_PYTHON_SOCKS:
+                raise WebSocketException(
+                    "Python Socks is needed for SOCKS proxying but is not available"
+                )
+            socks_proxy = AsyncProxy.create(**_get_socks_proxy_options(proxy))
+            sock = await socks_proxy.connect(
+                hostname, port, timeout=proxy.proxy_timeout
+            )
+        elif sock is None:
+            phost, pport, pauth = get_proxy_info(
+                hostname,
+                is_secure,
+                proxy.proxy_host,
+                proxy.proxy_port,
+                proxy.auth,
+                proxy.no_proxy,
+            )
+            if phost:
+                sock = await _tunnel(phost, pport or 80, hostname, port, pauth)
+            else:
+                self.reader, self.writer = await asyncio.open_connection(
+                    hostname,
+                    port,
+                    happy_eyeballs_delay=options.get("happy_eyeballs_delay"),
+                    **ssl_options,
+                )
+            self._set_sockopt(sock or self.writer.get_extra_info("socket"))
+
+        if sock is not None:
+            self.reader, self.writer = await asyncio.open_connection(
+                sock=sock, **ssl_options
+            )
+
+    def _get_capture(self) -> Optional[FrameCapture]:
+        # Raw frames are traced through a capture, created when trace is
+        # enabled if none was given.
+        if self.frame_buffer.capture is None and isEnabledForTrace():
+            self.frame_buffer.capture = FrameCapture()
+        return self.frame_buffer.capture
+
+    def _set_sockopt(self, sock) -> None:
+        for opts in DEFAULT_SOCKET_OPTION:
+            sock.setsockopt(*opts)
+        for opts in self.sock_opt.sockopt:
+            sock.setsockopt(*opts)
+
+    async def _handshake(self, url: str, options: dict) -> handshake_response:
+        hostname, port, resource, _ = parse_url(url)
+        headers, key = _get_handshake_headers(resource, url, hostname, port, options)
+        header_str = "\r\n".join(headers)
+        self.writer.write(header_str.encode("utf-8"))
+        dump("request header", header_str)
+        await self.writer.drain()
+
+        status, resp, status_message = await _read_headers(self.reader)
+        if status not in SUCCESS_STATUSES:
+            response_body = None
+            if content_len := resp.get("content-length"):
+                try:
+                    response_body = await self.reader.readexactly(int(content_len))
+                except asyncio.IncompleteReadError as e:
+                    response_body = e.partial
+            raise _bad_status(status, status_message, resp, response_body)
+        return _get_handshake_response(status, resp, key, options)
+
+    async def send(
+        self, payload: Union[bytes, str], opcode: int = ABNF.OPCODE_TEXT
+    ) -> int:
+        """
+        Send the data as string.
+
+        Parameters
+        ----------
+        payload: str
+            Payload must be utf-8 string or unicode,
+            If the opcode is OPCODE_TEXT.
+            Otherwise, it must be string(byte array).
+        opcode: int
+            Operation code (opcode) to send.
+        """
+        return await self.send_frame(ABNF.create_frame(payload, opcode))
+
+    async def send_text(self, text_data: str) -> int:
+        """
+        Sends UTF-8 encoded text.
+        """
+        return await self.send(text_data, ABNF.OPCODE_TEXT)
+
+    async def send_bytes(self, data: Union[bytes, bytearray]) -> int:
+        """
+        Sends a sequence of bytes.
+        """
+        return await self.send(data, ABNF.OPCODE_BINARY)
+
+    async def send_frame(self, frame: ABNF) -> int:
+        """
+        Send the data frame.
+
+        Parameters
+        ----------
+        frame: ABNF frame
+            frame data created by ABNF.create_frame
+        """
+        if self.get_mask_key:
+            frame.get_mask_key = self.get_mask_key
+        if isEnabledForTrace():
+            trace("++Sent decoded: %s", frame)
+        if self.lock is None:
+            raise WebSocketConnectionClosedException("socket is already closed.")
+        # Frames are compressed in the order they are sent, and only one
+        # task waits in drain() at a time, which Python < 3.10 requires.
+        async with self.lock:
+            if self.permessage_deflate:
+                self.permessage_deflate.compress(frame)
+            buffers = frame.format_buffers()
+            capture = self._get_capture()
+            if capture is not None and capture.sample():
+                capture.record("send", buffers)
+            if self.writer is None:
+                raise WebSocketConnectionClosedException("socket is already closed.")
+            self.writer.writelines(buffers)
+            await self.writer.drain()
+        return sum(len(buffer) for buffer in buffers)
+
+    async def ping(self, payload: Union[str, bytes] = ""):
+        """
+        Send ping data.
+
+        Parameters
+        ----------
+        payload: str
+            data payload to send server.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        await self.send(payload, ABNF.OPCODE_PING)
+
+    async def pong(self, payload: Union[str, bytes] = ""):
+        """
+        Send pong data.
+
+        Parameters
+        ----------
+        payload: str
+            data payload to send server.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        await self.send(payload, ABNF.OPCODE_PONG)
+
+    async def recv(self) -> Union[str, bytes]:
+        """
+        Receive string data(byte array) from the server.
+
+        Returns
+        ----------
+        data: string (byte array) value.
+        """
+        opcode, data = await self.recv_data()
+        if opcode == ABNF.OPCODE_TEXT:
+            return data.decode("utf-8")
+        elif opcode == ABNF.OPCODE_BINARY:
+            return data
+        else:
+            return ""
+
+    async def recv_data(self, control_frame: bool = False) -> tuple:
+        """
+        Receive data with operation code.
+
+        Parameters
+        ----------
+        control_frame: bool
+            a boolean flag indicating whether to return control frame
+            data, defaults to False
+
+        Returns
+        -------
+        opcode, frame.data: tuple
+            tuple of operation code and string(byte array) value.
+        """
+        opcode, frame = await self.recv_data_frame(control_frame)
+        return opcode, frame.data
+
+    async def recv_data_frame(self, control_frame: bool = False) -> tuple:
+        """
+        Receive data with operation code.
+
+        If a valid ping message is received, a pong response is sent.
+
+        Parameters
+        ----------
+        control_frame: bool
+            a boolean flag indicating whether to return control frame
+            data, defaults to False
+
+        Returns
+        -------
+        frame.opcode, frame: tuple
+            tuple of operation code and string(byte array) value.
+        """
+        if self.readlock is None:
+            raise WebSocketConnectionClosedException("socket is already closed.")
+        async with self.readlock:
+            return await self._recv_data_frame(control_frame)
+
+    async def _recv_data_frame(self, control_frame: bool) -> tuple:
+        while True:
+            self._get_capture()
+            frame = await self.recv_frame()
+            if isEnabledForTrace():
+                trace("++Rcv decoded: %s", frame)
+            if frame.opcode in (
+                ABNF.OPCODE_TEXT,
+                ABNF.OPCODE_BINARY,
+                ABNF.OPCODE_CONT,
+            ):
+                self.cont_frame.validate(frame)
+                try:
+                    if self.permessage_deflate:
+                        self.permessage_deflate.decompress(frame)
+                    self.cont_frame.add(frame)
+                except WebSocketMessageTooBigException:
+                    await self._fail(STATUS_MESSAGE_TOO_BIG)
+                    raise
+
+                if self.cont_frame.is_fire(frame):
+                    return self.cont_frame.extract(frame)
+
+            elif frame.opcode == ABNF.OPCODE_CLOSE:
+                self._close_frame_received(frame)
+                if self.connected:
+                    await self.send_close()
+                return frame.opcode, frame
+            elif frame.opcode == ABNF.OPCODE_PING:
+                if len(frame.data) < 126:
+                    await self.pong(frame.data)
+                else:
+                    raise WebSocketProtocolException("Ping message is too long")
+                if control_frame:
+                    return frame.opcode, frame
+            elif frame.opcode == ABNF.OPCODE_PONG:
+                if control_frame:
+                    return frame.opcode, frame
+
+    async def recv_frame(self) -> ABNF:
+        """
+        Receive data as frame from server.
+
+        Returns
+        -------
+        frame: ABNF frame object
+        """
+        while True:
+            try:
+                frame = self.frame_buffer.next_frame()
+            except WebSocketMessageTooBigException:
+                await self._fail(STATUS_MESSAGE_TOO_BIG)
+                raise
+            if frame is not None:
+                return frame
+            if self.reader is None:
+                raise WebSocketConnectionClosedException("socket is already closed.")
+            data = await self.reader.read(_READ_SIZE)
+            if not data:
+                self.shutdown()
+                raise WebSocketConnectionClosedException(
+                    "Connection to remote host was lost."
+                )
+            self.frame_buffer.feed(data)
+
+    def pending(self) -> int:
+        """
+        Get the number of received frames that can be read without waiting.
+        """
+        return len(self.frame_buffer.frames)
+
+    async def send_close(self, status: int = STATUS_NORMAL, reason: bytes = b""):
+        """
+        Send close data to the server.
+
+        Parameters
+        ----------
+        status: int
+            Status code to send. See STATUS_XXX.
+        reason: str or bytes
+            The reason to close. This must be string or UTF-8 bytes.
+        """
+        if status < 0 or status >= ABNF.LENGTH_16:
+            raise ValueError("code is invalid range")
+        self.connected = False
+        await self.send(struct.pack("!H", status) + reason, ABNF.OPCODE_CLOSE)
+
+    async def close(
+        self, status: int = STATUS_NORMAL, reason: bytes = b"", timeout: int = 3
+    ):
+        """
+        Close Websocket object
+
+        Parameters
+        ----------
+        status: int
+            Status code to send. See VALID_CLOSE_STATUS in ABNF.
+        reason: bytes
+            The reason to close in UTF-8.
+        timeout: int or float
+            Timeout until receive a close frame.
+            If None, it will wait forever until receive a close frame.
+        """
+        if not self.connected:
+            self.shutdown()
+            return
+        if status < 0 or status >= ABNF.LENGTH_16:
+            raise ValueError("code is invalid range")
+
+        try:
+            await self.send_close(status, reason)
+            await asyncio.wait_for(self._wait_close(), timeout)
+        except (asyncio.TimeoutError, WebSocketException, OSError, struct.error):
+            pass
+
+        writer = self.writer
+        self.shutdown()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _wait_close(self) -> None:
+        if self.readlock is None or self.close_received is None:
+            return
+        if self.readlock.locked():
+            # Another task is receiving: it reads the close frame, since
+            # the stream can't be read by two tasks at once.
+            await self.close_received.wait()
+            return
+        async with self.readlock:
+            while not self.close_received.is_set():
+                frame = await self.recv_frame()
+                if frame.opcode == ABNF.OPCODE_CLOSE:
+                    self._close_frame_received(frame)
+
+    def _close_frame_received(self, frame: ABNF) -> None:
+        if self.close_received is not None:
+            self.close_received.set()
+        if isEnabledForError() and len(frame.data) >= 2:
+            recv_status = struct.unpack("!H", frame.data[0:2])[0]
+            if recv_status >= 3000 and recv_status <= 4999:
+                debug(f"close status: {repr(recv_status)}")
+            elif recv_status != STATUS_NORMAL:
+                error(f"close status: {repr(recv_status)}")
+
+    def shutdown(self):
+        """
+        close the connection, immediately.
+        """
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+        self.connected = False
+        if self.close_received is not None:
+            self.close_received.set()
+
+    async def _fail(self, status: int, reason: bytes = b"") -> None:
+        # Fail the connection: send a close frame without waiting for the
+        # server's reply, then close the connection.
+        try:
+            await self.send_close(status, reason)
+        except (WebSocketException, OSError):
+            pass
+        self.shutdown()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> tuple:
+    try:
+        data = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        raise WebSocketConnectionClosedException("Connection to remote host was lost.")
+    except asyncio.LimitOverrunError:
+        raise WebSocketException("Response headers are too long")
+    return parse_headers(data.split(b"\r\n"))
+
+
+async def _tunnel(phost: str, pport: int, host: str, port: int, auth) -> socket.socket:
+    # Connect to host through the CONNECT method of an HTTP proxy. The bare
+    # socket is returned, so TLS can be started over it on any Python version.
+    debug("Connecting proxy...")
+    loop = asyncio.get_running_loop()
+    addrinfo_list = await loop.getaddrinfo(
+        phost, pport, type=socket.SOCK_STREAM, proto=socket.SOL_TCP
+    )
+    err: Optional[OSError] = None
+    for family, socktype, proto, _, address in addrinfo_list:
+        sock = socket.socket(family, socktype, proto)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address)
+            break
+        except OSError as e:
+            sock.close()
+            err = e
+    else:
+        raise err or WebSocketException(f"Host not found.: {phost}:{pport}")
+
+    try:
+        await loop.sock_sendall(sock, _get_tunnel_header(host, port, auth).encode())
+        # The proxy sends nothing after its response until the client sends
+        # data through the tunnel, so this doesn't read past the headers.
+        response = b""
+        while b"\r\n\r\n" not in response:
+            data = await loop.sock_recv(sock, 4096)
+            if not data:
+                raise WebSocketProxyException("Connection to proxy was lost.")
+            response += data
+        status, _, _ = parse_headers(response.split(b"\r\n"))
+        if status != 200:
+            raise WebSocketProxyException(f"failed CONNECT via proxy status: {status}")
+    except:
+        sock.close()
+        raise
+
+    return sock
+
+
+async def async_create_connection(
+    url: str, timeout=None, class_=AsyncWebSocket, **options
+) -> AsyncWebSocket:
+    """
+    Connect to url and return the AsyncWebSocket object, like
+    create_connection() does for WebSocket.
+
+    >>> ws = await async_create_connection("ws://echo.websocket.events")
+
+    Parameters
+    ----------
+    class_: class
+        class to instantiate when creating the connection. It has to
+        implement settimeout and connect, and accept the kwargs of
+        AsyncWebSocket.__init__.
+    timeout: int or float
+        Timeout of connecting and of the opening handshake, see
+        AsyncWebSocket.connect(). If set to None, it uses the
+        default_timeout value.
+    options:
+        The other options of create_connection(), except
+        enable_multithread.
+    """
+    sockopt = options.pop("sockopt", [])
+    sslopt = options.pop("sslopt", {})
+    fire_cont_frame = options.pop("fire_cont_frame", False)
+    skip_utf8_validation = options.pop("skip_utf8_validation", False)
+    websock = class_(
+        sockopt=sockopt,
+        sslopt=sslopt,
+        fire_cont_frame=fire_cont_frame,
+        skip_utf8_validation=skip_utf8_validation,
+        **options,
+    )
+    websock.settimeout(timeout if timeout is not None else getdefaulttimeout())
+    await websock.connect(url, **options)
+    return websock
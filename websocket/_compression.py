@@ -0,0 +1,291 @@
+import zlib
+from typing import Optional
+
+from ._abnf import ABNF
+from ._exceptions import (
+    WebSocketException,
+    WebSocketMessageTooBigException,
+    WebSocketProtocolException,
+)
+
+"""
+_compression.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+__all__ = ["PerMessageDeflate", "DEFAULT_MAX_DECOMPRESSED_SIZE"]
+
+EXTENSION_NAME = "permessage-deflate"
+
+# Messages are compressed with Z_SYNC_FLUSH, which ends them with these
+# bytes. They are not sent, see RFC 7692 section 7.2.1.
+_SYNC_FLUSH_TAIL = b"\x00\x00\xff\xff"
+
+# Limit of the size of a decompressed message, to guard against messages
+# that decompress to much more memory than they take on the wire.
+DEFAULT_MAX_DECOMPRESSED_SIZE = 64 << 20
+
+_BOOLEAN_PARAMS = ("server_no_context_takeover", "client_no_context_takeover")
+_WINDOW_BITS_PARAMS = ("server_max_window_bits", "client_max_window_bits")
+
+
+def _check_window_bits(name: str, bits: int) -> None:
+    # zlib doesn't support compressing with 8 window bits, so this client
+    # doesn't offer it either.
+    if not isinstance(bits, int) or not 9 <= bits <= 15:
+        raise ValueError(f"{name} must be between 9 and 15")
+
+
+class PerMessageDeflate:
+    """
+    State of the permessage-deflate extension (RFC 7692) of a connection.
+
+    Parameters
+    ----------
+    server_no_context_takeover: bool
+        The server resets its compression context after each message.
+    client_no_context_takeover: bool
+        This client resets its compression context after each message.
+    server_max_window_bits: int
+        LZ77 window size (base-2 logarithm) the server compresses with.
+    client_max_window_bits: int
+        LZ77 window size (base-2 logarithm) this client compresses with.
+    max_decompressed_size: int
+        Maximum size of a received message after decompression.
+        None or 0 means no limit.
+    """
+
+    def __init__(
+        self,
+        server_no_context_takeover: bool = False,
+        client_no_context_takeover: bool = False,
+        server_max_window_bits: int = zlib.MAX_WBITS,
+        client_max_window_bits: int = zlib.MAX_WBITS,
+        max_decompressed_size: Optional[int] = DEFAULT_MAX_DECOMPRESSED_SIZE,
+    ) -> None:
+        self.server_no_context_takeover = server_no_context_takeover
+        self.client_no_context_takeover = client_no_context_takeover
+        self.server_max_window_bits = server_max_window_bits
+        self.client_max_window_bits = client_max_window_bits
+        self.max_decompressed_size = max_decompressed_size
+        self._compressor = None
+        self._decompressor = None
+        # Whether the message being sent/received is compressed.
+        self._compressing = False
+        self._decompressing = False
+        self._decompressed_size = 0
+
+    @staticmethod
+    def offer(options: dict) -> str:
+        """
+        Get the Sec-WebSocket-Extensions header value offered to the server.
+
+        Parameters
+        ----------
+        options: dict
+            server_no_context_takeover, client_no_context_takeover,
+            server_max_window_bits and client_max_window_bits parameters to
+            request. By default, the server may pick client_max_window_bits.
+        """
+        params = [EXTENSION_NAME]
+        for name in _BOOLEAN_PARAMS:
+            if options.get(name):
+                params.append(name)
+        for name in _WINDOW_BITS_PARAMS:
+            bits = options.get(name)
+            if bits:
+                _check_window_bits(name, bits)
+                params.append(f"{name}={bits}")
+            elif name == "client_max_window_bits":
+                params.append(name)
+        return "; ".join(params)
+
+    @classmethod
+    def accept(cls, response: str, options: dict) -> "PerMessageDeflate":
+        """
+        Validate the Sec-WebSocket-Extensions header value of the server
+        response against the offer, and get the negotiated extension.
+
+        Parameters
+        ----------
+        response: str
+            Sec-WebSocket-Extensions header value of the server response.
+        options: dict
+            options the offer was made with, see offer(). The
+            max_decompressed_size option is applied to received messages.
+        """
+        extensions = [e.strip() for e in response.split(",") if e.strip()]
+        if len(extensions) != 1:
+            raise WebSocketException(f"Unsupported extensions: {response}")
+        name, *params = [p.strip() for p in extensions[0].split(";")]
+        if name.lower() != EXTENSION_NAME:
+            raise WebSocketException(f"Unsupported extension: {name}")
+
+        negotiated: dict = {}
+        for param in params:
+            key, has_value, value = param.partition("=")
+            key = key.strip().lower()
+            value = value.strip().strip('"')
+            if key in negotiated:
+                raise WebSocketException(f"Duplicate {EXTENSION_NAME} parameter {key}")
+            if key in _BOOLEAN_PARAMS and not has_value:
+                negotiated[key] = True
+            elif key in _WINDOW_BITS_PARAMS and value.isdigit():
+                negotiated[key] = int(value)
+                requested = options.get(key) or zlib.MAX_WBITS
+                if not 8 <= negotiated[key] <= requested:
+                    raise WebSocketException(
+                        f"Invalid {EXTENSION_NAME} parameter {param}"
+                    )
+            else:
+                raise WebSocketException(f"Invalid {EXTENSION_NAME} parameter {param}")
+
+        for key in ("server_no_context_takeover", "server_max_window_bits"):
+            if options.get(key) and key not in negotiated:
+                raise WebSocketException(
+                    f"Server declined {EXTENSION_NAME} parameter {key}"
+                )
+        if negotiated.get("client_max_window_bits") == 8:
+            raise WebSocketException(
+                f"Unsupported {EXTENSION_NAME} parameter client_max_window_bits=8"
+            )
+
+        return cls(
+            max_decompressed_size=options.get(
+                "max_decompressed_size", DEFAULT_MAX_DECOMPRESSED_SIZE
+            ),
+            **negotiated,
+        )
+
+    def compress(self, frame: ABNF) -> None:
+        """
+        Compress the payload of a data frame to send, in place.
+
+        The first frame of a message gets the RSV1 bit set, control
+        frames are left alone.
+
+        Parameters
+        ----------
+        frame: ABNF frame
+            frame to send.
+        """
+        if frame.opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+            self._compressing = True
+            frame.rsv1 = 1
+        elif frame.opcode != ABNF.OPCODE_CONT or not self._compressing:
+            return
+
+        data = frame.data
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self._compressor is None:
+            self._compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -self.client_max_window_bits
+            )
+        data = self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+        if frame.fin:
+            data = data[: -len(_SYNC_FLUSH_TAIL)]
+            self._compressing = False
+            if self.client_no_context_takeover:
+                self._compressor = None
+        frame.data = data
+
+    def decompress(self, frame: ABNF) -> None:
+        """
+        Decompress the payload of a received data frame, in place.
+
+        Messages whose first frame doesn't have the RSV1 bit set are not
+        compressed and are left alone, as are control frames.
+
+        Parameters
+        ----------
+        frame: ABNF frame
+            received frame.
+        """
+        if frame.opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+            self._decompressing = bool(frame.rsv1)
+            self._decompressed_size = 0
+        elif frame.opcode != ABNF.OPCODE_CONT:
+            return
+        if not self._decompressing:
+            return
+
+        data = frame.data
+        if frame.fin:
+            data += _SYNC_FLUSH_TAIL
+        decompressor = self._get_decompressor()
+
+        limit = self.max_decompressed_size
+        try:
+            if limit:
+                remaining = limit - self._decompressed_size
+                data = decompressor.decompress(data, remaining + 1)
+                if len(data) > remaining:
+                    raise WebSocketMessageTooBigException(
+                        f"Decompressed message is larger than {limit} bytes"
+                    )
+            else:
+                data = decompressor.decompress(data)
+        except zlib.error as e:
+            raise WebSocketProtocolException(f"Invalid compressed data: {e}")
+        self._decompressed_size += len(data)
+
+        if frame.fin:
+            self.end_message()
+        frame.rsv1 = 0
+        frame.data = data
+
+    def inflate(self, data: bytes, max_length: int, fin: bool = False) -> bytes:
+        """
+        Decompress the next part of the payload of a compressed message that
+        is read piece by piece, see WebSocket.recv_stream(). Call
+        end_message() once all of it is read.
+
+        Parameters
+        ----------
+        data: bytes
+            next part of the payload. The input left over by the previous
+            call because of max_length is decompressed first.
+        max_length: int
+            maximum number of decompressed bytes to return.
+        fin: bool
+            whether data ends the payload of the message.
+        """
+        decompressor = self._get_decompressor()
+        data = decompressor.unconsumed_tail + data
+        if fin:
+            data += _SYNC_FLUSH_TAIL
+        try:
+            return decompressor.decompress(data, max_length)
+        except zlib.error as e:
+            raise WebSocketProtocolException(f"Invalid compressed data: {e}")
+
+    def end_message(self) -> None:
+        """
+        Finish the decompression of a received message.
+        """
+        self._decompressing = False
+        if self.server_no_context_takeover:
+            self._decompressor = None
+
+    def _get_decompressor(self):
+        if self._decompressor is None:
+            # A window larger than the one the server compresses with works.
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decompressor
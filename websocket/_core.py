@@ -1,22 +1,50 @@
+import io
+import selectors
 import socket
 import struct
 import threading
 import time
-from typing import Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 
 # websocket modules
-from ._abnf import ABNF, STATUS_NORMAL, continuous_frame, frame_buffer
+from ._abnf import (
+    ABNF,
+    STATUS_MESSAGE_TOO_BIG,
+    STATUS_NORMAL,
+    continuous_frame,
+    frame_buffer,
+)
+from ._compression import PerMessageDeflate
 from ._exceptions import (
+    WebSocketException,
+    WebSocketMessageTooBigException,
+    WebSocketPayloadException,
     WebSocketProtocolException,
     WebSocketConnectionClosedException,
     WebSocketTimeoutException,
 )
 from ._handshake import SUPPORTED_REDIRECT_STATUSES, handshake
 from ._http import connect, proxy_info
-from ._logging import debug, error, trace, isEnabledForError, isEnabledForTrace
-from ._socket import getdefaulttimeout, recv, send, sock_opt
+from ._logging import (
+    FrameCapture,
+    debug,
+    error,
+    trace,
+    isEnabledForError,
+    isEnabledForTrace,
+)
+from ._metrics import Metrics
+from ._socket import (
+    _IOV_MAX,
+    _Waiter,
+    getdefaulttimeout,
+    recv,
+    recv_into,
+    send,
+    sock_opt,
+)
 from ._ssl_compat import ssl
-from ._utils import NoLock
+from ._utils import NoLock, Utf8Validator
 from ._dispatcher import DispatcherBase, WrappedDispatcher
 
 """
@@ -40,6 +68,9 @@
 
 __all__ = ["WebSocket", "create_connection"]
 
+# Default payload size of the frames sent by WebSocket.send_stream().
+DEFAULT_FRAGMENT_SIZE = 64 * 1024
+
 
 class WebSocket:
     """
@@ -77,6 +108,17 @@ class WebSocket:
         If set to True, lock send method.
     skip_utf8_validation: bool
         Skip utf8 validation.
+    max_message_size: int
+        Maximum size of a received message. Larger messages (or frames)
+        fail the connection with status 1009 (message too big) before
+        they are read. Default is None, no limit.
+    frame_capture: FrameCapture
+        Keeps the raw bytes of the last frames sent and received. Default
+        is None, or a FrameCapture() created once trace is enabled.
+    metrics: Metrics
+        Counts the frames, bytes and socket calls of the connection, and
+        times its handshake. Can be shared by several connections. Default
+        is None.
     """
 
     def __init__(
@@ -88,6 +130,9 @@ def __init__(
         enable_multithread: bool = True,
         skip_utf8_validation: bool = False,
         dispatcher: Union[DispatcherBase, WrappedDispatcher] = None,
+        max_message_size: Optional[int] = None,
+        frame_capture: Optional[FrameCapture] = None,
+        metrics: Optional[Metrics] = None,
         **_,
     ):
         """
@@ -101,13 +146,24 @@ def __init__(
         self.sock_opt = sock_opt(sockopt, sslopt)
         self.handshake_response = None
         self.sock: Optional[socket.socket] = None
+        self.permessage_deflate: Optional[PerMessageDeflate] = None
 
         self.connected = False
         self.get_mask_key = get_mask_key
         # These buffer over the build-up of a single frame.
-        self.frame_buffer = frame_buffer(self._recv, skip_utf8_validation)
-        self.cont_frame = continuous_frame(fire_cont_frame, skip_utf8_validation)
+        self.frame_buffer = frame_buffer(
+            self._recv, skip_utf8_validation, self._recv_into, max_message_size
+        )
+        self.frame_buffer.capture = frame_capture
+        self.cont_frame = continuous_frame(
+            fire_cont_frame, skip_utf8_validation, max_message_size
+        )
         self.dispatcher = dispatcher
+        # Selectors reused by blocking reads and writes.
+        self.read_waiter = _Waiter(selectors.EVENT_READ)
+        self.write_waiter = _Waiter(selectors.EVENT_WRITE)
+        self.metrics = metrics
+        self.read_waiter.metrics = self.write_waiter.metrics = metrics
 
         if enable_multithread:
             self.lock = threading.Lock()
@@ -144,6 +200,10 @@ def set_mask_key(self, func):
             The argument means length of mask key.
             This func must return string(byte array),
             which length is argument specified.
+            If it returns a zero key (b"\\x00\\x00\\x00\\x00"), payloads
+            are sent without the xor pass. fast_mask_key creates keys
+            without the syscall of the default os.urandom, for trusted
+            servers.
         """
         self.get_mask_key = func
 
@@ -212,6 +272,20 @@ def is_ssl(self):
 
     headers = property(getheaders)
 
+    def getwaits(self) -> tuple:
+        """
+        Get how many times reading and writing had to wait for the socket
+        to be ready.
+
+        Returns
+        ----------
+        waits: tuple
+            Number of waits for the socket to be readable, and writable.
+        """
+        return self.read_waiter.waits, self.write_waiter.waits
+
+    waits = property(getwaits)
+
     def connect(self, url, **options):
         """
         Connect to url. url is websocket url scheme.
@@ -242,6 +316,12 @@ def connect(self, url, **options):
         timeout: int or float
             Socket timeout time. This value is an integer or float.
             If you set None for this value, it means "use default_timeout value"
+        happy_eyeballs_delay: int or float
+            When the host has several addresses, start a connection attempt
+            to the next address every happy_eyeballs_delay seconds, alternating
+            IPv6 and IPv4, and use the first one to connect (RFC 8305).
+            0.25 is the recommended value. Default is None, try the addresses
+            one after the other.
         http_proxy_host: str
             HTTP proxy host name.
         http_proxy_port: str or int
@@ -256,10 +336,19 @@ def connect(self, url, **options):
             Number of redirects to follow.
         subprotocols: list
             List of available subprotocols. Default is None.
+        permessage_deflate: bool or dict
+            Offer the permessage-deflate extension (RFC 7692). A dict sets
+            the server_no_context_takeover, client_no_context_takeover,
+            server_max_window_bits, client_max_window_bits and
+            max_decompressed_size parameters. Default is None.
         socket: socket
             Pre-initialized stream socket.
         """
         self.sock_opt.timeout = options.get("timeout", self.sock_opt.timeout)
+        self.sock_opt.happy_eyeballs_delay = options.get(
+            "happy_eyeballs_delay", self.sock_opt.happy_eyeballs_delay
+        )
+        start = time.perf_counter()
         self.sock, addrs = connect(
             url, self.sock_opt, proxy_info(**options), options.pop("socket", None)
         )
@@ -279,7 +368,14 @@ def connect(self, url, **options):
                     self.handshake_response = handshake(
                         self.sock, url, *addrs, **options
                     )
+            self.permessage_deflate = self.handshake_response.permessage_deflate
+            self.frame_buffer.allow_rsv1 = self.permessage_deflate is not None
+            # Frames the server sent right after its response may have been
+            # read along with the headers.
+            self.frame_buffer.feed(self.handshake_response.rest)
             self.connected = True
+            if self.metrics is not None:
+                self.metrics.handshake_time.record(time.perf_counter() - start)
         except:
             if self.sock:
                 self.sock.close()
@@ -332,17 +428,95 @@ def send_frame(self, frame) -> int:
         frame: ABNF frame
             frame data created by ABNF.create_frame
         """
-        if self.get_mask_key:
-            frame.get_mask_key = self.get_mask_key
-        data = frame.format()
-        length = len(data)
-        if isEnabledForTrace():
-            trace(f"++Sent raw: {repr(data)}")
-            trace(f"++Sent decoded: {frame.__str__()}")
+        # Frames are formatted under the lock, since compressed frames
+        # have to be sent in the order they went through the compressor.
         with self.lock:
-            while data:
-                bytes_sent = self._send(data)
-                data = data[bytes_sent:]
+            buffers = self._format_frame(frame)
+            length = sum(len(buffer) for buffer in buffers)
+            self._send_buffers(buffers)
+
+        return length
+
+    def send_many(
+        self, payloads: Iterable[Union[bytes, str]], opcode: int = ABNF.OPCODE_TEXT
+    ) -> int:
+        """
+        Send several messages at once.
+
+        Each payload is sent as a message of its own, exactly as with
+        send(), but all frames are written under a single lock acquisition
+        and with as few socket calls as possible.
+
+        Parameters
+        ----------
+        payloads: iterable of str or bytes
+            Payloads of the messages. See send().
+        opcode: int
+            Operation code (opcode) of every message.
+
+        Returns
+        -------
+        length: int
+            Number of bytes sent.
+        """
+        buffers = []
+        with self.lock:
+            for payload in payloads:
+                buffers.extend(self._format_frame(ABNF.create_frame(payload, opcode)))
+            length = sum(len(buffer) for buffer in buffers)
+            self._send_buffers(buffers)
+
+        return length
+
+    def send_stream(
+        self,
+        source,
+        opcode: int = ABNF.OPCODE_BINARY,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+    ) -> int:
+        """
+        Send a message read piece by piece from a source, as a fragmented
+        message: the first frame has the given opcode, the following ones
+        are continuation frames.
+
+        The payload is read, masked and sent one fragment at a time, so a
+        large file is never held in memory as a whole. Other threads can't
+        send frames until the whole message is sent.
+
+        Parameters
+        ----------
+        source: file object, bytes-like object or iterable
+            A file object (anything with a read() method), an mmap or other
+            bytes-like object, or an iterable (e.g. a generator) of bytes or
+            str chunks. str data is encoded to UTF-8.
+        opcode: int
+            Operation code (opcode) of the message. Default is OPCODE_BINARY.
+        fragment_size: int
+            Maximum payload size of each frame.
+
+        Returns
+        -------
+        length: int
+            Number of bytes sent.
+        """
+        if fragment_size <= 0:
+            raise ValueError("fragment_size must be positive")
+
+        length = 0
+        with self.lock:
+            fragments = _iter_fragments(source, fragment_size)
+            fragment = next(fragments, b"")
+            while True:
+                # Look one fragment ahead to know which frame is the last.
+                next_fragment = next(fragments, None)
+                frame = ABNF.create_frame(fragment, opcode, int(next_fragment is None))
+                buffers = self._format_frame(frame)
+                length += sum(len(buffer) for buffer in buffers)
+                self._send_buffers(buffers)
+                if next_fragment is None:
+                    break
+                fragment = next_fragment
+                opcode = ABNF.OPCODE_CONT
 
         return length
 
@@ -357,7 +531,7 @@ def send_binary(self, payload: bytes) -> int:
         """
         return self.send(payload, ABNF.OPCODE_BINARY)
 
-    def ping(self, payload: Union[str, bytes] = ""):
+    def ping(self, payload: Union[str, bytes] = "", blocking: bool = True) -> bool:
         """
         Send ping data.
 
@@ -365,10 +539,35 @@ def ping(self, payload: Union[str, bytes] = ""):
         ----------
         payload: str
             data payload to send server.
+        blocking: bool
+            If False, the ping is dropped instead of waiting for another
+            thread sending, or for room in the send buffer of the socket.
+
+        Returns
+        -------
+        sent: bool
+            False if the ping was dropped.
         """
         if isinstance(payload, str):
             payload = payload.encode("utf-8")
-        self.send(payload, ABNF.OPCODE_PING)
+        if blocking:
+            self.send(payload, ABNF.OPCODE_PING)
+            return True
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            # A dispatcher buffers what can't be sent right away.
+            if (
+                not self.dispatcher
+                and self.sock is not None
+                and not self.write_waiter.ready(self.sock)
+            ):
+                return False
+            frame = ABNF.create_frame(payload, ABNF.OPCODE_PING)
+            self._send_buffers(self._format_frame(frame))
+        finally:
+            self.lock.release()
+        return True
 
     def pong(self, payload: Union[str, bytes] = ""):
         """
@@ -441,10 +640,10 @@ def recv_data_frame(self, control_frame: bool = False) -> tuple:
             tuple of operation code and string(byte array) value.
         """
         while True:
+            self._get_capture()
             frame = self.recv_frame()
             if isEnabledForTrace():
-                trace(f"++Rcv raw: {repr(frame.format())}")
-                trace(f"++Rcv decoded: {frame.__str__()}")
+                trace("++Rcv decoded: %s", frame)
             if not frame:
                 # handle error:
                 # 'NoneType' object has no attribute 'opcode'
@@ -455,7 +654,13 @@ def recv_data_frame(self, control_frame: bool = False) -> tuple:
                 ABNF.OPCODE_CONT,
             ):
                 self.cont_frame.validate(frame)
-                self.cont_frame.add(frame)
+                try:
+                    if self.permessage_deflate:
+                        self.permessage_deflate.decompress(frame)
+                    self.cont_frame.add(frame)
+                except WebSocketMessageTooBigException:
+                    self._fail(STATUS_MESSAGE_TOO_BIG)
+                    raise
 
                 if self.cont_frame.is_fire(frame):
                     return self.cont_frame.extract(frame)
@@ -482,7 +687,50 @@ def recv_frame(self):
         -------
         self.frame_buffer.recv_frame(): ABNF frame object
         """
-        return self.frame_buffer.recv_frame()
+        try:
+            frame = self.frame_buffer.recv_frame()
+        except WebSocketMessageTooBigException:
+            self._fail(STATUS_MESSAGE_TOO_BIG)
+            raise
+        if self.metrics is not None:
+            self.metrics.frame_received(frame.opcode, len(frame.data))
+        return frame
+
+    def recv_stream(self) -> "MessageReader":
+        """
+        Receive the next message as a file-like object, which reads the
+        payload from the socket as it is requested instead of buffering the
+        whole message. The message must be read to the end, or the reader
+        closed, before receiving anything else.
+
+        >>> with ws.recv_stream() as message, open("blob", "wb") as f:
+        ...     shutil.copyfileobj(message, f)
+
+        Returns
+        -------
+        message: MessageReader
+            reader of the message payload.
+        """
+        with self.readlock:
+            frame = self._recv_stream_frame()
+        if frame.opcode == ABNF.OPCODE_CONT:
+            raise WebSocketProtocolException("Illegal frame")
+        return MessageReader(self, frame)
+
+    def pending(self) -> int:
+        """
+        Get the number of received frames that can be read without blocking.
+
+        Several frames are often received with a single read from the socket.
+        They are queued, so a readiness notification for the socket (e.g.
+        from select) only announces the first of them.
+
+        Returns
+        -------
+        pending: int
+            Number of frames queued in the frame buffer.
+        """
+        return len(self.frame_buffer.frames)
 
     def send_close(self, status: int = STATUS_NORMAL, reason: bytes = b""):
         """
@@ -568,17 +816,112 @@ def shutdown(self):
             self.sock.close()
             self.sock = None
             self.connected = False
+        self.read_waiter.close()
+        self.write_waiter.close()
 
-    def _send(self, data: Union[str, bytes]):
+    def _recv_stream_frame(self) -> ABNF:
+        # Receive the next data (or close) frame, without its payload if it
+        # is not buffered yet, answering pings on the way.
+        while True:
+            self._get_capture()
+            try:
+                frame = self.frame_buffer.recv_frame_start()
+            except WebSocketMessageTooBigException:
+                self._fail(STATUS_MESSAGE_TOO_BIG)
+                raise
+            if self.metrics is not None:
+                self.metrics.frame_received(
+                    frame.opcode,
+                    len(frame.data) + self.frame_buffer.payload_remaining,
+                )
+            if isEnabledForTrace():
+                trace("++Rcv decoded: %s", frame)
+            if frame.opcode == ABNF.OPCODE_PING:
+                if len(frame.data) >= 126:
+                    raise WebSocketProtocolException("Ping message is too long")
+                self.pong(frame.data)
+            elif frame.opcode == ABNF.OPCODE_CLOSE:
+                self.send_close()
+                return frame
+            elif frame.opcode != ABNF.OPCODE_PONG:
+                return frame
+
+    def _fail(self, status: int, reason: bytes = b"") -> None:
+        # Fail the connection: send a close frame without waiting for the
+        # server's reply, then close the socket.
+        try:
+            self.send_close(status, reason)
+        except (WebSocketException, OSError):
+            pass
+        self.shutdown()
+
+    def _format_frame(self, frame: ABNF) -> list:
+        if self.get_mask_key:
+            frame.get_mask_key = self.get_mask_key
+        if isEnabledForTrace():
+            trace("++Sent decoded: %s", frame)
+        if self.permessage_deflate:
+            self.permessage_deflate.compress(frame)
+        if self.metrics is not None:
+            self.metrics.frame_sent(frame.opcode, len(frame.data))
+        buffers = frame.format_buffers()
+        capture = self._get_capture()
+        if capture is not None and capture.sample():
+            capture.record("send", buffers)
+        return buffers
+
+    def _get_capture(self) -> Optional[FrameCapture]:
+        # Raw frames are traced through a capture, created when trace is
+        # enabled if none was given.
+        if self.frame_buffer.capture is None and isEnabledForTrace():
+            self.frame_buffer.capture = FrameCapture()
+        return self.frame_buffer.capture
+
+    def _send_buffers(self, buffers: list) -> None:
+        # Send all buffers, following partial sends with memoryview slices
+        # instead of copying the unsent data. Sent buffers are skipped by
+        # index rather than removed from the front of the list, which would
+        # be quadratic in the number of buffers.
+        start = 0
+        while start < len(buffers):
+            end = start + _IOV_MAX
+            bytes_sent = self._send(buffers[start:end])
+            while bytes_sent and start < len(buffers):
+                if bytes_sent >= len(buffers[start]):
+                    bytes_sent -= len(buffers[start])
+                    start += 1
+                else:
+                    buffers[start] = memoryview(buffers[start])[bytes_sent:]
+                    bytes_sent = 0
+            if start < min(end, len(buffers)) and self.metrics is not None:
+                self.metrics.partial_sends += 1
+
+    def _send(self, data: Union[str, bytes, list]):
         if self.sock is None:
             raise WebSocketConnectionClosedException("socket is already closed.")
+        if self.metrics is not None:
+            self.metrics.send_calls += 1
         if self.dispatcher:
             return self.dispatcher.send(self.sock, data)
-        return send(self.sock, data)
+        return send(self.sock, data, self.write_waiter)
 
     def _recv(self, bufsize):
+        if self.metrics is not None:
+            self.metrics.recv_calls += 1
+        try:
+            return recv(self.sock, bufsize, self.read_waiter)
+        except WebSocketConnectionClosedException:
+            if self.sock:
+                self.sock.close()
+            self.sock = None
+            self.connected = False
+            raise
+
+    def _recv_into(self, buffer):
+        if self.metrics is not None:
+            self.metrics.recv_calls += 1
         try:
-            return recv(self.sock, bufsize)
+            return recv_into(self.sock, buffer, self.read_waiter)
         except WebSocketConnectionClosedException:
             if self.sock:
                 self.sock.close()
@@ -587,6 +930,161 @@ def _recv(self, bufsize):
             raise
 
 
+def _iter_fragments(source, fragment_size: int) -> Iterator:
+    # Yield the payload of source in pieces of at most fragment_size bytes.
+    if not isinstance(source, str):
+        try:
+            view = memoryview(source)
+        except TypeError:
+            pass
+        else:
+            # Slices of the view aren't copies, the frames are masked from it.
+            with view, view.cast("B") as data:
+                for start in range(0, len(data), fragment_size):
+                    yield data[start : start + fragment_size]
+            return
+    if hasattr(source, "read"):
+        while data := source.read(fragment_size):
+            yield data.encode("utf-8") if isinstance(data, str) else data
+        return
+    for chunk in (source,) if isinstance(source, str) else source:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        for start in range(0, len(chunk), fragment_size):
+            yield chunk[start : start + fragment_size]
+
+
+class MessageReader(io.RawIOBase):
+    """
+    File-like object reading a received message, see WebSocket.recv_stream().
+
+    The payload is read from the socket as it is requested, across frame
+    boundaries and within large frames, so memory use doesn't depend on the
+    size of the message. Pings received in the middle of the message are
+    answered. Closing the reader, e.g. at the end of a with statement,
+    skips the rest of the message.
+
+    Attributes
+    ----------
+    opcode: int
+        ABNF.OPCODE_TEXT or ABNF.OPCODE_BINARY, or ABNF.OPCODE_CLOSE if the
+        server closed the connection instead, in which case the close frame
+        payload is read. Text is read as UTF-8 bytes, wrap the reader in
+        io.TextIOWrapper to read str.
+    """
+
+    def __init__(self, websocket: WebSocket, frame: ABNF) -> None:
+        super().__init__()
+        self.websocket = websocket
+        self.opcode = frame.opcode
+        self.size = 0
+        self._fin = frame.fin
+        # Payload of a frame that was already received completely.
+        self._pending = memoryview(frame.data)
+        self._eof = False
+        self._deflate = websocket.permessage_deflate if frame.rsv1 else None
+        self._inflate_starved = True
+        self._inflate_finishing = False
+        self._utf8_validator = None
+        if (
+            frame.opcode == ABNF.OPCODE_TEXT
+            and not websocket.cont_frame.skip_utf8_validation
+        ):
+            self._utf8_validator = Utf8Validator()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """
+        Read up to size bytes of the message, or all that is left of it
+        if size is omitted or negative. Returns b"" at the end.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if size is None or size < 0:
+            return self.readall()
+        if not size or self._eof:
+            return b""
+
+        websocket = self.websocket
+        with websocket.readlock:
+            if self._deflate:
+                data = self._inflate(size)
+            else:
+                data = self._read_payload(size)
+        self.size += len(data)
+        max_message_size = websocket.cont_frame.max_message_size
+        if max_message_size and self.size > max_message_size:
+            websocket._fail(STATUS_MESSAGE_TOO_BIG)
+            raise WebSocketMessageTooBigException(
+                f"Message is larger than {max_message_size} bytes"
+            )
+        if self._utf8_validator and not self._utf8_validator.validate(data, not data):
+            raise WebSocketPayloadException(f"cannot decode: {repr(data)}")
+        if not data:
+            self._eof = True
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """
+        Skip the rest of the message and close the reader.
+        """
+        try:
+            while not self.closed and not self._eof and self.websocket.sock:
+                self.read(io.DEFAULT_BUFFER_SIZE)
+        finally:
+            super().close()
+
+    def __del__(self) -> None:
+        # Don't read from the socket in a finalizer.
+        self._eof = True
+        super().__del__()
+
+    def _read_payload(self, size: int) -> bytes:
+        # Payload of the message as received, b"" after its last frame.
+        while True:
+            if self._pending:
+                data = bytes(self._pending[:size])
+                self._pending = self._pending[size:]
+                return data
+            frame_buffer = self.websocket.frame_buffer
+            if frame_buffer.payload_remaining:
+                return frame_buffer.recv_payload(size)
+            if self._fin:
+                return b""
+            frame = self.websocket._recv_stream_frame()
+            if frame.opcode == ABNF.OPCODE_CLOSE:
+                raise WebSocketConnectionClosedException(
+                    "Connection closed in the middle of a message."
+                )
+            if frame.opcode != ABNF.OPCODE_CONT:
+                raise WebSocketProtocolException("Illegal frame")
+            self._fin = frame.fin
+            self._pending = memoryview(frame.data)
+
+    def _inflate(self, size: int) -> bytes:
+        # Decompressed payload, reading more of it only when the previous
+        # input is used up so that neither side of zlib grows unbounded.
+        while True:
+            data, fin = b"", False
+            if self._inflate_starved and not self._inflate_finishing:
+                data = self._read_payload(size)
+                fin = self._inflate_finishing = not data
+            output = self._deflate.inflate(data, size, fin)
+            self._inflate_starved = len(output) < size
+            if output:
+                return output
+            if self._inflate_finishing and self._inflate_starved:
+                self._deflate.end_message()
+                return b""
+
+
 def create_connection(url: str, timeout=None, class_=WebSocket, **options):
     """
     Connect to url and return websocket object.
@@ -621,6 +1119,10 @@ class to instantiate when creating the connection. It has to implement
     timeout: int or float
         socket timeout time. This value could be either float/integer.
         If set to None, it uses the default_timeout value.
+    happy_eyeballs_delay: int or float
+        Delay between the connection attempts to the addresses of the host,
+        which are raced (RFC 8305). Default is None, try them one after the
+        other.
     http_proxy_host: str
         HTTP proxy host name.
     http_proxy_port: str or int
@@ -644,6 +1146,12 @@ class to instantiate when creating the connection. It has to implement
         List of available subprotocols. Default is None.
     skip_utf8_validation: bool
         Skip utf8 validation.
+    max_message_size: int
+        Maximum size of a received message. Default is None, no limit.
+    frame_capture: FrameCapture
+        Keeps the raw bytes of the last frames sent and received.
+    metrics: Metrics
+        Counts the frames, bytes and socket calls of the connection.
     socket: socket
         Pre-initialized stream socket.
     """
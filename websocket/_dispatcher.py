@@ -1,13 +1,20 @@
 import time
+import heapq
+import signal
 import socket
 import inspect
+import itertools
 import selectors
-from typing import TYPE_CHECKING, Callable, Optional, Union
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 if TYPE_CHECKING:
     from ._app import WebSocketApp
+    from ._core import WebSocket
 from . import _logging
 from ._socket import send
+from ._ssl_compat import HAVE_SSL, SSLWantReadError, SSLWantWriteError, ssl
 
 """
 _dispatcher.py
@@ -55,7 +62,7 @@ def reconnect(self, seconds: int, reconnector: Callable) -> None:
             _logging.info(f"User exited {e}")
             raise e
 
-    def send(self, sock: socket.socket, data: Union[str, bytes]) -> int:
+    def send(self, sock: socket.socket, data: Union[str, bytes, list]) -> int:
         return send(sock, data)
 
 
@@ -153,7 +160,9 @@ def read(
         if self.ping_timeout:
             self.timeout(self.ping_timeout, check_callback)
 
-    def send(self, sock: socket.socket, data: Union[str, bytes]) -> int:
+    def send(self, sock: socket.socket, data: Union[str, bytes, list]) -> int:
+        if isinstance(data, list):
+            data = b"".join(data)
         self.dispatcher.buffwrite(sock, data, send, self.handleDisconnect)
         return len(data)
 
@@ -162,3 +171,392 @@ def timeout(self, seconds: float, callback: Callable, *args) -> None:
 
     def reconnect(self, seconds: int, reconnector: Callable) -> None:
         self.timeout(seconds, reconnector, True)
+
+
+class HubDispatcher(WrappedDispatcher):
+    """
+    HubDispatcher
+
+    WrappedDispatcher of the WebSocketApp connections run by a WebSocketHub.
+    """
+
+    def read(
+        self,
+        sock: socket.socket,
+        read_callback: Callable,
+        check_callback: Callable,
+    ) -> None:
+        # The hub reads from non-blocking sockets, so a read callback stops
+        # with BlockingIOError once the data received so far is consumed.
+        # Frames are received incrementally, the rest is read next time.
+        def read() -> bool:
+            try:
+                return read_callback()
+            except (BlockingIOError, SSLWantReadError):
+                return True
+            except Exception as e:
+                return self.handleDisconnect(e)
+
+        def check() -> bool:
+            if self.app.sock is None or self.app.sock.sock is not sock:
+                # The connection was closed or replaced.
+                return False
+            try:
+                return check_callback()
+            except Exception as e:
+                self.handleDisconnect(e)
+                return False
+
+        self.dispatcher.read(sock, read)
+        if self.ping_timeout:
+            self.timeout(self.ping_timeout, check)
+
+    def start_ping(self, websock: "WebSocket") -> None:
+        """
+        Send pings every ping_interval seconds from the hub, until the
+        connection is closed or replaced.
+        """
+
+        def ping() -> bool:
+            if not self.app.keep_running or self.app.sock is not websock:
+                return False
+            self.app._ping()
+            return True
+
+        self.timeout(self.app.ping_interval, ping)
+
+    def connect(
+        self,
+        websock: "WebSocket",
+        connect: Callable,
+        opened: Callable,
+        failed: Callable,
+    ) -> None:
+        """
+        Call connect() in a thread of its own, so that a slow handshake
+        doesn't hold up the other connections of the hub, then opened(), or
+        failed(error) if either raised, from the hub.
+        """
+
+        def done(_, error: Optional[BaseException]) -> None:
+            if self.app.sock is not websock:
+                # Closed while connecting.
+                websock.shutdown()
+                return
+            if error is None:
+                try:
+                    opened()
+                    return
+                except Exception as e:
+                    error = e
+            failed(error)
+
+        self.dispatcher.run_in_thread(connect, done)
+
+    def close(self, websock: "WebSocket", **kwargs) -> None:
+        """
+        Close websock in a thread of its own, which waits for the close
+        frame of the server instead of the hub.
+        """
+        self.dispatcher.run_in_thread(
+            lambda: websock.close(**kwargs), lambda result, error: None
+        )
+
+
+class _Channel:
+    # State of a socket registered with a WebSocketHub.
+    def __init__(self) -> None:
+        self.read_callback: Optional[Callable] = None
+        # Data that could not be sent yet, in order.
+        self.pending: deque = deque()
+        self.send: Optional[Callable] = None
+        self.handle_disconnect: Optional[Callable] = None
+
+
+class WebSocketHub:
+    """
+    Event loop that runs many WebSocketApp connections in a single thread.
+
+    Pass the hub as the dispatcher of WebSocketApp.run_forever(), which then
+    returns right away, and run the hub with dispatch(). One selector
+    waits for data on all connections, and pings, ping timeouts and
+    reconnects are timers of the hub instead of threads. Callbacks are run
+    in the thread that runs dispatch().
+
+    >>> hub = WebSocketHub()
+    >>> for url in urls:
+    ...     app = WebSocketApp(url, on_message=on_message)
+    ...     app.run_forever(dispatcher=hub, ping_interval=30, reconnect=5)
+    >>> hub.dispatch()
+
+    Connecting, including reconnecting, and waiting for the server to close
+    are blocking, so they are done by short-lived threads, see
+    run_in_thread(), and one slow server doesn't hold up the others.
+    """
+
+    # How often sockets that were closed without being unregistered are
+    # removed from the selector, in seconds.
+    _SWEEP_INTERVAL = 10.0
+
+    def __init__(self) -> None:
+        self.selector = selectors.DefaultSelector()
+        self.channels: dict = {}
+        # Heap of timers: deadline, sequence number, interval, callback, args.
+        self.timers: list = []
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        # Notified when a thread of run_in_thread() is done.
+        self._thread_done = threading.Condition(self._lock)
+        self._thread_id: Optional[int] = None
+        self._running = False
+        # Threads started by run_in_thread() that haven't called back yet.
+        self._workers = 0
+        self._next_sweep = 0.0
+        # Written to by other threads to wake up the selector.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+    def read(self, sock: socket.socket, callback: Callable) -> None:
+        """
+        Call callback whenever sock has data to read, until it returns
+        False or sock is closed. sock is switched to non-blocking mode.
+        """
+        sock.setblocking(False)
+        with self._lock:
+            self._get_channel(sock).read_callback = callback
+            self._update(sock)
+        self._wakeup()
+
+    def buffwrite(
+        self,
+        sock: socket.socket,
+        data: bytes,
+        send: Callable,
+        handleDisconnect: Callable,
+    ) -> None:
+        """
+        Send data to sock, keeping what can't be sent right away to send it
+        once sock is writable. Errors are passed to handleDisconnect.
+        """
+        with self._lock:
+            channel = self._get_channel(sock)
+            channel.send = send
+            channel.handle_disconnect = handleDisconnect
+            channel.pending.append(data)
+            if len(channel.pending) == 1:
+                self._flush(sock, channel)
+            self._update(sock)
+        if channel.pending:
+            self._wakeup()
+
+    def timeout(self, seconds: Optional[float], callback: Callable, *args) -> None:
+        """
+        Call callback(*args) in seconds, and again every seconds as long
+        as it returns True.
+        """
+        seconds = seconds or 0
+        with self._lock:
+            heapq.heappush(
+                self.timers,
+                (
+                    time.monotonic() + seconds,
+                    next(self._sequence),
+                    seconds,
+                    callback,
+                    args,
+                ),
+            )
+        self._wakeup()
+
+    def run_in_thread(self, function: Callable, callback: Callable) -> None:
+        """
+        Call function(), which may block, in a thread of its own, then
+        callback(result, error) from the hub, with error the exception
+        function() raised, or None.
+        """
+        with self._lock:
+            self._workers += 1
+
+        def run() -> None:
+            result = error = None
+            try:
+                result = function()
+            except BaseException as e:
+                error = e
+            finally:
+                with self._lock:
+                    self.timeout(0, self._call_back, callback, result, error)
+                    self._workers -= 1
+                    self._thread_done.notify_all()
+
+        threading.Thread(target=run, name="websocket-hub-worker", daemon=True).start()
+
+    def join_threads(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the threads of run_in_thread() to be done, e.g. before
+        exiting once the connections are closed. Returns False on timeout.
+        """
+        with self._thread_done:
+            return self._thread_done.wait_for(lambda: not self._workers, timeout)
+
+    def signal(self, sig: int, callback: Callable, *args) -> None:
+        """
+        Call callback(*args) on signal sig. Only possible from the main
+        thread, the signal is left alone otherwise.
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(sig, lambda *_: callback(*args))
+
+    def abort(self) -> None:
+        """
+        Make dispatch() return. The connections are left open.
+        """
+        self._running = False
+        self._wakeup()
+
+    def dispatch(self) -> None:
+        """
+        Run the event loop until abort() is called, or there are no
+        connections, timers and threads left.
+        """
+        self._thread_id = threading.get_ident()
+        self._running = True
+        try:
+            while self._running and (
+                len(self.selector.get_map()) > 1 or self.timers or self._workers
+            ):
+                self._run_once()
+        finally:
+            self._thread_id = None
+
+    def close(self) -> None:
+        """
+        Release the resources of the hub. The connections are left open.
+        """
+        self.selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    def _run_once(self) -> None:
+        deadline = self._next_sweep
+        if self.timers:
+            deadline = min(deadline, self.timers[0][0])
+        events_ready = self.selector.select(max(0, deadline - time.monotonic()))
+        for key, events in events_ready:
+            sock = key.fileobj
+            if sock is self._wakeup_r:
+                try:
+                    while self._wakeup_r.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+            channel = key.data
+            if events & selectors.EVENT_WRITE:
+                with self._lock:
+                    self._flush(sock, channel)
+                    self._update(sock)
+            if events & selectors.EVENT_READ and channel.read_callback:
+                self._read(sock, channel)
+
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            with self._lock:
+                _, _, interval, callback, args = heapq.heappop(self.timers)
+            try:
+                again = callback(*args)
+            except Exception as e:
+                _logging.error(f"error from timer callback {callback}: {e}")
+                again = False
+            if again:
+                self.timeout(interval, callback, *args)
+
+        if now >= self._next_sweep or not events_ready:
+            self._next_sweep = now + self._SWEEP_INTERVAL
+            for sock in list(self.channels):
+                if sock.fileno() == -1:
+                    self._unregister(sock)
+
+    def _read(self, sock: socket.socket, channel: _Channel) -> None:
+        while True:
+            try:
+                keep = channel.read_callback()
+            except Exception as e:
+                _logging.error(f"error from read callback: {e}")
+                keep = False
+            if not keep or sock.fileno() == -1:
+                self._unregister(sock)
+                return
+            # Data decrypted by the SSL layer doesn't wake up the selector.
+            if not (HAVE_SSL and isinstance(sock, ssl.SSLSocket) and sock.pending()):
+                return
+
+    def _flush(self, sock: socket.socket, channel: _Channel) -> None:
+        while channel.pending:
+            data = channel.pending[0]
+            try:
+                sent = channel.send(sock, data)
+            except (BlockingIOError, SSLWantWriteError):
+                return
+            except Exception as e:
+                channel.pending.clear()
+                # Disconnect from the loop, the sender may hold locks.
+                self.timeout(0, self._disconnect, channel.handle_disconnect, e)
+                return
+            if sent >= len(data):
+                channel.pending.popleft()
+            else:
+                channel.pending[0] = memoryview(data)[sent:]
+
+    def _disconnect(self, handle_disconnect: Callable, e: Exception) -> None:
+        handle_disconnect(e)
+
+    def _call_back(self, callback: Callable, result: Any, error: Any) -> None:
+        # Not rescheduled, whatever callback returns.
+        callback(result, error)
+
+    def _get_channel(self, sock: socket.socket) -> _Channel:
+        channel = self.channels.get(sock)
+        if channel is None:
+            channel = self.channels[sock] = _Channel()
+        return channel
+
+    def _update(self, sock: socket.socket) -> None:
+        # Register sock for the events its channel waits for.
+        channel = self.channels.get(sock)
+        if channel is None:
+            return
+        events = (selectors.EVENT_READ if channel.read_callback else 0) | (
+            selectors.EVENT_WRITE if channel.pending else 0
+        )
+        try:
+            key = self.selector.get_key(sock)
+        except KeyError:
+            key = None
+        if key is not None and key.fileobj is not sock:
+            # A closed socket left behind with the same file descriptor.
+            self._unregister(key.fileobj)
+            key = None
+        if not events:
+            self._unregister(sock)
+        elif key is None:
+            self.selector.register(sock, events, channel)
+        elif key.events != events:
+            self.selector.modify(sock, events, channel)
+
+    def _unregister(self, sock: socket.socket) -> None:
+        with self._lock:
+            self.channels.pop(sock, None)
+            try:
+                self.selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+
+    def _wakeup(self) -> None:
+        if self._thread_id is not None and self._thread_id != threading.get_ident():
+            try:
+                self._wakeup_w.send(b"\0")
+            except BlockingIOError:
+                pass
@@ -0,0 +1,177 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+"""
+_dns.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+__all__ = ["DNSCache", "setdnscache", "getdnscache"]
+
+_dns_cache: Optional["DNSCache"] = None
+
+
+class _Entry(NamedTuple):
+    expires: float
+    refresh_at: float
+    addrinfo_list: list
+    error: Optional[socket.gaierror]
+
+
+class DNSCache:
+    """
+    Cache of the addresses resolved to connect, so that reconnects don't
+    wait for the resolver. Enable it with setdnscache().
+
+    Addresses are cached by the host and port resolved, which are the
+    proxy's when connecting through an HTTP proxy. Concurrent lookups of
+    the same host wait for the first one, instead of all querying the
+    resolver.
+
+    Parameters
+    ----------
+    ttl: int or float
+        How long resolved addresses are used, in seconds. Default is 60.
+    negative_ttl: int or float
+        How long resolution failures are remembered, in seconds. 0 disables
+        negative caching. Default is 5.
+    refresh: bool
+        Resolve the addresses again in a background thread, when they are
+        used in the second half of their ttl, so that they rarely expire.
+        Default is False.
+    maxsize: int
+        Maximum number of cached hosts. The least recently used ones are
+        dropped first. Default is 1024.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        negative_ttl: float = 5,
+        refresh: bool = False,
+        maxsize: int = 1024,
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh = refresh
+        self.maxsize = maxsize
+        # Lookups answered from the cache, and by the resolver.
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict = OrderedDict()
+        self.resolving: set = set()
+        self.condition = threading.Condition()
+
+    def getaddrinfo(self, host: str, port: int) -> list:
+        """
+        Resolve host and port to a list of TCP addresses, like
+        socket.getaddrinfo(). socket.gaierror is raised if that fails.
+        """
+        key = (host, port)
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                entry = self.entries.get(key)
+                if entry is not None and entry.expires > now:
+                    self.hits += 1
+                    self.entries.move_to_end(key)
+                    if entry.refresh_at <= now and key not in self.resolving:
+                        self.resolving.add(key)
+                        threading.Thread(
+                            target=self._resolve, args=key, daemon=True
+                        ).start()
+                    break
+                if key not in self.resolving:
+                    self.misses += 1
+                    self.resolving.add(key)
+                    entry = None
+                    break
+                self.condition.wait()
+        if entry is None:
+            entry = self._resolve(host, port)
+        if entry.error is not None:
+            raise socket.gaierror(*entry.error.args)
+        return entry.addrinfo_list
+
+    def clear(self) -> None:
+        """
+        Forget all cached addresses.
+        """
+        with self.condition:
+            self.entries.clear()
+
+    def _resolve(self, host: str, port: int) -> _Entry:
+        # Called by the thread that added (host, port) to self.resolving.
+        try:
+            addrinfo_list = socket.getaddrinfo(
+                host, port, 0, socket.SOCK_STREAM, socket.SOL_TCP
+            )
+            error = None
+            ttl = self.ttl
+        except socket.gaierror as e:
+            addrinfo_list = []
+            error = e
+            ttl = self.negative_ttl
+        except BaseException:
+            with self.condition:
+                self.resolving.discard((host, port))
+                self.condition.notify_all()
+            raise
+        now = time.monotonic()
+        refresh_at = now + ttl / 2 if self.refresh else float("inf")
+        entry = _Entry(now + ttl, refresh_at, addrinfo_list, error)
+        key = (host, port)
+        with self.condition:
+            self.resolving.discard(key)
+            previous = self.entries.get(key)
+            if error is None or previous is None or previous.expires <= now:
+                # A failed refresh keeps the addresses until they expire.
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+            self.condition.notify_all()
+        return entry
+
+
+def setdnscache(cache: Optional[DNSCache]) -> None:
+    """
+    Set the DNS cache used to connect. None disables caching, which is the
+    default.
+
+    Parameters
+    ----------
+    cache: DNSCache
+        Cache shared by all connections.
+    """
+    global _dns_cache
+    _dns_cache = cache
+
+
+def getdnscache() -> Optional[DNSCache]:
+    """
+    Get the DNS cache used to connect.
+
+    Returns
+    ----------
+    _dns_cache: DNSCache
+        Return the cache set by setdnscache(), or None.
+    """
+    return _dns_cache
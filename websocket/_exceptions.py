@@ -42,6 +42,15 @@ class WebSocketPayloadException(WebSocketException):
     pass
 
 
+class WebSocketMessageTooBigException(WebSocketPayloadException):
+    """
+    If a received message is larger than the configured limit, this
+    exception will be raised.
+    """
+
+    pass
+
+
 class WebSocketConnectionClosedException(WebSocketException):
     """
     If remote host closed the connection or some network error happened,
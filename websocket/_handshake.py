@@ -22,10 +22,12 @@
 import os
 from base64 import encodebytes as base64encode
 from http import HTTPStatus
+from typing import Optional
 
+from ._compression import PerMessageDeflate
 from ._cookiejar import SimpleCookieJar
 from ._exceptions import WebSocketException, WebSocketBadStatusException
-from ._http import read_headers
+from ._http import _save_ssl_session, read_headers
 from ._logging import dump, error
 from ._socket import send
 
@@ -47,10 +49,21 @@
 
 
 class handshake_response:
-    def __init__(self, status: int, headers: dict, subprotocol):
+    def __init__(
+        self,
+        status: int,
+        headers: dict,
+        subprotocol,
+        permessage_deflate: Optional[PerMessageDeflate] = None,
+        rest: bytes = b"",
+    ):
         self.status = status
         self.headers = headers
         self.subprotocol = subprotocol
+        self.permessage_deflate = permessage_deflate
+        # Bytes received after the response headers, i.e. the start of the
+        # first frames, which belong to the frame buffer.
+        self.rest = rest
         CookieJar.add(headers.get("set-cookie"))
 
 
@@ -63,14 +76,40 @@ def handshake(
     send(sock, header_str)
     dump("request header", header_str)
 
-    status, resp = _get_resp_headers(sock)
+    rest = bytearray()
+    status, resp = _get_resp_headers(sock, rest=rest)
+    _save_ssl_session(sock, port)
+    response = _get_handshake_response(status, resp, key, options)
+    response.rest = bytes(rest)
+    return response
+
+
+def _get_handshake_response(
+    status: int, resp: dict, key: str, options: dict
+) -> handshake_response:
+    # Validate the response headers to the handshake request.
     if status in SUPPORTED_REDIRECT_STATUSES:
         return handshake_response(status, resp, None)
     success, subproto = _validate(resp, key, options.get("subprotocols"))
     if not success:
         raise WebSocketException("Invalid WebSocket Header")
 
-    return handshake_response(status, resp, subproto)
+    permessage_deflate = None
+    deflate_options = _get_deflate_options(options)
+    # Without an offer, the extensions header is ignored like it used to be.
+    if deflate_options is not None and (
+        extensions := resp.get("sec-websocket-extensions")
+    ):
+        permessage_deflate = PerMessageDeflate.accept(extensions, deflate_options)
+
+    return handshake_response(status, resp, subproto, permessage_deflate)
+
+
+def _get_deflate_options(options: dict) -> Optional[dict]:
+    deflate_options = options.get("permessage_deflate")
+    if not deflate_options:
+        return None
+    return deflate_options if isinstance(deflate_options, dict) else {}
 
 
 def _pack_hostname(hostname: str) -> str:
@@ -123,6 +162,11 @@ def _get_handshake_headers(
     if subprotocols := options.get("subprotocols"):
         headers.append(f'Sec-WebSocket-Protocol: {",".join(subprotocols)}')
 
+    if (deflate_options := _get_deflate_options(options)) is not None:
+        headers.append(
+            f"Sec-WebSocket-Extensions: {PerMessageDeflate.offer(deflate_options)}"
+        )
+
     if header := options.get("header"):
         if isinstance(header, dict):
             header = [": ".join([k, v]) for k, v in header.items() if v is not None]
@@ -138,16 +182,20 @@ def _get_handshake_headers(
     return headers, key
 
 
-def _get_resp_headers(sock, success_statuses: tuple = SUCCESS_STATUSES) -> tuple:
-    status, resp_headers, status_message = read_headers(sock)
+def _get_resp_headers(
+    sock,
+    success_statuses: tuple = SUCCESS_STATUSES,
+    rest: Optional[bytearray] = None,
+) -> tuple:
+    status, resp_headers, status_message = read_headers(sock, rest)
     if status not in success_statuses:
         content_len = resp_headers.get("content-length")
         if content_len:
             # Use chunked reading to avoid SSL BAD_LENGTH error on large responses
             from ._socket import recv
 
-            response_body = b""
-            remaining = int(content_len)
+            response_body = bytes(rest[: int(content_len)]) if rest else b""
+            remaining = int(content_len) - len(response_body)
             while remaining > 0:
                 chunk_size = min(remaining, 16384)  # Read in 16KB chunks
                 chunk = recv(sock, chunk_size)
@@ -155,16 +203,22 @@ def _get_resp_headers(sock, success_statuses: tuple = SUCCESS_STATUSES) -> tuple
                 remaining -= len(chunk)
         else:
             response_body = None
-        raise WebSocketBadStatusException(
-            f"Handshake status {status} {status_message} -+-+- {resp_headers} -+-+- {response_body}",
-            status,
-            status_message,
-            resp_headers,
-            response_body,
-        )
+        raise _bad_status(status, status_message, resp_headers, response_body)
     return status, resp_headers
 
 
+def _bad_status(
+    status: int, status_message, resp_headers: dict, response_body
+) -> WebSocketBadStatusException:
+    return WebSocketBadStatusException(
+        f"Handshake status {status} {status_message} -+-+- {resp_headers} -+-+- {response_body}",
+        status,
+        status_message,
+        resp_headers,
+        response_body,
+    )
+
+
 _HEADERS_TO_CHECK = {
     "upgrade": "websocket",
     "connection": "upgrade",
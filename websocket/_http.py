@@ -19,20 +19,57 @@
 
 import errno
 import os
+import itertools
+import re
+import selectors
 import socket
+import threading
+import time
+import weakref
 from base64 import encodebytes as base64encode
+from collections import OrderedDict
+from typing import Iterable, Optional
 
+from ._dns import getdnscache
 from ._exceptions import (
     WebSocketAddressException,
     WebSocketException,
     WebSocketProxyException,
 )
 from ._logging import debug, dump, trace
-from ._socket import DEFAULT_SOCKET_OPTION, recv_line, send
+from ._socket import DEFAULT_SOCKET_OPTION, recv, recv_line, send
 from ._ssl_compat import HAVE_SSL, ssl
 from ._url import get_proxy_info, parse_url
 
-__all__ = ["proxy_info", "connect", "read_headers"]
+__all__ = ["proxy_info", "connect", "read_headers", "parse_headers"]
+
+# Number of bytes requested at a time while reading response headers, the
+# maximum size of a TLS record.
+_HEADER_READ_SIZE = 16384
+_HEADERS_END = re.compile(rb"\r?\n\r?\n")
+
+# connect_ex() results of a non-blocking connect still in progress.
+_CONNECT_IN_PROGRESS = {
+    0,
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+}
+
+# SSL contexts created from sslopt, by the options they were created with,
+# least recently used first.
+_SSL_CONTEXT_CACHE_SIZE = 32
+_ssl_contexts: OrderedDict = OrderedDict()
+# TLS sessions to resume, by context and (hostname, port).
+_ssl_sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_ssl_lock = threading.Lock()
+# sslopt entries used to wrap sockets, which don't change the context.
+_SSL_WRAP_OPTIONS = (
+    "context",
+    "server_hostname",
+    "do_handshake_on_connect",
+    "suppress_ragged_eofs",
+)
 
 try:
     from python_socks._errors import ProxyConnectionError, ProxyError, ProxyTimeoutError
@@ -87,7 +124,21 @@ def _start_proxied_socket(url: str, options, proxy) -> tuple:
         )
 
     hostname, port, resource, is_secure = parse_url(url)
+    ws_proxy = Proxy.create(**_get_socks_proxy_options(proxy))
+
+    sock = ws_proxy.connect(hostname, port, timeout=proxy.proxy_timeout)
+
+    if is_secure:
+        if HAVE_SSL:
+            sock = _ssl_socket(sock, options.sslopt, hostname, port)
+        else:
+            raise WebSocketException("SSL not available.")
+
+    return sock, (hostname, port, resource)
+
 
+def _get_socks_proxy_options(proxy) -> dict:
+    # Arguments of Proxy.create() of python-socks for a SOCKS proxy.
     if proxy.proxy_protocol == "socks4":
         rdns = False
         proxy_type = ProxyType.SOCKS4
@@ -103,24 +154,14 @@ def _start_proxied_socket(url: str, options, proxy) -> tuple:
         rdns = True
         proxy_type = ProxyType.SOCKS5
 
-    ws_proxy = Proxy.create(
-        proxy_type=proxy_type,
-        host=proxy.proxy_host,
-        port=int(proxy.proxy_port),
-        username=proxy.auth[0] if proxy.auth else None,
-        password=proxy.auth[1] if proxy.auth else None,
-        rdns=rdns,
-    )
-
-    sock = ws_proxy.connect(hostname, port, timeout=proxy.proxy_timeout)
-
-    if is_secure:
-        if HAVE_SSL:
-            sock = _ssl_socket(sock, options.sslopt, hostname)
-        else:
-            raise WebSocketException("SSL not available.")
-
-    return sock, (hostname, port, resource)
+    return {
+        "proxy_type": proxy_type,
+        "host": proxy.proxy_host,
+        "port": int(proxy.proxy_port),
+        "username": proxy.auth[0] if proxy.auth else None,
+        "password": proxy.auth[1] if proxy.auth else None,
+        "rdns": rdns,
+    }
 
 
 def connect(url: str, options, proxy, socket):
@@ -143,13 +184,18 @@ def connect(url: str, options, proxy, socket):
 
     sock = None
     try:
-        sock = _open_socket(addrinfo_list, options.sockopt, options.timeout)
+        sock = _open_socket(
+            addrinfo_list,
+            options.sockopt,
+            options.timeout,
+            options.happy_eyeballs_delay,
+        )
         if need_tunnel:
             sock = _tunnel(sock, hostname, port_from_url, auth)
 
         if is_secure:
             if HAVE_SSL:
-                sock = _ssl_socket(sock, options.sslopt, hostname)
+                sock = _ssl_socket(sock, options.sslopt, hostname, port_from_url)
             else:
                 raise WebSocketException("SSL not available.")
 
@@ -174,9 +220,7 @@ def _get_addrinfo_list(hostname, port: int, is_secure: bool, proxy) -> tuple:
         # This generates an error exception: `_on_error: exception Socket type must be stream or datagram, not 0`
         # or `OSError: [Errno 22] Invalid argument` when creating socket. Force the socket type to SOCK_STREAM.
         if not phost:
-            addrinfo_list = socket.getaddrinfo(
-                hostname, port, 0, socket.SOCK_STREAM, socket.SOL_TCP
-            )
+            addrinfo_list = _getaddrinfo(hostname, port)
             return addrinfo_list, False, None
         else:
             pport = pport and pport or 80
@@ -184,24 +228,26 @@ def _get_addrinfo_list(hostname, port: int, is_secure: bool, proxy) -> tuple:
             # returns a socktype 0. This generates an error exception:
             # _on_error: exception Socket type must be stream or datagram, not 0
             # Force the socket type to SOCK_STREAM
-            addrinfo_list = socket.getaddrinfo(
-                phost, pport, 0, socket.SOCK_STREAM, socket.SOL_TCP
-            )
+            addrinfo_list = _getaddrinfo(phost, pport)
             return addrinfo_list, True, pauth
     except socket.gaierror as e:
         raise WebSocketAddressException(e)
 
 
-def _open_socket(addrinfo_list, sockopt, timeout):
+def _getaddrinfo(host, port: int) -> list:
+    dns_cache = getdnscache()
+    if dns_cache is not None:
+        return dns_cache.getaddrinfo(host, port)
+    return socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM, socket.SOL_TCP)
+
+
+def _open_socket(addrinfo_list, sockopt, timeout, happy_eyeballs_delay=None):
+    if happy_eyeballs_delay is not None and len(addrinfo_list) > 1:
+        return _race_sockets(addrinfo_list, sockopt, timeout, happy_eyeballs_delay)
+
     err = None
     for addrinfo in addrinfo_list:
-        family, socktype, proto = addrinfo[:3]
-        sock = socket.socket(family, socktype, proto)
-        sock.settimeout(timeout)
-        for opts in DEFAULT_SOCKET_OPTION:
-            sock.setsockopt(*opts)
-        for opts in sockopt:
-            sock.setsockopt(*opts)
+        sock = _create_socket(addrinfo, sockopt, timeout)
 
         address = addrinfo[4]
         err = None
@@ -235,92 +281,269 @@ def _open_socket(addrinfo_list, sockopt, timeout):
     return sock
 
 
-def _wrap_sni_socket(sock: socket.socket, sslopt: dict, hostname, check_hostname):
-    context = sslopt.get("context", None)
-    if not context:
-        context = ssl.SSLContext(sslopt.get("ssl_version", ssl.PROTOCOL_TLS_CLIENT))
-        # Non default context need to manually enable SSLKEYLOGFILE support by setting the keylog_filename attribute.
-        # For more details see also:
-        # * https://docs.python.org/3.8/library/ssl.html?highlight=sslkeylogfile#context-creation
-        # * https://docs.python.org/3.8/library/ssl.html?highlight=sslkeylogfile#ssl.SSLContext.keylog_filename
-        keylog_file = os.environ.get("SSLKEYLOGFILE")
-        if keylog_file is not None:
-            context.keylog_filename = keylog_file
-
-        if sslopt.get("cert_reqs", ssl.CERT_NONE) != ssl.CERT_NONE:
-            cafile = sslopt.get("ca_certs", None)
-            capath = sslopt.get("ca_cert_path", None)
-            if cafile or capath:
-                try:
-                    context.load_verify_locations(cafile=cafile, capath=capath)
-                except (FileNotFoundError, ssl.SSLError, ValueError) as e:
-                    raise WebSocketException(f"SSL CA certificate loading failed: {e}")
-            elif hasattr(context, "load_default_certs"):
-                try:
-                    context.load_default_certs(ssl.Purpose.SERVER_AUTH)
-                except ssl.SSLError as e:
-                    raise WebSocketException(
-                        f"SSL default certificate loading failed: {e}"
-                    )
-        if sslopt.get("certfile", None):
-            try:
-                context.load_cert_chain(
-                    sslopt["certfile"],
-                    sslopt.get("keyfile", None),
-                    sslopt.get("password", None),
-                )
-            except (FileNotFoundError, ValueError) as e:
-                raise WebSocketException(f"SSL client certificate loading failed: {e}")
-            except ssl.SSLError as e:
-                raise WebSocketException(f"SSL client certificate loading failed: {e}")
-
-        # Python 3.10 switch to PROTOCOL_TLS_CLIENT defaults to "cert_reqs = ssl.CERT_REQUIRED" and "check_hostname = True"
-        # If both disabled, set check_hostname before verify_mode
-        # see https://github.com/liris/websocket-client/commit/b96a2e8fa765753e82eea531adb19716b52ca3ca#commitcomment-10803153
-        if sslopt.get("cert_reqs", ssl.CERT_NONE) == ssl.CERT_NONE and not sslopt.get(
-            "check_hostname", False
-        ):
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-        else:
-            context.check_hostname = sslopt.get("check_hostname", True)
-            context.verify_mode = sslopt.get("cert_reqs", ssl.CERT_REQUIRED)
+def _create_socket(addrinfo, sockopt, timeout) -> socket.socket:
+    family, socktype, proto = addrinfo[:3]
+    sock = socket.socket(family, socktype, proto)
+    sock.settimeout(timeout)
+    for opts in DEFAULT_SOCKET_OPTION:
+        sock.setsockopt(*opts)
+    for opts in sockopt:
+        sock.setsockopt(*opts)
+    return sock
+
 
-        if "ciphers" in sslopt:
+def _race_sockets(addrinfo_list, sockopt, timeout, delay: float) -> socket.socket:
+    # Happy Eyeballs (RFC 8305): start a connection attempt every delay
+    # seconds, or as soon as the previous one failed, alternating address
+    # families, and keep the first socket to connect. Each attempt times out
+    # on its own, after timeout seconds.
+    families: dict = {}
+    for addrinfo in addrinfo_list:
+        families.setdefault(addrinfo[0], []).append(addrinfo)
+    pending = [
+        addrinfo
+        for addrinfos in itertools.zip_longest(*families.values())
+        for addrinfo in addrinfos
+        if addrinfo is not None
+    ]
+    pending.reverse()
+    attempts: dict = {}
+    err = None
+    next_attempt = time.monotonic()
+    with selectors.DefaultSelector() as selector:
+        try:
+            while pending or attempts:
+                now = time.monotonic()
+                if pending and (next_attempt <= now or not attempts):
+                    addrinfo = pending.pop()
+                    sock = _create_socket(addrinfo, sockopt, 0)
+                    code = sock.connect_ex(addrinfo[4])
+                    if code in _CONNECT_IN_PROGRESS:
+                        selector.register(sock, selectors.EVENT_WRITE, addrinfo[4])
+                        attempts[sock] = now + timeout if timeout else float("inf")
+                    else:
+                        sock.close()
+                        err = _connect_error(code, addrinfo[4])
+                    next_attempt = now + delay
+                    continue
+
+                deadline = min(attempts.values())
+                if pending:
+                    deadline = min(deadline, next_attempt)
+                if deadline == float("inf"):
+                    events = selector.select()
+                else:
+                    events = selector.select(max(deadline - now, 0))
+                for key, _ in events:
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    del attempts[sock]
+                    code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if not code:
+                        sock.settimeout(timeout)
+                        return sock
+                    sock.close()
+                    err = _connect_error(code, key.data)
+                    next_attempt = now
+
+                now = time.monotonic()
+                for sock, deadline in list(attempts.items()):
+                    if deadline <= now:
+                        err = socket.timeout("timed out")
+                        err.remote_ip = str(selector.get_key(sock).data[0])
+                        selector.unregister(sock)
+                        del attempts[sock]
+                        sock.close()
+        finally:
+            for sock in attempts:
+                sock.close()
+    raise err
+
+
+def _connect_error(code: int, address) -> OSError:
+    error = OSError(code, os.strerror(code))
+    error.remote_ip = str(address[0])
+    return error
+
+
+def _create_ssl_context(sslopt: dict) -> "ssl.SSLContext":
+    context = ssl.SSLContext(sslopt.get("ssl_version", ssl.PROTOCOL_TLS_CLIENT))
+    # Non default context need to manually enable SSLKEYLOGFILE support by setting the keylog_filename attribute.
+    # For more details see also:
+    # * https://docs.python.org/3.8/library/ssl.html?highlight=sslkeylogfile#context-creation
+    # * https://docs.python.org/3.8/library/ssl.html?highlight=sslkeylogfile#ssl.SSLContext.keylog_filename
+    keylog_file = os.environ.get("SSLKEYLOGFILE")
+    if keylog_file is not None:
+        context.keylog_filename = keylog_file
+
+    if sslopt.get("cert_reqs", ssl.CERT_NONE) != ssl.CERT_NONE:
+        cafile = sslopt.get("ca_certs", None)
+        capath = sslopt.get("ca_cert_path", None)
+        if cafile or capath:
             try:
-                context.set_ciphers(sslopt["ciphers"])
-            except ssl.SSLError as e:
-                raise WebSocketException(f"SSL cipher configuration failed: {e}")
-        if "cert_chain" in sslopt:
+                context.load_verify_locations(cafile=cafile, capath=capath)
+            except (FileNotFoundError, ssl.SSLError, ValueError) as e:
+                raise WebSocketException(f"SSL CA certificate loading failed: {e}")
+        elif hasattr(context, "load_default_certs"):
             try:
-                cert_chain = sslopt["cert_chain"]
-                if not isinstance(cert_chain, (tuple, list)) or len(cert_chain) != 3:
-                    raise ValueError(
-                        "cert_chain must be a tuple/list of (certfile, keyfile, password)"
-                    )
-                certfile, keyfile, password = cert_chain
-                context.load_cert_chain(certfile, keyfile, password)
-            except ValueError:
-                raise
-            except (FileNotFoundError, ssl.SSLError) as e:
-                raise WebSocketException(
-                    f"SSL client certificate configuration failed: {e}"
+                context.load_default_certs(ssl.Purpose.SERVER_AUTH)
+            except ssl.SSLError as e:
+                raise WebSocketException(f"SSL default certificate loading failed: {e}")
+    if sslopt.get("certfile", None):
+        try:
+            context.load_cert_chain(
+                sslopt["certfile"],
+                sslopt.get("keyfile", None),
+                sslopt.get("password", None),
+            )
+        except (FileNotFoundError, ValueError) as e:
+            raise WebSocketException(f"SSL client certificate loading failed: {e}")
+        except ssl.SSLError as e:
+            raise WebSocketException(f"SSL client certificate loading failed: {e}")
+
+    # Python 3.10 switch to PROTOCOL_TLS_CLIENT defaults to "cert_reqs = ssl.CERT_REQUIRED" and "check_hostname = True"
+    # If both disabled, set check_hostname before verify_mode
+    # see https://github.com/liris/websocket-client/commit/b96a2e8fa765753e82eea531adb19716b52ca3ca#commitcomment-10803153
+    if sslopt.get("cert_reqs", ssl.CERT_NONE) == ssl.CERT_NONE and not sslopt.get(
+        "check_hostname", False
+    ):
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        context.check_hostname = sslopt.get("check_hostname", True)
+        context.verify_mode = sslopt.get("cert_reqs", ssl.CERT_REQUIRED)
+
+    if "ciphers" in sslopt:
+        try:
+            context.set_ciphers(sslopt["ciphers"])
+        except ssl.SSLError as e:
+            raise WebSocketException(f"SSL cipher configuration failed: {e}")
+    if "cert_chain" in sslopt:
+        try:
+            cert_chain = sslopt["cert_chain"]
+            if not isinstance(cert_chain, (tuple, list)) or len(cert_chain) != 3:
+                raise ValueError(
+                    "cert_chain must be a tuple/list of (certfile, keyfile, password)"
                 )
-        if "ecdh_curve" in sslopt:
-            try:
-                context.set_ecdh_curve(sslopt["ecdh_curve"])
-            except ValueError as e:
-                raise WebSocketException(f"SSL ECDH curve configuration failed: {e}")
-
+            certfile, keyfile, password = cert_chain
+            context.load_cert_chain(certfile, keyfile, password)
+        except ValueError:
+            raise
+        except (FileNotFoundError, ssl.SSLError) as e:
+            raise WebSocketException(
+                f"SSL client certificate configuration failed: {e}"
+            )
+    if "ecdh_curve" in sslopt:
+        try:
+            context.set_ecdh_curve(sslopt["ecdh_curve"])
+        except ValueError as e:
+            raise WebSocketException(f"SSL ECDH curve configuration failed: {e}")
+
+    return context
+
+
+def _get_ssl_context(sslopt: dict) -> "ssl.SSLContext":
+    # Loading certificates takes long, so contexts are reused by the
+    # connections with the same options.
+    if context := sslopt.get("context", None):
+        return context
+    key = _get_ssl_context_key(sslopt)
+    if key is None:
+        return _create_ssl_context(sslopt)
+    with _ssl_lock:
+        context = _ssl_contexts.get(key)
+        if context is not None:
+            _ssl_contexts.move_to_end(key)
+            return context
+    context = _create_ssl_context(sslopt)
+    with _ssl_lock:
+        _ssl_contexts[key] = context
+        if len(_ssl_contexts) > _SSL_CONTEXT_CACHE_SIZE:
+            _ssl_contexts.popitem(last=False)
+    return context
+
+
+def _get_ssl_context_key(sslopt: dict) -> Optional[tuple]:
+    # Everything _create_ssl_context() depends on. The modification times
+    # of the certificate files are included, so that renewed certificates
+    # are loaded.
+    options = tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(sslopt.items())
+        if name not in _SSL_WRAP_OPTIONS
+    )
+    paths = [sslopt.get(name) for name in ("ca_certs", "ca_cert_path", "certfile")]
+    paths.append(sslopt.get("keyfile"))
+    if isinstance(sslopt.get("cert_chain"), (tuple, list)):
+        paths.extend(sslopt["cert_chain"][:2])
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns if path else None)
+        except (OSError, TypeError, ValueError):
+            mtimes.append(None)
+    key = (os.environ.get("SSLKEYLOGFILE"), options, tuple(mtimes))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _clear_ssl_cache() -> None:
+    # Forget the cached SSL contexts and TLS sessions.
+    with _ssl_lock:
+        _ssl_contexts.clear()
+        _ssl_sessions.clear()
+
+
+def _wrap_sni_socket(
+    sock: socket.socket, sslopt: dict, hostname, check_hostname, port=None
+):
+    context = _get_ssl_context(sslopt)
+    options = {}
+    with _ssl_lock:
+        session = _ssl_sessions.get(context, {}).get((hostname, port))
+    if session is not None:
+        # Resume the session of the previous connection to the server,
+        # which skips the full handshake.
+        options["session"] = session
     return context.wrap_socket(
         sock,
         do_handshake_on_connect=sslopt.get("do_handshake_on_connect", True),
         suppress_ragged_eofs=sslopt.get("suppress_ragged_eofs", True),
         server_hostname=hostname,
+        **options,
     )
 
 
-def _ssl_socket(sock: socket.socket, user_sslopt: dict, hostname):
+def _ssl_socket(sock: socket.socket, user_sslopt: dict, hostname, port=None):
+    sslopt = _get_sslopt(user_sslopt)
+    if sslopt.get("server_hostname", None):
+        hostname = sslopt["server_hostname"]
+
+    check_hostname = sslopt.get("check_hostname", True)
+    sock = _wrap_sni_socket(sock, sslopt, hostname, check_hostname, port)
+
+    return sock
+
+
+def _save_ssl_session(sock: socket.socket, port: int) -> None:
+    # Keep the TLS session of sock, so that the next connection to the same
+    # server resumes it. TLS 1.3 sessions are only known once data has been
+    # received, so this is called after the handshake response.
+    if not (HAVE_SSL and isinstance(sock, ssl.SSLSocket)):
+        return
+    session = sock.session
+    if session is None or not (session.has_ticket or session.id):
+        return
+    with _ssl_lock:
+        sessions = _ssl_sessions.setdefault(sock.context, {})
+        sessions[(sock.server_hostname, port)] = session
+
+
+def _get_sslopt(user_sslopt: dict) -> dict:
+    # Add the defaults to the ssl options given by the user.
     sslopt: dict = {"cert_reqs": ssl.CERT_REQUIRED}
     sslopt.update(user_sslopt)
 
@@ -338,17 +561,29 @@ def _ssl_socket(sock: socket.socket, user_sslopt: dict, hostname):
     ):
         sslopt["ca_cert_path"] = cert_path
 
-    if sslopt.get("server_hostname", None):
-        hostname = sslopt["server_hostname"]
+    return sslopt
 
-    check_hostname = sslopt.get("check_hostname", True)
-    sock = _wrap_sni_socket(sock, sslopt, hostname, check_hostname)
+
+def _tunnel(sock: socket.socket, host, port: int, auth) -> socket.socket:
+    debug("Connecting proxy...")
+    send(sock, _get_tunnel_header(host, port, auth))
+
+    rest = bytearray()
+    try:
+        status, _, _ = read_headers(sock, rest)
+    except (socket.error, WebSocketException) as e:
+        raise WebSocketProxyException(str(e))
+
+    if status != 200:
+        raise WebSocketProxyException(f"failed CONNECT via proxy status: {status}")
+    if rest:
+        # The server only speaks once the handshake request is sent.
+        raise WebSocketProxyException("unexpected data after CONNECT response")
 
     return sock
 
 
-def _tunnel(sock: socket.socket, host, port: int, auth) -> socket.socket:
-    debug("Connecting proxy...")
+def _get_tunnel_header(host, port: int, auth) -> str:
     connect_header = f"CONNECT {host}:{port} HTTP/1.1\r\n"
     connect_header += f"Host: {host}:{port}\r\n"
 
@@ -361,28 +596,62 @@ def _tunnel(sock: socket.socket, host, port: int, auth) -> socket.socket:
         connect_header += f"Proxy-Authorization: Basic {encoded_str}\r\n"
     connect_header += "\r\n"
     dump("request header", connect_header)
-
-    send(sock, connect_header)
-
-    try:
-        status, _, _ = read_headers(sock)
-    except (socket.error, WebSocketException) as e:
-        raise WebSocketProxyException(str(e))
-
-    if status != 200:
-        raise WebSocketProxyException(f"failed CONNECT via proxy status: {status}")
-
-    return sock
-
-
-def read_headers(sock: socket.socket) -> tuple:
+    return connect_header
+
+
+def read_headers(sock: socket.socket, rest: Optional[bytearray] = None) -> tuple:
+    """
+    Read the status line and the headers of an HTTP response.
+
+    Parameters
+    ----------
+    sock: socket
+        socket to read from.
+    rest: bytearray
+        if given, the response is read in large chunks, and the bytes
+        received after the headers are appended to rest. Otherwise, it is
+        read a byte at a time, so that nothing after the headers is read.
+
+    Returns
+    -------
+    status, headers, status_message: tuple
+        see parse_headers().
+    """
+    if rest is None:
+        return parse_headers(iter(lambda: recv_line(sock), b""))
+
+    data = bytearray()
+    start = 0
+    while not (end := _HEADERS_END.search(data, start)):
+        # The end of the headers may span two reads.
+        start = max(0, len(data) - 3)
+        data += recv(sock, _HEADER_READ_SIZE)
+    rest += data[end.end() :]
+    return parse_headers(bytes(data[: end.start()]).split(b"\n"))
+
+
+def parse_headers(lines: Iterable[bytes]) -> tuple:
+    """
+    Parse the status line and the headers of an HTTP response, up to the
+    empty line that ends them.
+
+    Parameters
+    ----------
+    lines: iterable of bytes
+        lines of the response, with or without the line terminators.
+
+    Returns
+    -------
+    status, headers, status_message: tuple
+        status code, dict of the headers with lower case names, and reason
+        phrase of the response.
+    """
     status = None
     status_message = None
     headers: dict = {}
     trace("--- response header ---")
 
-    while True:
-        line = recv_line(sock)
+    for line in lines:
         line = line.decode("utf-8").strip()
         if not line:
             break
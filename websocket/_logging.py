@@ -1,4 +1,7 @@
 import logging
+import time
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple
 
 """
 _logging.py
@@ -34,6 +37,7 @@ def emit(self, record) -> None:
 _traceEnabled = False
 
 __all__ = [
+    "FrameCapture",
     "enableTrace",
     "dump",
     "error",
@@ -89,9 +93,9 @@ def info(msg: str) -> None:
     _logger.info(msg)
 
 
-def trace(msg: str) -> None:
+def trace(msg: str, *args) -> None:
     if _traceEnabled:
-        _logger.debug(msg)
+        _logger.debug(msg, *args)
 
 
 def isEnabledForError() -> bool:
@@ -104,3 +108,81 @@ def isEnabledForDebug() -> bool:
 
 def isEnabledForTrace() -> bool:
     return _traceEnabled
+
+
+class CapturedFrame(NamedTuple):
+    time: float
+    # "send" or "recv".
+    direction: str
+    # The first bytes of the frame, as sent or received.
+    data: bytes
+    # Length of the whole frame.
+    length: int
+
+    def __str__(self) -> str:
+        prefix = "++Sent raw" if self.direction == "send" else "++Rcv raw"
+        truncated = self.length - len(self.data)
+        if truncated:
+            return f"{prefix}: {self.data!r} ({truncated} more bytes)"
+        return f"{prefix}: {self.data!r}"
+
+
+class FrameCapture:
+    """
+    Raw bytes of the last frames sent and received by a connection, as
+    they went over the wire (after compression and masking).
+
+    Frames are kept as bytes and only formatted when they are logged or
+    printed. They are logged as "++Sent raw" and "++Rcv raw" messages if
+    trace is enabled. Pass a FrameCapture as frame_capture to WebSocket,
+    create_connection() or WebSocketApp to keep one while trace is off,
+    e.g. to dump the last frames after an error. With trace on and no
+    frame_capture, a default one is created.
+
+    Parameters
+    ----------
+    size: int
+        Number of frames kept. Default is 100.
+    max_bytes: int
+        Number of bytes kept from the start of each frame. Default is 1024.
+    sample: int
+        Capture one frame out of sample. Default is 1, every frame.
+    """
+
+    def __init__(self, size: int = 100, max_bytes: int = 1024, sample: int = 1) -> None:
+        self.frames: deque = deque(maxlen=size)
+        self.max_bytes = max_bytes
+        self.sample_interval = sample
+        self._count = 0
+
+    def __iter__(self) -> Iterator[CapturedFrame]:
+        return iter(list(self.frames))
+
+    def __str__(self) -> str:
+        return "\n".join(str(frame) for frame in self)
+
+    def sample(self) -> bool:
+        """
+        Tell whether the next frame is to be captured.
+        """
+        self._count += 1
+        return self._count % self.sample_interval == 1 % self.sample_interval
+
+    def record(self, direction: str, buffers: Iterable) -> None:
+        """
+        Keep a frame, given as the bytes-like buffers it was sent or
+        received in. Only the first max_bytes bytes are copied.
+        """
+        length = 0
+        room = self.max_bytes
+        pieces = []
+        for buffer in buffers:
+            size = len(buffer)
+            length += size
+            if room > 0:
+                pieces.append(buffer[:room] if size > room else buffer)
+                room -= size
+        frame = CapturedFrame(time.time(), direction, b"".join(pieces), length)
+        self.frames.append(frame)
+        if _traceEnabled:
+            _logger.debug("%s", frame)
@@ -0,0 +1,285 @@
+import math
+from typing import Optional
+
+from ._abnf import ABNF
+
+"""
+_metrics.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+__all__ = ["Histogram", "Metrics"]
+
+# The histograms split each power of two in 1 << _SUB_BUCKET_BITS buckets,
+# which bounds their relative error.
+_SUB_BUCKET_BITS = 4
+
+
+class Histogram:
+    """
+    Histogram of durations, with log-linear buckets like HdrHistogram.
+
+    Durations are counted in microseconds. Up to 32 us each microsecond has
+    its own bucket, above that each power of two is split in 16 buckets, so
+    percentiles are within 1/16 (6.25%) of the recorded values, over any
+    range, for a fixed cost per record.
+    """
+
+    UNIT = 1e-6
+
+    def __init__(self) -> None:
+        self.counts: dict = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Count a duration, in seconds.
+        """
+        units = max(int(value / self.UNIT), 0)
+        shift = max(units.bit_length() - _SUB_BUCKET_BITS - 1, 0)
+        index = (shift << _SUB_BUCKET_BITS) + (units >> shift)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @staticmethod
+    def _upper_bound(index: int) -> float:
+        # Exclusive upper bound of the bucket, in seconds.
+        shift = max((index >> _SUB_BUCKET_BITS) - 1, 0)
+        return ((index - (shift << _SUB_BUCKET_BITS) + 1) << shift) * Histogram.UNIT
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the duration below which percent % of the durations are, in
+        seconds. 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100) or 1
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._upper_bound(index), self.min), self.max)
+        return self.max
+
+    def buckets(self) -> list:
+        """
+        Get the cumulative counts, as (upper bound in seconds, count) tuples,
+        of the buckets that were used.
+        """
+        buckets = []
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            buckets.append((self._upper_bound(index), seen))
+        return buckets
+
+    def snapshot(self) -> dict:
+        """
+        Get the count, sum, min, max and main percentiles, in seconds.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class Metrics:
+    """
+    Counters and latency histograms of one or more connections.
+
+    Pass a Metrics object as the metrics option of WebSocket,
+    create_connection() or WebSocketApp, and read it with snapshot() or
+    prometheus(). Nothing is measured for connections without one.
+
+    Counters
+    --------
+    frames_sent, frames_received: dict
+        Frames by opcode name ("text", "binary", "ping"...).
+    bytes_sent, bytes_received: dict
+        Payload bytes of the frames by opcode name, as sent over the wire
+        (compressed).
+    recv_calls, send_calls: int
+        Socket reads and writes.
+    partial_sends: int
+        Writes that sent only part of the data.
+    waits: int
+        Reads and writes that waited for the socket to be ready with a
+        selector, see WebSocket.waits.
+    reconnects: int
+        Reconnections of WebSocketApp.
+
+    Histograms
+    ----------
+    handshake_time: Histogram
+        Time to connect, including the TLS and opening handshakes.
+    ping_rtt: Histogram
+        Time between the pings of WebSocketApp and their pongs.
+    callback_time: Histogram
+        Time spent in the callbacks of WebSocketApp.
+    """
+
+    def __init__(self) -> None:
+        # [frames, bytes] by opcode, named when read, which keeps the
+        # counting cheap.
+        self.sent: dict = {}
+        self.received: dict = {}
+        self.recv_calls = 0
+        self.send_calls = 0
+        self.partial_sends = 0
+        self.waits = 0
+        self.reconnects = 0
+        self.handshake_time = Histogram()
+        self.ping_rtt = Histogram()
+        self.callback_time = Histogram()
+
+    @staticmethod
+    def _count(counts: dict, opcode: int, length: int) -> None:
+        frame_counts = counts.get(opcode)
+        if frame_counts is None:
+            frame_counts = counts[opcode] = [0, 0]
+        frame_counts[0] += 1
+        frame_counts[1] += length
+
+    def frame_sent(self, opcode: int, length: int) -> None:
+        """
+        Count a frame sent, with a payload of length bytes.
+        """
+        self._count(self.sent, opcode, length)
+
+    def frame_received(self, opcode: int, length: int) -> None:
+        """
+        Count a frame received, with a payload of length bytes.
+        """
+        self._count(self.received, opcode, length)
+
+    @staticmethod
+    def _by_name(counts: dict, index: int) -> dict:
+        return {
+            ABNF.OPCODE_MAP.get(opcode, str(opcode)): frame_counts[index]
+            for opcode, frame_counts in sorted(counts.items())
+        }
+
+    def getframes_sent(self) -> dict:
+        return self._by_name(self.sent, 0)
+
+    frames_sent = property(getframes_sent)
+
+    def getbytes_sent(self) -> dict:
+        return self._by_name(self.sent, 1)
+
+    bytes_sent = property(getbytes_sent)
+
+    def getframes_received(self) -> dict:
+        return self._by_name(self.received, 0)
+
+    frames_received = property(getframes_received)
+
+    def getbytes_received(self) -> dict:
+        return self._by_name(self.received, 1)
+
+    bytes_received = property(getbytes_received)
+
+    def snapshot(self) -> dict:
+        """
+        Get the current values, as a dict of plain values that can be
+        serialized to JSON.
+        """
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_received": self.frames_received,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "recv_calls": self.recv_calls,
+            "send_calls": self.send_calls,
+            "partial_sends": self.partial_sends,
+            "waits": self.waits,
+            "reconnects": self.reconnects,
+            "handshake_time": self.handshake_time.snapshot(),
+            "ping_rtt": self.ping_rtt.snapshot(),
+            "callback_time": self.callback_time.snapshot(),
+        }
+
+    def prometheus(
+        self, prefix: str = "websocket", labels: Optional[dict] = None
+    ) -> str:
+        """
+        Format the metrics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix: str
+            Prefix of the metric names.
+        labels: dict
+            Labels added to every sample, e.g. {"url": url}.
+        """
+        lines = []
+
+        def sample(name: str, value: float, extra: Optional[dict] = None) -> None:
+            items = {**(labels or {}), **(extra or {})}
+            label_text = ",".join(
+                f'{key}="{_escape_label(str(label))}"' for key, label in items.items()
+            )
+            if label_text:
+                name = f"{name}{{{label_text}}}"
+            lines.append(f"{name} {value!r}")
+
+        for name, counter in (
+            ("frames_sent", self.frames_sent),
+            ("frames_received", self.frames_received),
+            ("bytes_sent", self.bytes_sent),
+            ("bytes_received", self.bytes_received),
+        ):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for opcode, value in counter.items():
+                sample(f"{prefix}_{name}_total", value, {"opcode": opcode})
+        for name in (
+            "recv_calls",
+            "send_calls",
+            "partial_sends",
+            "waits",
+            "reconnects",
+        ):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            sample(f"{prefix}_{name}_total", getattr(self, name))
+        for name in ("handshake_time", "ping_rtt", "callback_time"):
+            histogram = getattr(self, name)
+            lines.append(f"# TYPE {prefix}_{name}_seconds histogram")
+            for bound, count in histogram.buckets():
+                sample(f"{prefix}_{name}_seconds_bucket", count, {"le": f"{bound:.6g}"})
+            sample(f"{prefix}_{name}_seconds_bucket", histogram.count, {"le": "+Inf"})
+            sample(f"{prefix}_{name}_seconds_sum", histogram.sum)
+            sample(f"{prefix}_{name}_seconds_count", histogram.count)
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
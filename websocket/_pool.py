@@ -0,0 +1,259 @@
+import multiprocessing
+import os
+import queue
+import threading
+import zlib
+from collections import deque
+from typing import Any, Optional, Union
+
+from ._abnf import ABNF
+from ._app import WebSocketApp
+from ._dispatcher import WebSocketHub
+
+"""
+_pool.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+__all__ = ["WebSocketPool"]
+
+
+class WebSocketPool:
+    """
+    Connections spread over worker processes, for more throughput than a
+    single process can reach.
+
+    Each worker process runs the WebSocketApp connections hashed to it with
+    a WebSocketHub, so framing, unmasking, decompression and UTF-8
+    validation run in parallel. Events are delivered to the parent process
+    through a multiprocessing queue, as (url, event, data) tuples:
+
+    - ("open", None) once connected, or reconnected.
+    - ("message", message) for each text or binary message.
+    - ("error", str(exception)) for errors.
+    - ("close", (status, reason)) once the connection is closed.
+
+    Connections are identified by their URL.
+
+    >>> with WebSocketPool(4) as pool:
+    ...     for url in urls:
+    ...         pool.connect(url, ping_interval=30, reconnect=5)
+    ...     for url, event, data in pool:
+    ...         print(url, event, data)
+
+    Parameters
+    ----------
+    processes: int
+        Number of worker processes. Default is os.cpu_count().
+    context: str
+        multiprocessing start method, e.g. "spawn". Default is the default
+        start method of the platform.
+    """
+
+    def __init__(
+        self, processes: Optional[int] = None, context: Optional[str] = None
+    ) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        ctx = multiprocessing.get_context(context)
+        # Workers put lists of events, to pickle them in batches.
+        self.events = ctx.Queue()
+        self.pending: deque = deque()
+        self.commands = [ctx.Queue() for _ in range(self.processes)]
+        self.workers = [
+            ctx.Process(target=_run_worker, args=(commands, self.events), daemon=True)
+            for commands in self.commands
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.closed = False
+
+    def __iter__(self):
+        """
+        Iterate over the events of all connections until close() is called.
+        """
+        while True:
+            try:
+                event = self.recv(0.1)
+            except queue.Empty:
+                if self.closed:
+                    return
+                continue
+            yield event
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def worker(self, url: str) -> int:
+        """
+        Get the index of the worker process running the connection to url.
+        The same URL is always run by the same worker.
+        """
+        return zlib.crc32(url.encode("utf-8")) % self.processes
+
+    def connect(
+        self,
+        url: str,
+        header: Union[list, dict, None] = None,
+        cookie: Optional[str] = None,
+        subprotocols: Optional[list] = None,
+        permessage_deflate: Union[bool, dict] = False,
+        **options,
+    ) -> None:
+        """
+        Connect to url in its worker process.
+
+        header, cookie, subprotocols and permessage_deflate are passed to
+        WebSocketApp, and options to WebSocketApp.run_forever(), except
+        for dispatcher. They are pickled, so they can't include functions.
+        """
+        app_options = {
+            "header": header,
+            "cookie": cookie,
+            "subprotocols": subprotocols,
+            "permessage_deflate": permessage_deflate,
+        }
+        self._command(url, "connect", app_options, options)
+
+    def send(
+        self, url: str, data: Union[bytes, str], opcode: int = ABNF.OPCODE_TEXT
+    ) -> None:
+        """
+        Send a message to url. Nothing is sent if it's not connected.
+        """
+        self._command(url, "send", data, opcode)
+
+    def disconnect(self, url: str) -> None:
+        """
+        Close the connection to url.
+        """
+        self._command(url, "disconnect")
+
+    def recv(self, timeout: Optional[float] = None) -> tuple:
+        """
+        Receive the next event of any connection.
+
+        Parameters
+        ----------
+        timeout: float
+            How long to wait for an event, in seconds. queue.Empty is raised
+            if there was none. Default is None, wait forever.
+
+        Returns
+        -------
+        event: tuple
+            (url, event, data) tuple, see WebSocketPool.
+        """
+        if not self.pending:
+            self.pending.extend(self.events.get(timeout=timeout))
+        return self.pending.popleft()
+
+    def close(self, timeout: float = 3) -> None:
+        """
+        Close all connections and stop the worker processes.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for commands in self.commands:
+            commands.put(None)
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+
+    def _command(self, url: str, *command: Any) -> None:
+        if self.closed:
+            raise ValueError("pool is closed")
+        self.commands[self.worker(url)].put((url,) + command)
+
+
+def _run_worker(commands, events) -> None:
+    # Run the connections of one worker process with a hub. Commands are
+    # read by a thread, and handed to the hub as timers.
+    hub = WebSocketHub()
+    apps: dict = {}
+    ready = threading.Event()
+    running = True
+    # Events are sent to the parent once the hub has handled what the
+    # sockets were ready for.
+    batch: list = []
+
+    def put(*event: Any) -> None:
+        if not batch:
+            hub.timeout(0, flush)
+        batch.append(event)
+
+    def flush() -> None:
+        events.put(batch[:])
+        batch.clear()
+
+    def handle(command: Optional[tuple]) -> None:
+        nonlocal running
+        if command is None:
+            running = False
+            for app in apps.values():
+                app.close()
+            if batch:
+                flush()
+            hub.abort()
+            return
+        url, name, *args = command
+        if name == "connect":
+            app_options, options = args
+            if url in apps:
+                apps[url].close()
+            app = apps[url] = WebSocketApp(
+                url,
+                on_open=lambda app: put(app.url, "open", None),
+                on_reconnect=lambda app: put(app.url, "open", None),
+                on_message=lambda app, message: put(app.url, "message", message),
+                on_error=lambda app, e: put(app.url, "error", str(e)),
+                on_close=lambda app, status, reason: put(
+                    app.url, "close", (status, reason)
+                ),
+                **app_options,
+            )
+            app.run_forever(dispatcher=hub, **options)
+        elif url in apps:
+            if name == "send":
+                apps[url].send(*args)
+            elif name == "disconnect":
+                apps.pop(url).close()
+
+    def read_commands() -> None:
+        while True:
+            command = commands.get()
+            hub.timeout(0, handle, command)
+            ready.set()
+            if command is None:
+                return
+
+    threading.Thread(target=read_commands, daemon=True).start()
+    while running:
+        # dispatch() returns once there is nothing to do, until the next
+        # command arrives.
+        hub.dispatch()
+        if running:
+            ready.wait()
+            ready.clear()
+    # The connections are closed by threads of the hub, which wait for the
+    # close frames of the servers.
+    hub.join_threads(3)
+    hub.close()
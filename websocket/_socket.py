@@ -1,13 +1,21 @@
 import errno
 import selectors
 import socket
-from typing import Optional, Union, Any
+from typing import Any, Callable, Optional, Union
 
 from ._exceptions import (
     WebSocketConnectionClosedException,
     WebSocketTimeoutException,
 )
-from ._ssl_compat import SSLError, SSLEOFError, SSLWantReadError, SSLWantWriteError
+from ._ssl_compat import (
+    HAVE_SSL,
+    SSLError,
+    SSLEOFError,
+    SSLWantReadError,
+    SSLWantWriteError,
+    ssl,
+)
+from ._metrics import Metrics
 from ._utils import extract_error_code, extract_err_message
 
 """
@@ -41,12 +49,19 @@
 
 _default_timeout = None
 
+# Maximum number of buffers passed to a single sendmsg() call, and the
+# number of bytes up to which buffers are joined when sendmsg() is not
+# available (the maximum size of a TLS record).
+_IOV_MAX = 1024
+_SEND_COALESCE_SIZE = 16384
+
 __all__ = [
     "DEFAULT_SOCKET_OPTION",
     "sock_opt",
     "setdefaulttimeout",
     "getdefaulttimeout",
     "recv",
+    "recv_into",
     "recv_line",
     "send",
 ]
@@ -63,6 +78,7 @@ def __init__(
         self.sockopt = sockopt
         self.sslopt = sslopt
         self.timeout: Optional[Union[int, float]] = None
+        self.happy_eyeballs_delay: Optional[float] = None
 
 
 def setdefaulttimeout(timeout: Optional[Union[int, float]]) -> None:
@@ -90,13 +106,68 @@ def getdefaulttimeout() -> Optional[Union[int, float]]:
     return _default_timeout
 
 
-def recv(sock: socket.socket, bufsize: int) -> bytes:
-    if not sock:
-        raise WebSocketConnectionClosedException("socket is already closed.")
+class _Waiter:
+    """
+    Wait for a socket to be readable, or writable, with one selector kept
+    for all waits instead of a new one each time.
+
+    The WebSocket class has a waiter for reading and one for writing, which
+    are used under its readlock and lock respectively.
+    """
 
+    def __init__(self, events: int) -> None:
+        self.events = events
+        self.selector: Optional[selectors.BaseSelector] = None
+        self.sock: Optional[socket.socket] = None
+        # Number of waits, i.e. how often a recv or send would have blocked.
+        self.waits = 0
+        self.metrics: Optional[Metrics] = None
+
+    def wait(self, sock: socket.socket, timeout: Optional[float]) -> bool:
+        self.waits += 1
+        if self.metrics is not None:
+            self.metrics.waits += 1
+        return self._select(sock, timeout)
+
+    def ready(self, sock: socket.socket) -> bool:
+        """
+        Check whether sock is ready, without waiting. Not counted as a wait.
+        """
+        return self._select(sock, 0)
+
+    def _select(self, sock: socket.socket, timeout: Optional[float]) -> bool:
+        if self.selector is None:
+            self.selector = selectors.DefaultSelector()
+        if sock is not self.sock:
+            if self.sock is not None:
+                self.selector.unregister(self.sock)
+            self.selector.register(sock, self.events)
+            self.sock = sock
+        return bool(self.selector.select(timeout))
+
+    def close(self) -> None:
+        if self.selector is not None:
+            self.selector.close()
+        self.selector = None
+        self.sock = None
+
+
+def _wait(sock: socket.socket, events: int, waiter: Optional[_Waiter]) -> bool:
+    if waiter is not None:
+        return waiter.wait(sock, sock.gettimeout())
+    sel = selectors.DefaultSelector()
+    sel.register(sock, events)
+    ready = sel.select(sock.gettimeout())
+    sel.close()
+    return bool(ready)
+
+
+def _recv_retry(
+    sock: socket.socket, recv_fn: Callable, arg: Any, waiter: Optional[_Waiter]
+) -> Any:
     def _recv():
         try:
-            return sock.recv(bufsize)
+            return recv_fn(arg)
         except SSLWantReadError:
             # Don't return None implicitly - fall through to retry logic
             pass
@@ -107,14 +178,8 @@ def _recv():
             # Don't return None implicitly - fall through to retry logic
 
         # Retry logic using selector for both SSLWantReadError and EAGAIN/EWOULDBLOCK
-        sel = selectors.DefaultSelector()
-        sel.register(sock, selectors.EVENT_READ)
-
-        r = sel.select(sock.gettimeout())
-        sel.close()
-
-        if r:
-            return sock.recv(bufsize)
+        if _wait(sock, selectors.EVENT_READ, waiter):
+            return recv_fn(arg)
         else:
             # Selector timeout should raise WebSocketTimeoutException
             # not return None which gets misclassified as connection closed
@@ -122,9 +187,9 @@ def _recv():
 
     try:
         if sock.gettimeout() == 0:
-            bytes_ = sock.recv(bufsize)
+            return recv_fn(arg)
         else:
-            bytes_ = _recv()
+            return _recv()
     except TimeoutError:
         raise WebSocketTimeoutException("Connection timed out")
     except socket.timeout as e:
@@ -137,6 +202,13 @@ def _recv():
         else:
             raise
 
+
+def recv(sock: socket.socket, bufsize: int, waiter: Optional[_Waiter] = None) -> bytes:
+    if not sock:
+        raise WebSocketConnectionClosedException("socket is already closed.")
+
+    bytes_ = _recv_retry(sock, sock.recv, bufsize, waiter)
+
     if bytes_ is None:
         raise WebSocketConnectionClosedException("Connection to remote host was lost.")
     if not bytes_:
@@ -145,6 +217,47 @@ def _recv():
     return bytes_
 
 
+def recv_into(
+    sock: socket.socket,
+    buffer: Union[bytearray, memoryview],
+    waiter: Optional[_Waiter] = None,
+) -> int:
+    """
+    Receive data directly into a writable buffer.
+
+    Parameters
+    ----------
+    sock: socket
+        socket to read from.
+    buffer: bytearray or memoryview
+        writable buffer. At most len(buffer) bytes are read.
+    waiter: _Waiter
+        waiter to reuse if the socket isn't readable yet.
+
+    Returns
+    ----------
+    nbytes: int
+        number of bytes written into buffer.
+    """
+    if not sock:
+        raise WebSocketConnectionClosedException("socket is already closed.")
+
+    if not hasattr(sock, "recv_into"):
+        # Socket-like objects passed in with the "socket" option may
+        # only implement recv().
+        bytes_ = recv(sock, len(buffer), waiter)
+        nbytes = len(bytes_)
+        buffer[:nbytes] = bytes_
+        return nbytes
+
+    nbytes = _recv_retry(sock, sock.recv_into, buffer, waiter)
+
+    if not nbytes:
+        raise WebSocketConnectionClosedException("Connection to remote host was lost.")
+
+    return nbytes
+
+
 def recv_line(sock: socket.socket) -> bytes:
     line = []
     while True:
@@ -155,16 +268,63 @@ def recv_line(sock: socket.socket) -> bytes:
     return b"".join(line)
 
 
-def send(sock: socket.socket, data: Union[bytes, str]) -> int:
+def _send_buffers(sock: socket.socket, buffers: list) -> int:
+    if hasattr(sock, "sendmsg") and not (HAVE_SSL and isinstance(sock, ssl.SSLSocket)):
+        return sock.sendmsg(buffers[:_IOV_MAX])
+
+    # SSL sockets don't support sendmsg(). Small buffers are joined so
+    # that each frame header doesn't end up in a TLS record of its own,
+    # large ones are sent as they are.
+    if len(buffers[0]) >= _SEND_COALESCE_SIZE:
+        return sock.send(buffers[0])
+    chunks = []
+    size = 0
+    for buffer in buffers:
+        if size + len(buffer) > _SEND_COALESCE_SIZE:
+            chunks.append(memoryview(buffer)[: _SEND_COALESCE_SIZE - size])
+            break
+        chunks.append(buffer)
+        size += len(buffer)
+    return sock.send(b"".join(chunks))
+
+
+def send(
+    sock: socket.socket,
+    data: Union[bytes, str, list],
+    waiter: Optional[_Waiter] = None,
+) -> int:
+    """
+    Send data to the socket.
+
+    Parameters
+    ----------
+    sock: socket
+        socket to write to.
+    data: bytes, str or list
+        data to send. A list of bytes-like buffers is sent with a single
+        sendmsg() call if the socket supports it.
+    waiter: _Waiter
+        waiter to reuse if the socket isn't writable yet.
+
+    Returns
+    ----------
+    bytes_sent: int
+        number of bytes sent, which may be less than the length of data.
+    """
     if isinstance(data, str):
         data = data.encode("utf-8")
 
     if not sock:
         raise WebSocketConnectionClosedException("socket is already closed.")
 
+    def _send_data() -> int:
+        if isinstance(data, list):
+            return _send_buffers(sock, data)
+        return sock.send(data)
+
     def _send() -> int:
         try:
-            return sock.send(data)
+            return _send_data()
         except SSLEOFError:
             raise WebSocketConnectionClosedException("socket is already closed.")
         except SSLWantWriteError:
@@ -176,19 +336,13 @@ def _send() -> int:
             if error_code not in [errno.EAGAIN, errno.EWOULDBLOCK]:
                 raise
 
-        sel = selectors.DefaultSelector()
-        sel.register(sock, selectors.EVENT_WRITE)
-
-        w = sel.select(sock.gettimeout())
-        sel.close()
-
-        if w:
-            return sock.send(data)
+        if _wait(sock, selectors.EVENT_WRITE, waiter):
+            return _send_data()
         return 0
 
     try:
         if sock.gettimeout() == 0:
-            return sock.send(data)
+            return _send_data()
         else:
             return _send()
     except socket.timeout as e:
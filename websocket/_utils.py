@@ -1,3 +1,4 @@
+import codecs
 from typing import Union, Optional
 
 """
@@ -18,7 +19,13 @@
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-__all__ = ["NoLock", "validate_utf8", "extract_err_message", "extract_error_code"]
+__all__ = [
+    "NoLock",
+    "validate_utf8",
+    "Utf8Validator",
+    "extract_err_message",
+    "extract_error_code",
+]
 
 
 class NoLock:
@@ -28,414 +35,12 @@ def __enter__(self) -> None:
     def __exit__(self, exc_type, exc_value, traceback) -> None:
         pass
 
-
-try:
-    # If wsaccel is available we use compiled routines to validate UTF-8
-    # strings.
-    from wsaccel.utf8validator import Utf8Validator
-
-    def _validate_utf8(utfbytes: Union[str, bytes]) -> bool:
-        result: bool = Utf8Validator().validate(utfbytes)[0]
-        return result
-
-except ImportError:
-    # UTF-8 validator
-    # python implementation of http://bjoern.hoehrmann.de/utf-8/decoder/dfa/
-
-    _UTF8_ACCEPT = 0
-    _UTF8_REJECT = 12
-
-    _UTF8D = [
-        # The first part of the table maps bytes to character classes that
-        # to reduce the size of the transition table and create bitmasks.
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        9,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        7,
-        8,
-        8,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        2,
-        10,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        3,
-        4,
-        3,
-        3,
-        11,
-        6,
-        6,
-        6,
-        5,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        8,
-        # The second part is a transition table that maps a combination
-        # of a state of the automaton and a character class to a state.
-        0,
-        12,
-        24,
-        36,
-        60,
-        96,
-        84,
-        12,
-        12,
-        12,
-        48,
-        72,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        0,
-        12,
-        12,
-        12,
-        12,
-        12,
-        0,
-        12,
-        0,
-        12,
-        12,
-        12,
-        24,
-        12,
-        12,
-        12,
-        12,
-        12,
-        24,
-        12,
-        24,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        24,
-        12,
-        12,
-        12,
-        12,
-        12,
-        24,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        24,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        36,
-        12,
-        36,
-        12,
-        12,
-        12,
-        36,
-        12,
-        12,
-        12,
-        12,
-        12,
-        36,
-        12,
-        36,
-        12,
-        12,
-        12,
-        36,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-        12,
-    ]
-
-    def _decode(state: int, codep: int, ch: int) -> tuple:
-        tp = _UTF8D[ch]
-
-        codep = (
-            (ch & 0x3F) | (codep << 6) if (state != _UTF8_ACCEPT) else (0xFF >> tp) & ch
-        )
-        state = _UTF8D[256 + state + tp]
-
-        return state, codep
-
-    def _validate_utf8(utfbytes: Union[str, bytes]) -> bool:
-        state = _UTF8_ACCEPT
-        codep = 0
-        for i in utfbytes:
-            state, codep = _decode(state, codep, int(i))
-            if state == _UTF8_REJECT:
-                return False
-
+    def acquire(self, blocking: bool = True) -> bool:
         return True
 
+    def release(self) -> None:
+        pass
+
 
 def validate_utf8(utfbytes: Union[str, bytes]) -> bool:
     """
@@ -443,7 +48,53 @@ def validate_utf8(utfbytes: Union[str, bytes]) -> bool:
     utfbytes: utf byte string to check.
     return value: if valid utf8 string, return true. Otherwise, return false.
     """
-    return _validate_utf8(utfbytes)
+    # The utf-8 codec is as strict as RFC 3629 (no overlong forms,
+    # surrogates or code points beyond U+10FFFF), and much faster than
+    # checking the data byte by byte in Python.
+    try:
+        if isinstance(utfbytes, str):
+            utfbytes.encode("utf-8")
+        else:
+            str(utfbytes, "utf-8")
+    except UnicodeError:
+        return False
+    return True
+
+
+class Utf8Validator:
+    """
+    Incremental UTF-8 validator, for data received in pieces such as the
+    fragments of a text message. A code point split between two pieces
+    is checked once the rest of it arrives.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def validate(self, utfbytes: bytes, final: bool = False) -> bool:
+        """
+        Validate the next piece of data.
+
+        Parameters
+        ----------
+        utfbytes: bytes
+            next piece of data.
+        final: bool
+            whether this is the last piece, which must not end in the
+            middle of a code point.
+        """
+        try:
+            self._decoder.decode(utfbytes, final)
+        except UnicodeDecodeError:
+            self.reset()
+            return False
+        return True
+
+    def reset(self) -> None:
+        """
+        Forget about the pieces validated so far.
+        """
+        self._decoder.reset()
 
 
 def extract_err_message(exception: Exception) -> Optional[str]:
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import socket
+import threading
+from base64 import encodebytes as base64encode
+
+from websocket._abnf import ABNF, frame_buffer
+from websocket._exceptions import WebSocketException
+
+"""
+_server.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+def handshake_response(
+    request: bytes, status: bytes = b"101 Switching Protocols", body: bytes = b""
+) -> bytes:
+    # Response to the opening handshake request, with a body if the
+    # handshake is refused.
+    key = request.split(b"Sec-WebSocket-Key: ")[1].split(b"\r\n")[0]
+    key += b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    accept = base64encode(hashlib.sha1(key).digest()).strip()
+    return (
+        b"HTTP/1.1 " + status + b"\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept + b"\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+
+
+def handshake(conn: socket.socket) -> None:
+    request = b""
+    while b"\r\n\r\n" not in request:
+        data = conn.recv(4096)
+        if not data:
+            raise ConnectionResetError("closed during the handshake")
+        request += data
+    conn.sendall(handshake_response(request))
+
+
+def echo(conn: socket.socket, count: int = None) -> None:
+    # Answer the handshake, then echo the frames, pings with pongs, until
+    # closed, or close after count data frames.
+    handshake(conn)
+    frames = frame_buffer(conn.recv, True)
+    while count != 0:
+        frame = frames.recv_frame()
+        opcode = frame.opcode
+        if opcode == ABNF.OPCODE_PING:
+            opcode = ABNF.OPCODE_PONG
+        conn.sendall(ABNF(1, 0, 0, 0, opcode, 0, frame.data).format())
+        if opcode == ABNF.OPCODE_CLOSE:
+            return
+        if count is not None and opcode != ABNF.OPCODE_PONG:
+            count -= 1
+    conn.sendall(ABNF(1, 0, 0, 0, ABNF.OPCODE_CLOSE, 0, b"\x03\xe8").format())
+
+
+def mute(conn: socket.socket) -> None:
+    # Read, without ever answering, until the client goes away.
+    while conn.recv(4096):
+        pass
+
+
+class Server:
+    """
+    Server on a local port, which runs handler(conn) in a thread of its
+    own for each connection. close() also closes the connections.
+    """
+
+    def __init__(self, handler=echo) -> None:
+        self.handler = handler
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.url = f"ws://127.0.0.1:{self.sock.getsockname()[1]}/"
+        self.conns: list = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self) -> None:
+        self.sock.close()
+        for conn in self.conns:
+            try:
+                # Wakes up the handler, unlike close().
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.conns.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        with conn:
+            try:
+                self.handler(conn)
+            except (OSError, WebSocketException):
+                # The client went away, or sent something else.
+                pass
@@ -1,9 +1,22 @@
 # -*- coding: utf-8 -*-
 #
+import os
+import tracemalloc
 import unittest
+from unittest.mock import patch
 
-from websocket._abnf import ABNF, frame_buffer
-from websocket._exceptions import WebSocketProtocolException
+from websocket._abnf import (
+    ABNF,
+    _mask_backends,
+    continuous_frame,
+    fast_mask_key,
+    frame_buffer,
+)
+from websocket._logging import FrameCapture
+from websocket._exceptions import (
+    WebSocketMessageTooBigException,
+    WebSocketProtocolException,
+)
 
 """
 test_abnf.py
@@ -37,6 +50,7 @@ def test_init(self):
         a_bad = ABNF(0, 1, 0, 0, opcode=77)
         self.assertEqual(a_bad.rsv1, 1)
         self.assertEqual(a_bad.opcode, 77)
+        self.assertFalse(hasattr(a, "__dict__"))
 
     def test_validate(self):
         a_invalid_ping = ABNF(0, 0, 0, 0, opcode=ABNF.OPCODE_PING)
@@ -91,6 +105,77 @@ def test_mask(self):
         )
         self.assertEqual(abnf_str_data._get_masked(bytes_val), b"aaaa\x00")
 
+    def test_mask_backends(self):
+        mask_key = b"\x8f\x01\x5a\xe3"
+        for name, backend in _mask_backends.items():
+            for size in (0, 3, 125, 4095, 4096, 4101, 300007):
+                data = os.urandom(size)
+                expected = bytes(b ^ mask_key[i % 4] for i, b in enumerate(data))
+                with self.subTest(backend=name, size=size):
+                    masked = backend(mask_key, data)
+                    self.assertEqual(masked, expected)
+                    self.assertEqual(backend(mask_key, masked), data)
+
+    def test_mask_peak_memory(self):
+        # Large payloads are masked in a single copy.
+        data = os.urandom(1 << 22)
+        for name, backend in _mask_backends.items():
+            with self.subTest(backend=name):
+                tracemalloc.start()
+                try:
+                    masked = backend(b"\x8f\x01\x5a\xe3", data)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                self.assertEqual(len(masked), len(data))
+                self.assertLess(peak, len(data) * 1.25)
+
+    def test_unmasked_payload_type(self):
+        # Large payloads are masked in a bytearray, but every receive path
+        # returns them as bytes.
+        def masked_frame(data):
+            frame = ABNF(1, 0, 0, 0, ABNF.OPCODE_BINARY, 1, data)
+            frame.get_mask_key = lambda length: b"\x8f\x01\x5a\xe3"
+            return frame.format()
+
+        def receiver(packets):
+            return lambda bufsize: packets.pop(0)
+
+        data = os.urandom(5000)
+        for name, backend in _mask_backends.items():
+            with self.subTest(backend=name), patch("websocket._abnf._mask", backend):
+                # Read directly, then parsed from the read-ahead buffer.
+                fb = frame_buffer(receiver([masked_frame(data) * 2]), True)
+                for _ in range(2):
+                    frame = fb.recv_frame()
+                    self.assertIs(type(frame.data), bytes)
+                    self.assertEqual(frame.data, data)
+
+                fb = frame_buffer(None, True)
+                fb.feed(masked_frame(data))
+                frame = fb.next_frame()
+                self.assertIs(type(frame.data), bytes)
+                self.assertEqual(frame.data, data)
+
+                # Streamed, as with WebSocket.recv_stream().
+                fb = frame_buffer(receiver([masked_frame(data)]), True)
+                fb.recv_frame_start()
+                payload = fb.recv_payload(len(data))
+                self.assertIs(type(payload), bytes)
+                self.assertEqual(payload, data)
+
+    def test_mask_zero_key(self):
+        data = b"payload"
+        self.assertIs(ABNF.mask(b"\x00\x00\x00\x00", data), data)
+        frame = ABNF.create_frame(data, ABNF.OPCODE_BINARY)
+        frame.get_mask_key = lambda length: bytes(length)
+        self.assertEqual(frame.format(), b"\x82\x87\x00\x00\x00\x00payload")
+
+    def test_fast_mask_key(self):
+        mask_key = fast_mask_key(4)
+        self.assertIsInstance(mask_key, bytes)
+        self.assertEqual(len(mask_key), 4)
+
     def test_format(self):
         abnf_bad_rsv_bits = ABNF(2, 0, 0, 0, opcode=ABNF.OPCODE_TEXT)
         self.assertRaises(ValueError, abnf_bad_rsv_bits.format)
@@ -110,6 +195,16 @@ def test_format(self):
         )
         self.assertEqual(b"\x01\x03\x01\x8a\xcc", abnf_no_mask.format())
 
+    def test_format_buffers(self):
+        frame = ABNF.create_frame(b"payload", ABNF.OPCODE_BINARY)
+        frame.get_mask_key = lambda length: bytes(length)
+        self.assertEqual(
+            frame.format_buffers(), [b"\x82\x87\x00\x00\x00\x00", b"payload"]
+        )
+        self.assertIs(frame.format_buffers()[1], frame.data)
+        frame = ABNF(1, 0, 0, 0, ABNF.OPCODE_PING, 0, b"")
+        self.assertEqual(frame.format_buffers(), [b"\x89\x00"])
+
     def test_frame_buffer(self):
         fb = frame_buffer(0, True)
         self.assertEqual(fb.recv, 0)
@@ -120,6 +215,150 @@ def test_frame_buffer(self):
         self.assertEqual(fb.mask_value, None)
         self.assertEqual(fb.has_mask(), False)
 
+    def test_frame_buffer_recv_into(self):
+        chunks = [b"\x81\x05Hel", b"lo\x82\x02", b"\x01\x02"]
+        calls = []
+
+        def recv_into(buffer):
+            data = chunks.pop(0)
+            calls.append(len(buffer))
+            if len(data) > len(buffer):
+                chunks.insert(0, data[len(buffer) :])
+                data = data[: len(buffer)]
+            buffer[: len(data)] = data
+            return len(data)
+
+        fb = frame_buffer(None, True, recv_into)
+        frame = fb.recv_frame()
+        self.assertEqual(frame.opcode, ABNF.OPCODE_TEXT)
+        self.assertEqual(frame.data, b"Hello")
+        frame = fb.recv_frame()
+        self.assertEqual(frame.opcode, ABNF.OPCODE_BINARY)
+        self.assertEqual(frame.data, b"\x01\x02")
+        self.assertEqual(fb.buffered(), 0)
+        self.assertTrue(all(size <= 16384 for size in calls))
+
+    def test_frame_buffer_large_payload(self):
+        payload = bytes(range(256)) * 8192
+        data = bytearray(ABNF(1, 0, 0, 0, ABNF.OPCODE_BINARY, 0, payload).format())
+
+        def recv(bufsize):
+            chunk = bytes(data[:bufsize])
+            del data[:bufsize]
+            return chunk
+
+        fb = frame_buffer(recv, True)
+        self.assertEqual(fb.recv_frame().data, payload)
+        self.assertEqual(len(fb.recv_buffer), frame_buffer._BUFFER_SIZE)
+
+    def test_frame_buffer_batch(self):
+        frames = [
+            ABNF(1, 0, 0, 0, ABNF.OPCODE_TEXT, 0, f"message {i}".encode()).format()
+            for i in range(20)
+        ]
+        # The last frame is only partially received by the first read.
+        packets = [b"".join(frames)[:-3], b"".join(frames)[-3:]]
+        calls = []
+
+        def recv(bufsize):
+            calls.append(bufsize)
+            return packets.pop(0)
+
+        fb = frame_buffer(recv, True)
+        self.assertEqual(fb.recv_frame().data, b"message 0")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(fb.frames), 18)
+        self.assertFalse(fb.needs_header())
+        for i in range(1, 20):
+            self.assertEqual(fb.recv_frame().data, f"message {i}".encode())
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(fb.buffered(), 0)
+
+    def test_frame_buffer_feed(self):
+        frames = [
+            ABNF(1, 0, 0, 0, ABNF.OPCODE_BINARY, 0, os.urandom(length))
+            for length in (0, 125, 126, 65535, 65536)
+        ]
+        masked = ABNF(0, 1, 0, 0, ABNF.OPCODE_TEXT, 1, b"masked")
+        masked.get_mask_key = lambda length: b"\x01\x02\x03\x04"
+        frames.append(masked)
+        data = b"".join(frame.format() for frame in frames)
+        masked.data = b"masked"
+
+        # Fed at once, or in pieces that split the headers.
+        for size in (len(data), 3, 997):
+            fb = frame_buffer(None, True)
+            fb.allow_rsv1 = True
+            fb.capture = FrameCapture(max_bytes=len(data))
+            received = []
+            for i in range(0, len(data), size):
+                fb.feed(data[i : i + size])
+                while frame := fb.next_frame():
+                    received.append(frame)
+            self.assertEqual(
+                [(f.fin, f.rsv1, f.opcode, f.data) for f in received],
+                [(f.fin, f.rsv1, f.opcode, f.data) for f in frames],
+            )
+            self.assertEqual(fb.buffered(), 0)
+            # The frames are captured as received
+            self.assertEqual(b"".join(frame.data for frame in fb.capture), data)
+
+    def test_frame_buffer_feed_masked(self):
+        # Large payloads are unmasked in a bytearray, returned as bytes.
+        frame = ABNF(1, 0, 0, 0, ABNF.OPCODE_BINARY, 1, os.urandom(5000))
+        fb = frame_buffer(None, True)
+        fb.feed(frame.format())
+        received = fb.next_frame()
+        self.assertIs(type(received.data), bytes)
+        self.assertEqual(received.data, frame.data)
+
+    def test_frame_buffer_max_payload_size(self):
+        packets = [
+            ABNF(1, 0, 0, 0, ABNF.OPCODE_TEXT, 0, b"ok").format()
+            + ABNF(1, 0, 0, 0, ABNF.OPCODE_BINARY, 0, b"x" * 200).format()[:10]
+        ]
+
+        def recv(bufsize):
+            return packets.pop(0)
+
+        fb = frame_buffer(recv, True, max_payload_size=100)
+        self.assertEqual(fb.recv_frame().data, b"ok")
+        # The payload is refused without being read
+        self.assertRaises(WebSocketMessageTooBigException, fb.recv_frame)
+
+    def test_continuous_frame(self):
+        cont = continuous_frame(False, False)
+        fragments = [b"fragment %d " % i for i in range(100)]
+        for i, data in enumerate(fragments):
+            opcode = ABNF.OPCODE_CONT if i else ABNF.OPCODE_TEXT
+            frame = ABNF(i == 99, 0, 0, 0, opcode, 0, data)
+            cont.validate(frame)
+            cont.add(frame)
+        self.assertTrue(cont.is_fire(frame))
+        self.assertEqual(cont.extract(frame), (ABNF.OPCODE_TEXT, frame))
+        self.assertEqual(frame.data, b"".join(fragments))
+        self.assertIsNone(cont.cont_data)
+
+    def test_continuous_frame_max_message_size(self):
+        for fire_cont_frame in (False, True):
+            with self.subTest(fire_cont_frame=fire_cont_frame):
+                cont = continuous_frame(fire_cont_frame, False, max_message_size=10)
+                cont.add(ABNF(0, 0, 0, 0, ABNF.OPCODE_BINARY, 0, b"x" * 6))
+                if fire_cont_frame:
+                    cont.extract(ABNF())
+                cont.add(ABNF(0, 0, 0, 0, ABNF.OPCODE_CONT, 0, b"x" * 4))
+                self.assertRaises(
+                    WebSocketMessageTooBigException,
+                    cont.add,
+                    ABNF(1, 0, 0, 0, ABNF.OPCODE_CONT, 0, b"x"),
+                )
+                # The limit applies to each message
+                cont = continuous_frame(fire_cont_frame, False, max_message_size=10)
+                for _ in range(3):
+                    frame = ABNF(1, 0, 0, 0, ABNF.OPCODE_TEXT, 0, b"x" * 10)
+                    cont.add(frame)
+                    cont.extract(frame)
+
 
 if __name__ == "__main__":
     unittest.main()
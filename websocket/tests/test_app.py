@@ -2,11 +2,16 @@
 #
 import os
 import os.path
+import socket
 import ssl
 import threading
+import time
 import unittest
+from unittest.mock import Mock, patch
 
 import websocket as ws
+from websocket._abnf import frame_buffer
+from websocket._app import _PingScheduler
 
 """
 test_app.py
@@ -142,6 +147,174 @@ def my_mask_key_func():
         # Note: We can't use 'is' for comparing the functions directly, need to use 'id'.
         self.assertEqual(id(app.get_mask_key), id(my_mask_key_func))
 
+    def test_send_many_closed(self):
+        app = ws.WebSocketApp("ws://127.0.0.1:8765")
+        self.assertRaises(
+            ws.WebSocketConnectionClosedException, app.send_many, ["a", "b"]
+        )
+        self.assertRaises(
+            ws.WebSocketConnectionClosedException, app.send_stream, iter([b"a"])
+        )
+
+    def test_ping_scheduler(self):
+        scheduler = _PingScheduler()
+        calls = []
+        done = threading.Event()
+
+        def repeat():
+            calls.append("repeat")
+            return len(calls) < 4
+
+        scheduler.schedule(0.05, lambda: calls.append("once"))
+        scheduler.schedule(0.03, repeat)
+        scheduler.schedule(0.2, done.set)
+        thread = scheduler.thread
+        self.assertTrue(done.wait(5))
+        thread.join(5)
+        self.assertEqual(calls, ["repeat", "once", "repeat", "repeat"])
+        self.assertIsNone(scheduler.thread)
+        self.assertEqual(scheduler.timers, [])
+
+    def test_ping_busy_connection(self):
+        # Connections that can't send right away don't hold up the pings of
+        # the others, which share the scheduler.
+        def connect(app):
+            client, server = socket.socketpair()
+            self.addCleanup(client.close)
+            self.addCleanup(server.close)
+            app.sock = ws.WebSocket(enable_multithread=True)
+            app.sock.sock = client
+            app.sock.connected = True
+            app.ping_interval = 0.02
+            return server
+
+        locked = ws.WebSocketApp("ws://example.com")
+        connect(locked)
+        # Held by another thread, e.g. sending a long stream.
+        locked.sock.lock.acquire()
+        self.addCleanup(locked.sock.lock.release)
+        full = ws.WebSocketApp("ws://example.com")
+        connect(full)
+        full.sock.sock.setblocking(False)
+        try:
+            while True:
+                full.sock.sock.send(bytes(65536))
+        except BlockingIOError:
+            pass
+        full.sock.sock.setblocking(True)
+        healthy = ws.WebSocketApp("ws://example.com")
+        server = connect(healthy)
+        server.settimeout(5)
+
+        for app in (locked, full, healthy):
+            app.keep_running = True
+            app._start_ping()
+            self.addCleanup(app._stop_ping)
+        frames = frame_buffer(server.recv, True)
+        for _ in range(3):
+            self.assertEqual(frames.recv_frame().opcode, ws.ABNF.OPCODE_PING)
+        self.assertFalse(locked.sock.ping(blocking=False))
+        self.assertFalse(full.sock.ping(blocking=False))
+
+    def test_ping_pong_deadline(self):
+        app = ws.WebSocketApp("ws://example.com")
+        app.sock = Mock()
+        app.ping_timeout = 0.05
+        clock = [10**9]
+        with patch("time.monotonic_ns", lambda: clock[0]):
+            app._ping()
+            first = app.sock.ping.call_args.args[0]
+            self.assertEqual(len(first), 16)
+            deadline = app.pong_deadline
+            self.assertEqual(deadline, 1.05)
+            clock[0] += 10**7
+            app._ping()
+            self.assertEqual(app.pong_deadline, deadline)
+            # Unsolicited pongs don't answer the pings.
+            app._pong(b"")
+            app._pong(first[:8] + bytes(8))
+            self.assertEqual(app.pong_deadline, deadline)
+            app._pong(first)
+            # The second ping is still waiting for its pong.
+            self.assertAlmostEqual(app.pong_deadline, 1.06)
+            app._pong(app.sock.ping.call_args.args[0])
+            self.assertIsNone(app.pong_deadline)
+            self.assertEqual(app.outstanding_pings, {})
+
+            app._ping()
+            clock[0] += 10**8
+            app._pong(app.sock.ping.call_args.args[0])
+            # The pong came too late.
+            self.assertIsNotNone(app.pong_deadline)
+        app._stop_ping()
+        self.assertIsNone(app.pong_deadline)
+
+    def test_ping_rtt(self):
+        app = ws.WebSocketApp("ws://example.com")
+        app.sock = Mock()
+        self.assertEqual(app.rtt["count"], 0)
+        self.assertIsNone(app.rtt["p99"])
+        app.ping_payload = "hb"
+        pings = []
+        clock = [10**9]
+        with patch("time.monotonic_ns", lambda: clock[0]):
+            for _ in range(3):
+                app._ping()
+                pings.append(app.sock.ping.call_args.args[0])
+            self.assertTrue(all(ping.startswith(b"hb") for ping in pings))
+            # The server answers the last ping only, then repeats itself.
+            clock[0] += 10**7
+            app._pong(pings[2])
+            app._pong(pings[2])
+            app._pong(pings[0])
+        rtt = app.getrtt()
+        self.assertEqual(rtt["count"], 1)
+        self.assertEqual(rtt["last"], 0.01)
+        self.assertEqual(rtt["min"], rtt["p99"])
+        self.assertEqual(app.outstanding_pings, {})
+
+        self.assertRaises(
+            ws.WebSocketException, app.run_forever, ping_payload="x" * 110
+        )
+        self.assertRaises(
+            ws.WebSocketException, app.run_forever, ping_payload=b"x" * 110
+        )
+        # The tag is appended to bytes payloads too.
+        app.ping_payload = b"\x00hb"
+        app._ping()
+        ping = app.sock.ping.call_args.args[0]
+        self.assertEqual(len(ping), 19)
+        app._pong(ping)
+        self.assertEqual(app.getrtt()["count"], 2)
+
+    def test_pipelined_handshake(self):
+        """Frames sent along with the handshake response are dispatched
+        without waiting for more data"""
+        client, server = socket.socketpair()
+        self.addCleanup(server.close)
+        server.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n\r\n"
+            + ws.ABNF(1, 0, 0, 0, ws.ABNF.OPCODE_TEXT, 0, b"Hello").format()
+            + ws.ABNF(1, 0, 0, 0, ws.ABNF.OPCODE_CLOSE, 0, b"\x03\xe8").format()
+        )
+        # Make run_forever() return if the frames are not dispatched.
+        timer = threading.Timer(5, server.close)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        messages = []
+        app = ws.WebSocketApp(
+            "ws://example.com/",
+            header={"Sec-WebSocket-Key": "dGhlIHNhbXBsZSBub25jZQ=="},
+            on_message=lambda app, message: messages.append(message),
+            socket=client,
+        )
+        start = time.monotonic()
+        app.run_forever()
+        self.assertLess(time.monotonic() - start, 4)
+        self.assertEqual(messages, ["Hello"])
+
     @unittest.skipUnless(TEST_WITH_INTERNET, "Internet-requiring tests are disabled")
     def test_invalid_ping_interval_ping_timeout(self):
         """Test exception handling if ping_interval < ping_timeout"""
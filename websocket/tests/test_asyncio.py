@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import struct
+import unittest
+
+import websocket as ws
+from websocket._abnf import ABNF, frame_buffer
+from websocket._asyncio import AsyncWebSocket, async_create_connection
+from websocket._exceptions import (
+    WebSocketBadStatusException,
+    WebSocketMessageTooBigException,
+)
+from websocket.tests._server import handshake_response
+
+"""
+test_asyncio.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+def server_frame(data, opcode=ABNF.OPCODE_TEXT, fin=1):
+    return ABNF(fin, 0, 0, 0, opcode, 0, data).format()
+
+
+class AsyncWebSocketTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Received frames, and handler of each connection after the
+        # handshake, which echoes the data frames by default.
+        self.received = []
+        self.handler = self.echo
+        self.status = b"101 Switching Protocols"
+        self.closed = asyncio.Event()
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def serve(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        body = b"" if self.status.startswith(b"101") else b"no"
+        writer.write(handshake_response(request, self.status, body))
+        try:
+            await self.handler(reader, writer)
+        finally:
+            writer.close()
+            self.closed.set()
+
+    async def frames(self, reader):
+        frames = frame_buffer(None, True)
+        while data := await reader.read(65536):
+            frames.feed(data)
+            while frame := frames.next_frame():
+                self.received.append(frame)
+                yield frame
+
+    async def echo(self, reader, writer):
+        async for frame in self.frames(reader):
+            if frame.opcode == ABNF.OPCODE_CLOSE:
+                writer.write(server_frame(frame.data, ABNF.OPCODE_CLOSE))
+                return
+            if frame.opcode != ABNF.OPCODE_PONG:
+                writer.write(server_frame(frame.data, frame.opcode, frame.fin))
+
+    async def test_send_recv(self):
+        websock = await async_create_connection(self.url, timeout=5)
+        self.assertEqual(websock.status, 101)
+        self.assertTrue(websock.connected)
+        self.assertEqual(await websock.send("こんにちは"), 21)
+        self.assertEqual(await websock.recv(), "こんにちは")
+        await websock.send_bytes(b"\x00" * 100000)
+        self.assertEqual(await websock.recv(), b"\x00" * 100000)
+        await websock.close()
+        self.assertFalse(websock.connected)
+        self.assertEqual(self.received[-1].opcode, ABNF.OPCODE_CLOSE)
+        self.assertEqual(self.received[-1].data, struct.pack("!H", ws.STATUS_NORMAL))
+
+    async def test_iterate(self):
+        async def handler(reader, writer):
+            writer.write(server_frame(b"Hello, ", fin=0))
+            writer.write(server_frame(b"World", ABNF.OPCODE_CONT))
+            writer.write(server_frame(b"ping", ABNF.OPCODE_PING))
+            writer.write(server_frame(b"\x01\x02", ABNF.OPCODE_BINARY))
+            writer.write(server_frame(b"\x03\xe8", ABNF.OPCODE_CLOSE))
+            async for frame in self.frames(reader):
+                if frame.opcode == ABNF.OPCODE_CLOSE:
+                    return
+
+        self.handler = handler
+        async with AsyncWebSocket() as websock:
+            await websock.connect(self.url)
+            messages = [message async for message in websock]
+        self.assertEqual(messages, ["Hello, World", b"\x01\x02"])
+        self.assertFalse(websock.connected)
+        await asyncio.wait_for(self.closed.wait(), 5)
+        self.assertEqual(
+            [(frame.opcode, frame.data) for frame in self.received],
+            [(ABNF.OPCODE_PONG, b"ping"), (ABNF.OPCODE_CLOSE, b"\x03\xe8")],
+        )
+
+    async def test_close_while_receiving(self):
+        # One task iterates over the messages while another closes the
+        # connection: the close frame is read by the receiving task.
+        async def handler(reader, writer):
+            writer.write(server_frame(b"Hello"))
+            async for frame in self.frames(reader):
+                if frame.opcode == ABNF.OPCODE_CLOSE:
+                    writer.write(server_frame(b"late"))
+                    await asyncio.sleep(0.05)
+                    writer.write(server_frame(frame.data, ABNF.OPCODE_CLOSE))
+                    return
+
+        self.handler = handler
+        websock = await async_create_connection(self.url, timeout=5)
+        received = asyncio.Event()
+
+        async def receive():
+            messages = []
+            async for message in websock:
+                messages.append(message)
+                received.set()
+            return messages
+
+        task = asyncio.create_task(receive())
+        await received.wait()
+        # Without waiting for the close timeout.
+        await asyncio.wait_for(websock.close(timeout=60), 10)
+        self.assertEqual(await asyncio.wait_for(task, 5), ["Hello", "late"])
+        self.assertFalse(websock.connected)
+        self.assertEqual([frame.opcode for frame in self.received], [ABNF.OPCODE_CLOSE])
+
+    async def test_concurrent_send(self):
+        # Tasks sending at once wait in drain() one at a time.
+        websock = await async_create_connection(self.url, timeout=5)
+        drain = websock.writer.drain
+        draining = []
+
+        async def checked_drain():
+            draining.append(None)
+            try:
+                self.assertEqual(len(draining), 1)
+                await asyncio.sleep(0)
+                await drain()
+            finally:
+                draining.pop()
+
+        websock.writer.drain = checked_drain
+        messages = [str(i) * 100000 for i in range(10)]
+        await asyncio.gather(*(websock.send(message) for message in messages))
+        for message in messages:
+            self.assertEqual(await websock.recv(), message)
+        await websock.close()
+
+    async def test_max_message_size(self):
+        async def handler(reader, writer):
+            writer.write(server_frame(b"x" * 10, fin=0))
+            writer.write(server_frame(b"x" * 10, ABNF.OPCODE_CONT))
+            async for _ in self.frames(reader):
+                pass
+
+        self.handler = handler
+        websock = await async_create_connection(self.url, max_message_size=15)
+        with self.assertRaises(WebSocketMessageTooBigException):
+            await websock.recv()
+        self.assertFalse(websock.connected)
+        await asyncio.wait_for(self.closed.wait(), 5)
+        self.assertEqual(self.received[0].data, struct.pack("!H", 1009))
+
+    async def test_bad_status(self):
+        self.status = b"403 Forbidden"
+        with self.assertRaises(WebSocketBadStatusException) as cm:
+            await async_create_connection(self.url)
+        self.assertEqual(cm.exception.status_code, 403)
+        self.assertEqual(cm.exception.resp_body, b"no")
+
+    async def test_concurrent_connections(self):
+        connections = await asyncio.gather(
+            *(async_create_connection(self.url) for _ in range(20))
+        )
+        for i, websock in enumerate(connections):
+            await websock.send(str(i))
+        replies = await asyncio.gather(*(websock.recv() for websock in connections))
+        self.assertEqual(replies, [str(i) for i in range(20)])
+        await asyncio.gather(*(websock.close() for websock in connections))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+import unittest
+import zlib
+
+from websocket._abnf import ABNF
+from websocket._compression import PerMessageDeflate
+from websocket._exceptions import (
+    WebSocketException,
+    WebSocketPayloadException,
+    WebSocketProtocolException,
+)
+from websocket._handshake import _get_handshake_headers
+
+"""
+test_compression.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+def received(data, opcode=ABNF.OPCODE_TEXT, fin=1, rsv1=1):
+    return ABNF(fin, rsv1, 0, 0, opcode, 0, data)
+
+
+class PerMessageDeflateTest(unittest.TestCase):
+    def test_offer(self):
+        self.assertEqual(
+            PerMessageDeflate.offer({}), "permessage-deflate; client_max_window_bits"
+        )
+        self.assertEqual(
+            PerMessageDeflate.offer(
+                {
+                    "server_no_context_takeover": True,
+                    "client_no_context_takeover": True,
+                    "server_max_window_bits": 10,
+                    "client_max_window_bits": 12,
+                }
+            ),
+            "permessage-deflate; server_no_context_takeover; "
+            "client_no_context_takeover; server_max_window_bits=10; "
+            "client_max_window_bits=12",
+        )
+        for options in ({"server_max_window_bits": 8}, {"client_max_window_bits": 16}):
+            self.assertRaises(ValueError, PerMessageDeflate.offer, options)
+
+    def test_accept(self):
+        deflate = PerMessageDeflate.accept("permessage-deflate", {})
+        self.assertFalse(deflate.server_no_context_takeover)
+        self.assertEqual(deflate.client_max_window_bits, 15)
+
+        deflate = PerMessageDeflate.accept(
+            "Permessage-Deflate; server_no_context_takeover; client_max_window_bits=9",
+            {"server_no_context_takeover": True, "max_decompressed_size": 10},
+        )
+        self.assertTrue(deflate.server_no_context_takeover)
+        self.assertEqual(deflate.client_max_window_bits, 9)
+        self.assertEqual(deflate.max_decompressed_size, 10)
+
+    def test_accept_invalid(self):
+        for response, options in (
+            ("x-webkit-deflate-frame", {}),
+            ("permessage-deflate, permessage-deflate", {}),
+            ("permessage-deflate; foo", {}),
+            ("permessage-deflate; server_no_context_takeover=1", {}),
+            ("permessage-deflate; server_max_window_bits", {}),
+            ("permessage-deflate; server_max_window_bits=16", {}),
+            ("permessage-deflate; client_max_window_bits=8", {}),
+            (
+                "permessage-deflate; client_max_window_bits=12",
+                {"client_max_window_bits": 10},
+            ),
+            (
+                "permessage-deflate; "
+                "client_no_context_takeover; client_no_context_takeover",
+                {},
+            ),
+            ("permessage-deflate", {"server_no_context_takeover": True}),
+            ("permessage-deflate", {"server_max_window_bits": 10}),
+        ):
+            with self.subTest(response=response):
+                self.assertRaises(
+                    WebSocketException, PerMessageDeflate.accept, response, options
+                )
+
+    def test_decompress(self):
+        # Examples of RFC 7692 section 7.2.3
+        deflate = PerMessageDeflate()
+        frame = received(b"\xf2\x48\xcd\xc9\xc9\x07\x00")
+        deflate.decompress(frame)
+        self.assertEqual(frame.data, b"Hello")
+        self.assertEqual(frame.rsv1, 0)
+        frame = received(b"\xf2\x00\x11\x00\x00")
+        deflate.decompress(frame)
+        self.assertEqual(frame.data, b"Hello")
+
+        frames = [
+            received(b"\xf2\x48\xcd", fin=0),
+            received(b"\xc9\xc9\x07\x00", ABNF.OPCODE_CONT, rsv1=0),
+        ]
+        for frame in frames:
+            deflate.decompress(frame)
+        self.assertEqual(b"".join(frame.data for frame in frames), b"Hello")
+
+        frame = received(b"Hello", rsv1=0)
+        deflate.decompress(frame)
+        self.assertEqual(frame.data, b"Hello")
+        frame = received(b"\x03\xe8", ABNF.OPCODE_CLOSE, rsv1=0)
+        deflate.decompress(frame)
+        self.assertEqual(frame.data, b"\x03\xe8")
+
+    def test_decompress_invalid(self):
+        deflate = PerMessageDeflate()
+        self.assertRaises(
+            WebSocketProtocolException, deflate.decompress, received(b"\xff" * 10)
+        )
+
+    def test_max_decompressed_size(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        data = compressor.compress(b"\x00" * 1000) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        deflate = PerMessageDeflate(max_decompressed_size=1000)
+        frame = received(data[:-4])
+        deflate.decompress(frame)
+        self.assertEqual(len(frame.data), 1000)
+
+        deflate = PerMessageDeflate(max_decompressed_size=999)
+        self.assertRaises(
+            WebSocketPayloadException, deflate.decompress, received(data[:-4])
+        )
+        deflate = PerMessageDeflate(max_decompressed_size=None)
+        frame = received(data[:-4])
+        deflate.decompress(frame)
+        self.assertEqual(len(frame.data), 1000)
+
+    def test_inflate(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        payload = bytes(range(256)) * 100
+        data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        deflate = PerMessageDeflate(server_no_context_takeover=True)
+        decompressed = []
+        data = data[:-4]
+        for i in range(0, len(data), 10):
+            decompressed.append(deflate.inflate(data[i : i + 10], 100))
+            self.assertLessEqual(len(decompressed[-1]), 100)
+        decompressed.append(deflate.inflate(b"", 100, True))
+        while output := deflate.inflate(b"", 100):
+            decompressed.append(output)
+        deflate.end_message()
+        self.assertEqual(b"".join(decompressed), payload)
+        self.assertIsNone(deflate._decompressor)
+
+    def test_compress(self):
+        for client_no_context_takeover in (False, True):
+            with self.subTest(client_no_context_takeover=client_no_context_takeover):
+                client = PerMessageDeflate(
+                    client_no_context_takeover=client_no_context_takeover,
+                    client_max_window_bits=9,
+                )
+                server = PerMessageDeflate(
+                    server_no_context_takeover=client_no_context_takeover
+                )
+                for frame, payload in (
+                    (ABNF.create_frame("Hello", ABNF.OPCODE_TEXT, 0), b"Hello"),
+                    (ABNF.create_frame(" World", ABNF.OPCODE_CONT), b" World"),
+                    (ABNF.create_frame(b"Hello", ABNF.OPCODE_BINARY), b"Hello"),
+                    (ABNF.create_frame(b"", ABNF.OPCODE_BINARY), b""),
+                    (ABNF.create_frame(b"ping", ABNF.OPCODE_PING), b"ping"),
+                ):
+                    client.compress(frame)
+                    if frame.opcode == ABNF.OPCODE_PING:
+                        self.assertEqual(frame.data, b"ping")
+                        self.assertEqual(frame.rsv1, 0)
+                    else:
+                        self.assertEqual(frame.rsv1, frame.opcode != ABNF.OPCODE_CONT)
+                    server.decompress(frame)
+                    self.assertEqual(frame.data, payload)
+
+    def test_handshake_headers(self):
+        headers, _ = _get_handshake_headers(
+            "/", "ws://example.com", "example.com", 80, {"permessage_deflate": True}
+        )
+        self.assertIn(
+            "Sec-WebSocket-Extensions: permessage-deflate; client_max_window_bits",
+            headers,
+        )
+        headers, _ = _get_handshake_headers(
+            "/",
+            "ws://example.com",
+            "example.com",
+            80,
+            {"permessage_deflate": {"client_no_context_takeover": True}},
+        )
+        self.assertIn(
+            "Sec-WebSocket-Extensions: permessage-deflate; "
+            "client_no_context_takeover; client_max_window_bits",
+            headers,
+        )
+        headers, _ = _get_handshake_headers(
+            "/", "ws://example.com", "example.com", 80, {}
+        )
+        self.assertFalse(any(h.startswith("Sec-WebSocket-Extensions") for h in headers))
+
+    def test_validate_rsv1(self):
+        frame = received(b"Hello")
+        self.assertRaises(WebSocketProtocolException, frame.validate)
+        frame.validate(allow_rsv1=True)
+        frame = received(b"Hello", ABNF.OPCODE_CONT)
+        self.assertRaises(WebSocketProtocolException, frame.validate, False, True)
+        frame = received(b"", ABNF.OPCODE_PING)
+        self.assertRaises(WebSocketProtocolException, frame.validate, False, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,9 +9,12 @@
 from websocket._dispatcher import (
     Dispatcher,
     DispatcherBase,
+    HubDispatcher,
     SSLDispatcher,
+    WebSocketHub,
     WrappedDispatcher,
 )
+from websocket.tests._server import Server, handshake, mute
 
 """
 test_dispatcher.py
@@ -381,5 +384,173 @@ def test_wrapped_dispatcher_reconnect(self):
         self.assertEqual(call[2], (True,))
 
 
+class WebSocketHubTest(unittest.TestCase):
+    def setUp(self):
+        self.hub = WebSocketHub()
+        self.addCleanup(self.hub.close)
+
+    def test_timeout(self):
+        calls = []
+
+        def repeat(name):
+            calls.append(name)
+            return len(calls) < 4
+
+        self.hub.timeout(0.02, calls.append, "once")
+        self.hub.timeout(0.01, repeat, "repeat")
+        self.hub.dispatch()
+        self.assertEqual(calls, ["repeat", "once", "repeat", "repeat"])
+        self.assertEqual(self.hub.timers, [])
+
+    def test_read(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        received = []
+
+        def read():
+            received.append(a.recv(10))
+            return received[-1] != b"stop"
+
+        self.hub.read(a, read)
+        self.assertEqual(a.gettimeout(), 0)
+        self.hub.timeout(0, b.sendall, b"Hello")
+        self.hub.timeout(0.05, b.sendall, b"stop")
+        self.hub.dispatch()
+        self.assertEqual(received, [b"Hello", b"stop"])
+        self.assertEqual(self.hub.channels, {})
+
+    def test_buffwrite(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        a.setblocking(False)
+        data = bytes(range(256)) * 10000
+        received = []
+
+        def read():
+            received.append(b.recv(65536))
+            return sum(map(len, received)) < len(data) * 2
+
+        # More than fits into the socket buffers, so the writes are queued.
+        self.hub.buffwrite(a, data, websocket._socket.send, Mock())
+        self.hub.buffwrite(a, data, websocket._socket.send, Mock())
+        self.assertTrue(self.hub.channels[a].pending)
+        self.hub.read(b, read)
+        self.hub.dispatch()
+        self.assertEqual(b"".join(received), data * 2)
+        self.assertNotIn(a, self.hub.channels)
+
+    def test_buffwrite_error(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        b.close()
+        handle_disconnect = Mock()
+        self.hub.buffwrite(a, b"Hello", websocket._socket.send, handle_disconnect)
+        self.hub.dispatch()
+        handle_disconnect.assert_called_once()
+        self.assertIsInstance(handle_disconnect.call_args[0][0], OSError)
+
+    def test_abort(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        self.hub.read(a, Mock(return_value=True))
+        threading.Timer(0.05, self.hub.abort).start()
+        self.hub.dispatch()
+        self.assertIn(a, self.hub.channels)
+
+    def test_apps(self):
+        server = Server()
+        self.addCleanup(server.close)
+        messages = []
+        pongs = []
+
+        def close_when_done():
+            if len(messages) == 10 and len(pongs) == 10:
+                for app in apps:
+                    app.close()
+
+        def on_message(app, message):
+            messages.append(message)
+            close_when_done()
+
+        def on_pong(app, data):
+            pongs.append(data)
+            close_when_done()
+
+        apps = [
+            websocket.WebSocketApp(
+                server.url,
+                on_open=lambda app: app.send("Hello"),
+                on_message=on_message,
+                on_pong=on_pong,
+            )
+            for _ in range(10)
+        ]
+        threads = threading.active_count()
+        for app in apps:
+            app.run_forever(dispatcher=self.hub, ping_interval=0.1)
+            self.assertIsInstance(app.sock.dispatcher, HubDispatcher)
+        self.hub.dispatch()
+        # One server thread per connection, but no ping threads, besides
+        # those connecting and closing, which may not have exited yet.
+        others = [
+            thread
+            for thread in threading.enumerate()
+            if thread.name != "websocket-hub-worker"
+        ]
+        self.assertLessEqual(len(others), threads + 10)
+        self.assertEqual(messages, ["Hello"] * 10)
+        self.assertGreaterEqual(len(pongs), 10)
+        self.assertEqual(self.hub.channels, {})
+
+    def test_slow_server(self):
+        # Servers that don't answer the handshake or the close frame don't
+        # hold up the other connections of the hub.
+        server = Server()
+        self.addCleanup(server.close)
+        muted = Server(mute)
+        self.addCleanup(muted.close)
+        muted_after_handshake = Server(lambda conn: handshake(conn) or mute(conn))
+        self.addCleanup(muted_after_handshake.close)
+        messages = []
+        closing = []
+        # Whether the connect and the close were still waiting once all
+        # messages were echoed.
+        waiting = []
+
+        def on_open(app):
+            closing.append(app.sock)
+            app.close(timeout=60)
+            # Echo messages while the close waits for the server.
+            echo.run_forever(dispatcher=self.hub)
+
+        def on_message(app, message):
+            messages.append(message)
+            if len(messages) < 20:
+                app.send(str(len(messages)))
+            else:
+                waiting.append(not stalled.sock.connected)
+                waiting.append(closing[0].sock is not None)
+                self.hub.abort()
+
+        stalled = websocket.WebSocketApp(muted.url)
+        slow_close = websocket.WebSocketApp(muted_after_handshake.url, on_open=on_open)
+        echo = websocket.WebSocketApp(
+            server.url, on_open=lambda app: app.send("0"), on_message=on_message
+        )
+        for app in (stalled, slow_close, echo):
+            self.addCleanup(app.close)
+        stalled.run_forever(dispatcher=self.hub)
+        slow_close.run_forever(dispatcher=self.hub)
+        timer = threading.Timer(30, self.hub.abort)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.hub.dispatch()
+        self.assertEqual(messages, [str(i) for i in range(20)])
+        self.assertEqual(waiting, [True, True])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import websocket as ws
+from websocket._dns import DNSCache
+from websocket._exceptions import WebSocketAddressException
+from websocket._http import _get_addrinfo_list, proxy_info
+
+"""
+test_dns.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+ADDRINFO = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 80))]
+
+
+class DNSCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("socket.getaddrinfo", return_value=ADDRINFO)
+        self.getaddrinfo = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(ws.setdnscache, None)
+
+    def test_ttl(self):
+        cache = DNSCache(ttl=0.05)
+        self.assertEqual(cache.getaddrinfo("example.com", 80), ADDRINFO)
+        self.assertEqual(cache.getaddrinfo("example.com", 80), ADDRINFO)
+        self.assertEqual(self.getaddrinfo.call_count, 1)
+        cache.getaddrinfo("example.com", 443)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        time.sleep(0.1)
+        cache.getaddrinfo("example.com", 80)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        cache.clear()
+        cache.getaddrinfo("example.com", 80)
+        self.assertEqual(self.getaddrinfo.call_count, 4)
+
+    def test_negative_ttl(self):
+        self.getaddrinfo.side_effect = socket.gaierror(-2, "Name or service not known")
+        cache = DNSCache(negative_ttl=10)
+        for _ in range(3):
+            self.assertRaises(socket.gaierror, cache.getaddrinfo, "example.com", 80)
+        self.assertEqual(self.getaddrinfo.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_refresh(self):
+        cache = DNSCache(ttl=0.4, refresh=True)
+        cache.getaddrinfo("example.com", 80)
+        time.sleep(0.25)
+        # Used in the second half of its ttl, the entry is refreshed in the
+        # background, and a failure keeps the cached addresses.
+        self.getaddrinfo.side_effect = socket.gaierror(-3, "Temporary failure")
+        self.assertEqual(cache.getaddrinfo("example.com", 80), ADDRINFO)
+        for _ in range(100):
+            if self.getaddrinfo.call_count == 2 and not cache.resolving:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.getaddrinfo("example.com", 80), ADDRINFO)
+        self.getaddrinfo.side_effect = None
+        time.sleep(0.2)
+        cache.getaddrinfo("example.com", 80)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_concurrent_lookups(self):
+        resolving = threading.Event()
+        release = threading.Event()
+
+        def getaddrinfo(*args):
+            resolving.set()
+            release.wait(5)
+            return ADDRINFO
+
+        self.getaddrinfo.side_effect = getaddrinfo
+        cache = DNSCache()
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.getaddrinfo("example.com", 80))
+            )
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        resolving.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [ADDRINFO] * 10)
+        self.assertEqual(self.getaddrinfo.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (9, 1))
+
+    def test_maxsize(self):
+        cache = DNSCache(maxsize=2)
+        for port in (80, 443, 80, 8080):
+            cache.getaddrinfo("example.com", port)
+        self.assertEqual(
+            list(cache.entries), [("example.com", 80), ("example.com", 8080)]
+        )
+
+    def test_get_addrinfo_list(self):
+        self.assertIsNone(ws.getdnscache())
+        proxy = proxy_info()
+        _get_addrinfo_list("example.com", 80, False, proxy)
+        _get_addrinfo_list("example.com", 80, False, proxy)
+        self.assertEqual(self.getaddrinfo.call_count, 2)
+
+        cache = DNSCache()
+        ws.setdnscache(cache)
+        self.assertIs(ws.getdnscache(), cache)
+        self.assertEqual(
+            _get_addrinfo_list("example.com", 80, False, proxy),
+            (ADDRINFO, False, None),
+        )
+        _get_addrinfo_list("example.com", 80, False, proxy)
+        # Through an HTTP proxy, the proxy host is resolved.
+        proxy = proxy_info(http_proxy_host="proxy.example.com", http_proxy_port=3128)
+        _get_addrinfo_list("example.com", 80, False, proxy)
+        self.getaddrinfo.assert_called_with(
+            "proxy.example.com", 3128, 0, socket.SOCK_STREAM, socket.SOL_TCP
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        self.getaddrinfo.side_effect = socket.gaierror(-2, "Name or service not known")
+        self.assertRaises(
+            WebSocketAddressException,
+            _get_addrinfo_list,
+            "invalid.example.com",
+            80,
+            False,
+            proxy_info(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
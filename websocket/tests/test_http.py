@@ -4,12 +4,14 @@
 import os.path
 import socket
 import ssl
+import time
 import unittest
 
 import websocket
 from websocket._exceptions import WebSocketProxyException, WebSocketException
 from websocket._http import (
     _get_addrinfo_list,
+    _open_socket,
     _start_proxied_socket,
     _tunnel,
     connect,
@@ -91,6 +93,7 @@ def __init__(self):
         self.timeout = 1
         self.sockopt = []
         self.sslopt = {"cert_reqs": ssl.CERT_NONE}
+        self.happy_eyeballs_delay = None
 
 
 class HttpTest(unittest.TestCase):
@@ -103,6 +106,76 @@ def test_read_header(self):
             WebSocketException, read_headers, HeaderSockMock("data/header02.txt")
         )
 
+    def test_read_headers_buffered(self):
+        sock = SockMock()
+        sock.add_packet(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r")
+        sock.add_packet(b"\nConnection: Upgrade\r\n\r")
+        sock.add_packet(b"\n\x81\x02hi")
+        rest = bytearray()
+        status, header, status_message = read_headers(sock, rest)
+        self.assertEqual(status, 101)
+        self.assertEqual(status_message, "Switching Protocols")
+        self.assertEqual(header, {"upgrade": "websocket", "connection": "Upgrade"})
+        self.assertEqual(rest, b"\x81\x02hi")
+
+        sock = SockMock()
+        sock.add_packet(b"HTTP/1.1 200 OK\nContent-Length: 2\n\nok")
+        rest = bytearray()
+        self.assertEqual(read_headers(sock, rest)[:2], (200, {"content-length": "2"}))
+        self.assertEqual(rest, b"ok")
+
+        sock = SockMock()
+        sock.add_packet(b"HTTP/1.1 200 OK\r\n\r\nrest")
+        self.assertRaises(
+            WebSocketProxyException, _tunnel, sock, "example.com", 80, None
+        )
+
+    def test_open_socket_happy_eyeballs(self):
+        def addrinfo(address):
+            return (socket.AF_INET, socket.SOCK_STREAM, socket.SOL_TCP, "", address)
+
+        # A server whose accept queue is full drops new connection attempts,
+        # like a black-holed address.
+        blackhole = socket.create_server(("127.0.0.1", 0), backlog=0)
+        self.addCleanup(blackhole.close)
+        for _ in range(5):
+            client = socket.socket()
+            self.addCleanup(client.close)
+            client.settimeout(0.2)
+            try:
+                client.connect(blackhole.getsockname())
+            except socket.timeout:
+                break
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+        closed = socket.create_server(("127.0.0.1", 0))
+        refused = closed.getsockname()
+        closed.close()
+
+        addrinfo_list = [
+            addrinfo(blackhole.getsockname()),
+            addrinfo(refused),
+            addrinfo(server.getsockname()),
+        ]
+        start = time.monotonic()
+        sock = _open_socket(addrinfo_list, [], 10, 0.05)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(sock.getpeername(), server.getsockname())
+        self.assertEqual(sock.gettimeout(), 10)
+        sock.close()
+
+        with self.assertRaises(ConnectionRefusedError) as cm:
+            _open_socket([addrinfo(refused)] * 2, [], 10, 0.05)
+        self.assertEqual(cm.exception.remote_ip, "127.0.0.1")
+        self.assertRaises(
+            socket.timeout,
+            _open_socket,
+            [addrinfo(blackhole.getsockname())] * 2,
+            [],
+            0.2,
+            0.05,
+        )
+
     def test_tunnel(self):
         self.assertRaises(
             WebSocketProxyException,
@@ -189,7 +189,7 @@ def mock_send(data):
 
         # Send the payload
         with patch("websocket._core.send") as mock_send_func:
-            mock_send_func.side_effect = lambda sock, data: len(data)
+            mock_send_func.side_effect = lambda sock, data, waiter=None: len(data)
 
             # This should work without SSL errors
             result = ws.send_binary(large_payload)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import socket
+import unittest
+from unittest.mock import Mock, patch
+
+import websocket as ws
+from websocket._metrics import Histogram
+
+"""
+test_metrics.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+HANDSHAKE_RESPONSE = (
+    b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+    b"Connection: Upgrade\r\n"
+    b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n\r\n"
+)
+
+
+class SockMock:
+    # Sends at most send_size bytes per call, like a full socket buffer.
+    def __init__(self, send_size=None):
+        self.data = []
+        self.sent = []
+        self.send_size = send_size
+
+    def gettimeout(self):
+        return None
+
+    def recv(self, bufsize):
+        e = self.data.pop(0)
+        if len(e) > bufsize:
+            self.data.insert(0, e[bufsize:])
+        return e[:bufsize]
+
+    def send(self, data):
+        data = bytes(data)[: self.send_size]
+        self.sent.append(data)
+        return len(data)
+
+    def close(self):
+        pass
+
+
+class HistogramTest(unittest.TestCase):
+    def test_percentile(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        for i in range(1, 1001):
+            histogram.record(i * 1e-4)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.sum, 50.05)
+        self.assertEqual((histogram.min, histogram.max), (1e-4, 0.1))
+        # Buckets are at most 1/16 of their values wide.
+        for percent, value in ((50, 0.05), (90, 0.09), (99, 0.099)):
+            self.assertGreaterEqual(histogram.percentile(percent), value)
+            self.assertLess(histogram.percentile(percent), value * 17 / 16)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_buckets(self):
+        histogram = Histogram()
+        for value in (0, 5e-6, 5e-6, 1e-3, 10):
+            histogram.record(value)
+        buckets = histogram.buckets()
+        self.assertEqual([count for _, count in buckets], [1, 3, 4, 5])
+        self.assertAlmostEqual(buckets[0][0], 1e-6)
+        self.assertAlmostEqual(buckets[1][0], 6e-6)
+        self.assertAlmostEqual(buckets[2][0], 1.024e-3)
+        self.assertEqual(histogram.snapshot()["max"], 10)
+
+
+class MetricsTest(unittest.TestCase):
+    def test_frames(self):
+        metrics = ws.Metrics()
+        sock = ws.WebSocket(metrics=metrics)
+        s = sock.sock = SockMock(send_size=4)
+        sock.send("Hello")
+        s.data.append(b"\x89\x02hi\x81\x05Hello")
+        self.assertEqual(sock.recv(), "Hello")
+        s.data.append(b"\x82\x0a0123456789")
+        with sock.recv_stream() as message:
+            self.assertEqual(message.read(4), b"0123")
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["frames_sent"], {"text": 1, "pong": 1})
+        self.assertEqual(snapshot["bytes_sent"], {"text": 5, "pong": 2})
+        self.assertEqual(
+            snapshot["frames_received"], {"ping": 1, "text": 1, "binary": 1}
+        )
+        self.assertEqual(
+            snapshot["bytes_received"], {"ping": 2, "text": 5, "binary": 10}
+        )
+        # Frames of 11 and 8 bytes, sent 4 bytes at a time.
+        self.assertEqual(snapshot["send_calls"], 5)
+        self.assertEqual(snapshot["partial_sends"], 3)
+        self.assertGreater(snapshot["recv_calls"], 0)
+
+    def test_handshake_time(self):
+        metrics = ws.Metrics()
+        client, server = socket.socketpair()
+        self.addCleanup(server.close)
+        server.sendall(HANDSHAKE_RESPONSE)
+        sock = ws.WebSocket(metrics=metrics)
+        self.assertIs(sock.read_waiter.metrics, metrics)
+        sock.connect(
+            "ws://example.com/",
+            socket=client,
+            header={"Sec-WebSocket-Key": "dGhlIHNhbXBsZSBub25jZQ=="},
+        )
+        sock.shutdown()
+        self.assertEqual(metrics.handshake_time.count, 1)
+        self.assertGreater(metrics.handshake_time.max, 0)
+
+    def test_app(self):
+        metrics = ws.Metrics()
+        app = ws.WebSocketApp("ws://example.com/", metrics=metrics)
+        app.sock = Mock()
+        with patch("time.monotonic_ns", side_effect=[10**9, 10**9 + 25 * 10**4]):
+            app._ping()
+            app._pong(app.sock.ping.call_args.args[0])
+        # A pong without a ping, e.g. unsolicited, isn't measured.
+        app._pong(b"")
+        self.assertEqual(metrics.ping_rtt.count, 1)
+        self.assertEqual(metrics.ping_rtt.max, 0.00025)
+
+        app._callback(lambda app, message: None, "Hello")
+        app._callback(lambda app: 1 / 0)
+        self.assertEqual(metrics.callback_time.count, 2)
+
+    def test_prometheus(self):
+        metrics = ws.Metrics()
+        metrics.frame_sent(ws.ABNF.OPCODE_TEXT, 5)
+        metrics.waits = 2
+        metrics.handshake_time.record(0.002)
+        text = metrics.prometheus(labels={"url": 'ws://"example"/'})
+        lines = text.splitlines()
+        label = 'url="ws://\\"example\\"/"'
+        self.assertIn("# TYPE websocket_frames_sent_total counter", lines)
+        self.assertIn(f'websocket_frames_sent_total{{{label},opcode="text"}} 1', lines)
+        self.assertIn(f"websocket_waits_total{{{label}}} 2", lines)
+        self.assertIn("# TYPE websocket_handshake_time_seconds histogram", lines)
+        self.assertIn(
+            f'websocket_handshake_time_seconds_bucket{{{label},le="0.002048"}} 1',
+            lines,
+        )
+        self.assertIn(
+            f'websocket_handshake_time_seconds_bucket{{{label},le="+Inf"}} 1', lines
+        )
+        self.assertIn(f"websocket_handshake_time_seconds_count{{{label}}} 1", lines)
+        self.assertIn("websocket_ping_rtt_seconds_count 0", ws.Metrics().prometheus())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import functools
+import unittest
+
+from websocket._pool import WebSocketPool
+from websocket.tests._server import Server, echo, mute
+
+"""
+test_pool.py
+websocket - WebSocket client library for Python
+
+Copyright 2025 engn33r
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+class WebSocketPoolTest(unittest.TestCase):
+    def setUp(self):
+        # Start the workers before the server threads.
+        self.pool = WebSocketPool(2)
+        self.addCleanup(self.pool.close)
+        # Echoes one message, then closes the connection.
+        self.server = Server(functools.partial(echo, count=1))
+        self.addCleanup(self.server.close)
+
+    def test_worker(self):
+        workers = [self.pool.worker(f"ws://example.com/{i}") for i in range(100)]
+        self.assertEqual(set(workers), {0, 1})
+        self.assertEqual(
+            workers, [self.pool.worker(f"ws://example.com/{i}") for i in range(100)]
+        )
+
+    def test_connect(self):
+        urls = [f"{self.server.url}{i}" for i in range(4)]
+        for url in urls:
+            self.pool.connect(url)
+        events = {url: [] for url in urls}
+        closed = 0
+        while closed < len(urls):
+            url, event, data = self.pool.recv(10)
+            events[url].append((event, data))
+            if event == "open":
+                self.pool.send(url, url)
+            elif event == "close":
+                closed += 1
+        for url in urls:
+            self.assertEqual(events[url][:2], [("open", None), ("message", url)])
+            self.assertEqual(events[url][-1][0], "close")
+
+    def test_slow_server(self):
+        # A server that never answers the handshake doesn't hold up the
+        # other connections of its worker.
+        muted = Server(mute)
+        self.addCleanup(muted.close)
+        self.pool.connect(muted.url)
+        worker = self.pool.worker(muted.url)
+        urls = [f"{self.server.url}{i}" for i in range(20)]
+        urls = [url for url in urls if self.pool.worker(url) == worker][:2]
+        for url in urls:
+            self.pool.connect(url)
+        closed = set()
+        while closed != set(urls):
+            url, event, data = self.pool.recv(5)
+            self.assertNotEqual(url, muted.url)
+            if event == "open":
+                self.pool.send(url, url)
+            elif event == "close":
+                closed.add(url)
+
+    def test_close(self):
+        self.pool.close()
+        self.assertEqual(
+            [worker.is_alive() for worker in self.pool.workers], [False] * 2
+        )
+        self.assertRaises(ValueError, self.pool.connect, "ws://example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
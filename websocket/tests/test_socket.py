@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 import errno
+import selectors
 import socket
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import time
 
-from websocket._socket import recv, recv_line, send, DEFAULT_SOCKET_OPTION
+from websocket._socket import (
+    _Waiter,
+    recv,
+    recv_into,
+    recv_line,
+    send,
+    DEFAULT_SOCKET_OPTION,
+)
 from websocket._ssl_compat import (
     SSLError,
     SSLEOFError,
@@ -141,6 +149,36 @@ def test_recv_ssl_want_read_error(self):
             mock_selector.register.assert_called()
             mock_selector.close.assert_called()
 
+    def test_recv_waiter(self):
+        """Test that a waiter reuses its selector across waits"""
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        mock_sock = Mock(wraps=a)
+        mock_sock.gettimeout.return_value = 1.0
+        waiter = _Waiter(selectors.EVENT_READ)
+
+        b.sendall(b"ab")
+        for data in (b"a", b"b"):
+            mock_sock.recv.side_effect = [SSLWantReadError(), data]
+            self.assertEqual(recv(mock_sock, 1, waiter), data)
+        selector = waiter.selector
+        self.assertIsNotNone(selector)
+        self.assertEqual(waiter.waits, 2)
+
+        # A new socket replaces the previous one in the same selector
+        mock_sock = Mock(wraps=b)
+        mock_sock.gettimeout.return_value = 0.1
+        mock_sock.recv.side_effect = SSLWantReadError()
+        with self.assertRaises(WebSocketTimeoutException):
+            recv(mock_sock, 1, waiter)
+        self.assertIs(waiter.selector, selector)
+        self.assertEqual(len(selector.get_map()), 1)
+        self.assertEqual(waiter.waits, 3)
+
+        waiter.close()
+        self.assertIsNone(waiter.selector)
+
     def test_recv_ssl_want_read_timeout(self):
         """Test recv with SSLWantReadError that times out"""
         mock_sock = Mock()
@@ -155,6 +193,40 @@ def test_recv_ssl_want_read_timeout(self):
             with self.assertRaises(WebSocketTimeoutException):
                 recv(mock_sock, 100)
 
+    def test_recv_into_normal(self):
+        """Test recv_into writes into the given buffer"""
+        sock, peer = socket.socketpair()
+        try:
+            peer.sendall(b"test data")
+            buffer = bytearray(16)
+            nbytes = recv_into(sock, memoryview(buffer)[4:])
+            self.assertEqual(nbytes, 9)
+            self.assertEqual(bytes(buffer[4:13]), b"test data")
+        finally:
+            sock.close()
+            peer.close()
+
+    def test_recv_into_closed(self):
+        """Test recv_into raises when the peer closed the connection"""
+        sock, peer = socket.socketpair()
+        peer.close()
+        try:
+            with self.assertRaises(WebSocketConnectionClosedException):
+                recv_into(sock, bytearray(16))
+        finally:
+            sock.close()
+
+    def test_recv_into_without_recv_into(self):
+        """Test recv_into falls back to recv for socket-like objects"""
+        mock_sock = Mock(spec=["recv", "gettimeout"])
+        mock_sock.recv.return_value = b"abc"
+        mock_sock.gettimeout.return_value = None
+        buffer = bytearray(8)
+
+        self.assertEqual(recv_into(mock_sock, buffer), 3)
+        self.assertEqual(bytes(buffer[:3]), b"abc")
+        mock_sock.recv.assert_called_once_with(8)
+
     def test_recv_line(self):
         """Test recv_line functionality"""
         mock_sock = Mock()
@@ -352,6 +424,35 @@ def test_send_partial_send_retry(self):
             mock_selector.select.assert_called()
             mock_selector.close.assert_called()
 
+    def test_send_buffers_sendmsg(self):
+        """Test send with a list of buffers uses a single sendmsg call"""
+        sock, peer = socket.socketpair()
+        try:
+            result = send(sock, [b"head", memoryview(b"payload")])
+            self.assertEqual(result, 11)
+            self.assertEqual(peer.recv(64), b"headpayload")
+        finally:
+            sock.close()
+            peer.close()
+
+    def test_send_buffers_without_sendmsg(self):
+        """Test send with a list of buffers on sockets without sendmsg"""
+        mock_sock = Mock(spec=["send", "gettimeout"])
+        mock_sock.send.side_effect = lambda data: len(data)
+        mock_sock.gettimeout.return_value = 30.0
+
+        # Small buffers are joined into one send call
+        self.assertEqual(send(mock_sock, [b"head", b"payload"]), 11)
+        mock_sock.send.assert_called_with(b"headpayload")
+
+        # Joined data is limited to the size of a TLS record
+        large = b"x" * 20000
+        self.assertEqual(send(mock_sock, [b"head", large]), 16384)
+
+        # Large buffers are sent as they are
+        self.assertEqual(send(mock_sock, [large, b"tail"]), 20000)
+        self.assertIs(mock_sock.send.call_args[0][0], large)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import os
+import tempfile
 import unittest
 import socket
 import ssl
@@ -11,7 +13,12 @@
     SSLWantWriteError,
     HAVE_SSL,
 )
-from websocket._http import _ssl_socket, _wrap_sni_socket
+from websocket._http import (
+    _clear_ssl_cache,
+    _save_ssl_session,
+    _ssl_socket,
+    _wrap_sni_socket,
+)
 from websocket._exceptions import WebSocketException
 from websocket._socket import recv, send
 
@@ -39,6 +46,10 @@ class SSLEdgeCasesTest(unittest.TestCase):
     def setUp(self):
         if not HAVE_SSL:
             self.skipTest("SSL not available")
+        # Contexts are cached by their options, whether ssl.SSLContext is
+        # patched or not.
+        _clear_ssl_cache()
+        self.addCleanup(_clear_ssl_cache)
 
     def test_ssl_handshake_failure(self):
         """Test SSL handshake failure scenarios"""
@@ -580,6 +591,8 @@ def test_ssl_hostname_verification_edge_cases(self):
 
         for cert_hostname, connect_hostname in test_cases:
             with self.subTest(cert=cert_hostname, hostname=connect_hostname):
+                # The cases use the same options, and a new mock context each.
+                _clear_ssl_cache()
                 with patch("ssl.SSLContext") as mock_ssl_context:
                     mock_context = Mock()
                     mock_ssl_context.return_value = mock_context
@@ -633,6 +646,61 @@ def test_ssl_memory_bio_edge_cases(self):
         except (ImportError, AttributeError):
             self.skipTest("SSL MemoryBIO not available")
 
+    def test_ssl_context_cache(self):
+        """Test that SSL contexts are reused by connections with the same options"""
+        mock_sock = Mock()
+
+        with patch("ssl.SSLContext") as mock_ssl_context:
+            mock_ssl_context.side_effect = lambda *args: Mock()
+            with tempfile.NamedTemporaryFile() as ca_certs:
+                sslopt = {"ca_certs": ca_certs.name, "ciphers": "HIGH"}
+                _ssl_socket(mock_sock, sslopt, "example.com")
+                _ssl_socket(mock_sock, dict(sslopt), "example.org")
+                self.assertEqual(mock_ssl_context.call_count, 1)
+
+                # Different options, or a renewed certificate file, need a
+                # new context
+                _ssl_socket(mock_sock, {"ciphers": "HIGH"}, "example.com")
+                self.assertEqual(mock_ssl_context.call_count, 2)
+                os.utime(ca_certs.name, ns=(0, 0))
+                _ssl_socket(mock_sock, sslopt, "example.com")
+                self.assertEqual(mock_ssl_context.call_count, 3)
+
+            # A given context is used as is
+            context = Mock()
+            _ssl_socket(mock_sock, {"context": context}, "example.com")
+            self.assertEqual(mock_ssl_context.call_count, 3)
+            context.wrap_socket.assert_called_once()
+
+    def test_ssl_session_resumption(self):
+        """Test that TLS sessions are resumed when reconnecting"""
+        mock_sock = Mock()
+
+        with patch("ssl.SSLContext") as mock_ssl_context:
+            mock_context = Mock()
+            mock_ssl_context.return_value = mock_context
+            mock_ssl_sock = Mock(spec=ssl.SSLSocket)
+            mock_ssl_sock.context = mock_context
+            mock_ssl_sock.server_hostname = "example.com"
+            mock_ssl_sock.session = Mock(has_ticket=True)
+            mock_context.wrap_socket.return_value = mock_ssl_sock
+
+            _ssl_socket(mock_sock, {}, "example.com", 443)
+            self.assertNotIn("session", mock_context.wrap_socket.call_args[1])
+            _save_ssl_session(mock_ssl_sock, 443)
+
+            _ssl_socket(mock_sock, {}, "example.com", 443)
+            self.assertIs(
+                mock_context.wrap_socket.call_args[1]["session"],
+                mock_ssl_sock.session,
+            )
+
+            # Sessions are kept per server
+            _ssl_socket(mock_sock, {}, "example.com", 8443)
+            self.assertNotIn("session", mock_context.wrap_socket.call_args[1])
+            _ssl_socket(mock_sock, {}, "example.org", 443)
+            self.assertNotIn("session", mock_context.wrap_socket.call_args[1])
+
 
 if __name__ == "__main__":
     unittest.main()
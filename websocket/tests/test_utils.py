@@ -91,6 +91,38 @@ def mock_import(name, *args, **kwargs):
             # Note: The fallback implementation may have different validation behavior
             # than wsaccel, so we focus on clearly invalid sequences
 
+    def test_utf8_validation_strict(self):
+        """Test UTF-8 validation rejects what RFC 3629 forbids"""
+        from websocket._utils import validate_utf8
+
+        self.assertTrue(validate_utf8(bytearray("€".encode("utf-8"))))
+        self.assertTrue(validate_utf8(memoryview(b"\xf4\x8f\xbf\xbf")))
+        self.assertFalse(validate_utf8(b"\xc0\xaf"))  # Overlong form
+        self.assertFalse(validate_utf8(b"\xed\xa0\x80"))  # Surrogate
+        self.assertFalse(validate_utf8(b"\xf4\x90\x80\x80"))  # Beyond U+10FFFF
+        self.assertFalse(validate_utf8(b"\xe2\x82"))  # Truncated
+        self.assertTrue(validate_utf8("Héllo"))
+        self.assertFalse(validate_utf8("\ud800"))
+
+    def test_incremental_utf8_validator(self):
+        """Test Utf8Validator with code points split between pieces"""
+        from websocket._utils import Utf8Validator
+
+        validator = Utf8Validator()
+        data = "Héllo €𝄞".encode("utf-8")
+        for i in range(len(data) + 1):
+            with self.subTest(split=i):
+                self.assertTrue(validator.validate(data[:i]))
+                self.assertTrue(validator.validate(data[i:], True))
+
+        self.assertTrue(validator.validate(b"\xe2\x82"))
+        self.assertFalse(validator.validate(b"", True))
+        self.assertTrue(validator.validate(b"\xe2\x82"))
+        self.assertFalse(validator.validate(b"\xe2"))
+        self.assertTrue(validator.validate(b"\xe2\x82"))
+        validator.reset()
+        self.assertTrue(validator.validate(b"ok", True))
+
     def test_extract_err_message(self):
         """Test extract_err_message function"""
         from websocket._utils import extract_err_message
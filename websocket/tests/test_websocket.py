@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 #
+import io
+import math
 import os
 import os.path
 import socket
 import unittest
 from base64 import decodebytes as base64decode
+from unittest.mock import patch
 
 import websocket as ws
+from websocket._compression import PerMessageDeflate
 from websocket._exceptions import (
     WebSocketBadStatusException,
     WebSocketAddressException,
@@ -15,6 +19,7 @@
 from websocket._handshake import _create_sec_websocket_key
 from websocket._handshake import _validate as _validate_header
 from websocket._http import read_headers
+from websocket._socket import _IOV_MAX
 from websocket._utils import validate_utf8
 
 """
@@ -92,6 +97,15 @@ def __init__(self, fname):
             self.add_packet(f.read())
 
 
+# Example key of RFC 6455 section 1.3, and a response accepting it.
+WS_KEY = "dGhlIHNhbXBsZSBub25jZQ=="
+HANDSHAKE_RESPONSE = (
+    b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+    b"Connection: Upgrade\r\n"
+    b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n\r\n"
+)
+
+
 class WebSocketTest(unittest.TestCase):
     def setUp(self):
         ws.enableTrace(TRACEABLE)
@@ -194,6 +208,104 @@ def test_send(self):
 
         self.assertEqual(sock.send_binary(b"1111111111101"), 19)
 
+    def test_send_partial(self):
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        # The socket accepts at most 3 bytes per send call
+        s.send = lambda data: SockMock.send(s, bytes(data[:3]))
+        self.assertEqual(sock.send("Hello"), 11)
+        self.assertEqual(b"".join(s.sent), b"\x81\x85abcd)\x07\x0f\x08\x0e")
+
+    def test_send_many(self):
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        messages = ["Hello", "こんにちは", "x" * 200]
+        length = sock.send_many(messages)
+        sent = b"".join(s.sent)
+        self.assertEqual(length, len(sent))
+
+        s.sent = []
+        for message in messages:
+            sock.send(message)
+        self.assertEqual(sent, b"".join(s.sent))
+        self.assertEqual(sock.send_many([], ws.ABNF.OPCODE_BINARY), 0)
+
+    def test_send_many_buffers(self):
+        # Thousands of messages, more buffers than a sendmsg() call takes,
+        # sent in pieces that end in the middle of buffers.
+        class SendmsgMock(SockMock):
+            def sendmsg(self, buffers):
+                data = b"".join(buffers)[:5000]
+                self.sent.append(data)
+                return len(data)
+
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SendmsgMock()
+        messages = [str(i) for i in range(3000)]
+        length = sock.send_many(messages)
+        sent = b"".join(s.sent)
+        self.assertEqual(length, len(sent))
+        s.sent = []
+        for message in messages:
+            sock.send(message)
+        self.assertEqual(sent, b"".join(s.sent))
+
+    def test_send_many_calls(self):
+        # The buffers, a header and a payload per message, are sent in as
+        # few sendmsg() calls as the system allows.
+        class SendmsgMock(SockMock):
+            def sendmsg(self, buffers):
+                self.sent.append(len(buffers))
+                return sum(len(buffer) for buffer in buffers)
+
+        sock = ws.WebSocket()
+        s = sock.sock = SendmsgMock()
+        messages = ["x" * 20] * 5000
+        self.assertEqual(sock.send_many(messages), 5000 * 26)
+        self.assertLessEqual(len(s.sent), math.ceil(2 * 5000 / _IOV_MAX))
+        self.assertLessEqual(max(s.sent), _IOV_MAX)
+
+    def test_send_stream(self):
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        reader = ws.WebSocket()
+        r = reader.sock = SockMock()
+        payload = bytes(range(256)) * 4
+        for source, opcode, sizes in (
+            (io.BytesIO(payload), ws.ABNF.OPCODE_BINARY, [300, 300, 300, 124]),
+            (bytearray(payload), ws.ABNF.OPCODE_BINARY, [300, 300, 300, 124]),
+            (memoryview(payload).cast("I"), ws.ABNF.OPCODE_BINARY, [300] * 3 + [124]),
+            (iter([payload[:500], b"", payload[500:]]), ws.ABNF.OPCODE_BINARY, None),
+            (["こんにちは", "x" * 10], ws.ABNF.OPCODE_TEXT, None),
+            (io.BytesIO(), ws.ABNF.OPCODE_BINARY, [0]),
+        ):
+            with self.subTest(source=source):
+                s.sent = []
+                length = sock.send_stream(source, opcode, fragment_size=300)
+                self.assertEqual(length, sum(len(data) for data in s.sent))
+                r.add_packet(b"".join(s.sent))
+                frames = []
+                while not frames or not frames[-1].fin:
+                    frames.append(reader.recv_frame())
+                self.assertEqual(frames[0].opcode, opcode)
+                for frame in frames[1:]:
+                    self.assertEqual(frame.opcode, ws.ABNF.OPCODE_CONT)
+                self.assertTrue(all(len(frame.data) <= 300 for frame in frames))
+                if sizes:
+                    self.assertEqual([len(frame.data) for frame in frames], sizes)
+                if opcode == ws.ABNF.OPCODE_TEXT:
+                    self.assertEqual(
+                        b"".join(frame.data for frame in frames),
+                        ("こんにちは" + "x" * 10).encode("utf-8"),
+                    )
+                elif sizes != [0]:
+                    self.assertEqual(b"".join(frame.data for frame in frames), payload)
+        self.assertRaises(ValueError, sock.send_stream, b"", fragment_size=0)
+
     def test_recv(self):
         # TODO: add longer frame data
         sock = ws.WebSocket()
@@ -209,6 +321,175 @@ def test_recv(self):
         data = sock.recv()
         self.assertEqual(data, "Hello")
 
+    def test_recv_pending(self):
+        sock = ws.WebSocket()
+        s = sock.sock = SockMock()
+        s.add_packet(b"\x81\x85abcd)\x07\x0f\x08\x0e" * 3)
+        self.assertEqual(sock.pending(), 0)
+        self.assertEqual(sock.recv(), "Hello")
+        self.assertEqual(sock.pending(), 2)
+        self.assertEqual(sock.recv(), "Hello")
+        self.assertEqual(sock.recv(), "Hello")
+        self.assertEqual(sock.pending(), 0)
+
+    def test_pipelined_handshake(self):
+        # Frames sent right after the handshake response, in the same read.
+        client, server = socket.socketpair()
+        self.addCleanup(server.close)
+        server.sendall(
+            HANDSHAKE_RESPONSE
+            + ws.ABNF(1, 0, 0, 0, ws.ABNF.OPCODE_TEXT, 0, b"Hello").format()
+            + ws.ABNF(1, 0, 0, 0, ws.ABNF.OPCODE_TEXT, 0, b"Wor").format()[:4]
+        )
+        sock = ws.WebSocket()
+        sock.connect(
+            "ws://example.com/", socket=client, header={"Sec-WebSocket-Key": WS_KEY}
+        )
+        self.assertEqual(sock.pending(), 1)
+        self.assertEqual(sock.recv(), "Hello")
+        server.sendall(b"r")
+        self.assertEqual(sock.recv(), "Wor")
+        sock.shutdown()
+
+    def test_permessage_deflate(self):
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        sock.permessage_deflate = PerMessageDeflate(max_decompressed_size=5)
+        sock.frame_buffer.allow_rsv1 = True
+        sock.send("Hello")
+        self.assertEqual(b"".join(s.sent), b"\xc1\x87abcd\x93*\xae\xad\xa8ec")
+
+        s.add_packet(b"\xc1\x07\xf2\x48\xcd\xc9\xc9\x07\x00")
+        self.assertEqual(sock.recv(), "Hello")
+        s.add_packet(b"\xc1\x05\xf2\x00\x11\x00\x00")
+        self.assertEqual(sock.recv(), "Hello")
+
+        s.sent = []
+        s.add_packet(b"\xc1\x08\xf2\x48\xcd\xc9\xc9\xcf\x07\x00")
+        self.assertRaises(ws.WebSocketPayloadException, sock.recv)
+        self.assertEqual(b"".join(s.sent), b"\x88\x82abcdb\x93")
+        self.assertIsNone(sock.sock)
+
+    def test_frame_capture(self):
+        capture = ws.FrameCapture(size=3, max_bytes=7)
+        sock = ws.WebSocket(frame_capture=capture)
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        sock.send("Hello")
+        s.add_packet(b"\x81\x05Hello")
+        self.assertEqual(sock.recv(), "Hello")
+        self.assertEqual(
+            [(frame.direction, frame.data, frame.length) for frame in capture],
+            [("send", b"\x81\x85abcd)", 11), ("recv", b"\x81\x05Hello", 7)],
+        )
+        self.assertEqual(
+            str(capture.frames[0]), "++Sent raw: b'\\x81\\x85abcd)' (4 more bytes)"
+        )
+
+        # Trace logs the captured bytes, without formatting the frames again.
+        s.add_packet(b"\x82\x01\x00")
+        with patch("websocket._logging._traceEnabled", True), patch.object(
+            ws.ABNF, "format", side_effect=AssertionError
+        ), self.assertLogs("websocket", "DEBUG") as logs:
+            self.assertEqual(sock.recv(), b"\x00")
+        self.assertIn("DEBUG:websocket:++Rcv raw: b'\\x82\\x01\\x00'", logs.output)
+        self.assertEqual(len(capture.frames), 3)
+        sock.send("Hello")
+        self.assertEqual(capture.frames[0].direction, "recv")
+
+    def test_frame_capture_sample(self):
+        capture = ws.FrameCapture(sample=3)
+        sock = ws.WebSocket(frame_capture=capture)
+        s = sock.sock = SockMock()
+        for i in range(7):
+            s.add_packet(ws.ABNF(1, 0, 0, 0, ws.ABNF.OPCODE_TEXT, 0, str(i)).format())
+        self.assertEqual([sock.recv() for _ in range(7)], [str(i) for i in range(7)])
+        self.assertEqual([frame.data[2:] for frame in capture], [b"0", b"3", b"6"])
+
+        # With trace enabled, a capture is created for the raw frames.
+        sock = ws.WebSocket()
+        with patch("websocket._logging._traceEnabled", True):
+            sock._get_capture()
+        self.assertIsInstance(sock.frame_buffer.capture, ws.FrameCapture)
+
+    def test_max_message_size(self):
+        for packets in (
+            [b"\x81\x06Hello!"],
+            [b"\x01\x03Hel", b"\x80\x03lo!"],
+        ):
+            with self.subTest(packets=packets):
+                sock = ws.WebSocket(max_message_size=5)
+                sock.set_mask_key(create_mask_key)
+                s = sock.sock = SockMock()
+                s.add_packet(b"\x81\x05Hello")
+                self.assertEqual(sock.recv(), "Hello")
+                for packet in packets:
+                    s.add_packet(packet)
+                self.assertRaises(ws.WebSocketMessageTooBigException, sock.recv)
+                self.assertEqual(b"".join(s.sent), b"\x88\x82abcdb\x93")
+                self.assertIsNone(sock.sock)
+
+    def test_recv_stream(self):
+        sock = ws.WebSocket()
+        sock.set_mask_key(create_mask_key)
+        s = sock.sock = SockMock()
+        # OPCODE=BINARY, FIN=0, masked, 10 bytes, then a ping
+        s.add_packet(b"\x02\x8aabcd" + ws.ABNF.mask(b"abcd", b"0123456789"))
+        s.add_packet(b"\x89\x02hi")
+        # OPCODE=CONT, FIN=1, 300 bytes received in pieces
+        s.add_packet(b"\x80\x7e\x01\x2c" + b"x" * 100)
+        s.add_packet(b"x" * 200)
+        s.add_packet(b"\x81\x05Hello")
+
+        message = sock.recv_stream()
+        self.assertEqual(message.opcode, ws.ABNF.OPCODE_BINARY)
+        chunks = []
+        while chunk := message.read(7):
+            self.assertLessEqual(len(chunk), 7)
+            chunks.append(chunk)
+        self.assertEqual(b"".join(chunks), b"0123456789" + b"x" * 300)
+        self.assertEqual(message.read(), b"")
+        self.assertEqual(message.size, 310)
+        # The ping was answered
+        self.assertEqual(s.sent, [b"\x8a\x82abcd\t\x0b"])
+        self.assertEqual(sock.recv(), "Hello")
+
+    def test_recv_stream_close(self):
+        sock = ws.WebSocket(max_message_size=20)
+        s = sock.sock = SockMock()
+        s.add_packet(b"\x81\x05Hello" + b"\x01\x03abc" + b"\x80\x03def")
+        s.add_packet(b"\x82\x02ok")
+        with sock.recv_stream() as message:
+            self.assertEqual(message.read(2), b"He")
+        self.assertTrue(message.closed)
+        with sock.recv_stream() as message:
+            pass
+        self.assertEqual(sock.recv(), b"ok")
+
+        s.add_packet(b"\x82\x7e\x00\x20")
+        self.assertRaises(ws.WebSocketMessageTooBigException, sock.recv_stream)
+
+        sock = ws.WebSocket(max_message_size=20)
+        s = sock.sock = SockMock()
+        s.add_packet(b"\x02\x0a0123456789" + b"\x00\x0a0123456789")
+        s.add_packet(b"\x80\x01!")
+        message = sock.recv_stream()
+        self.assertRaises(ws.WebSocketMessageTooBigException, message.read)
+
+        sock = ws.WebSocket()
+        s = sock.sock = SockMock()
+        s.add_packet(b"\x01\x02\xe2\x82" + b"\x88\x02\x03\xe8")
+        message = sock.recv_stream()
+        self.assertEqual(message.read(2), b"\xe2\x82")
+        self.assertRaises(ws.WebSocketConnectionClosedException, message.read)
+
+        sock = ws.WebSocket()
+        s = sock.sock = SockMock()
+        s.add_packet(b"\x81\x02\xe2\x82")
+        message = sock.recv_stream()
+        self.assertRaises(ws.WebSocketPayloadException, message.read)
+
     @unittest.skipUnless(TEST_WITH_INTERNET, "Internet-requiring tests are disabled")
     def test_iter(self):
         count = 2
@@ -270,6 +551,20 @@ def test_recv_with_simple_fragmentation(self):
         with self.assertRaises(ws.WebSocketConnectionClosedException):
             sock.recv()
 
+    def test_recv_with_invalid_utf8_fragment(self):
+        for fire_cont_frame in (False, True):
+            with self.subTest(fire_cont_frame=fire_cont_frame):
+                sock = ws.WebSocket(fire_cont_frame=fire_cont_frame)
+                s = sock.sock = SockMock()
+                # "€" split between two fragments
+                s.add_packet(b"\x01\x02\xe2\x82")
+                s.add_packet(b"\x80\x01\xac")
+                data = b"".join(sock.recv_data()[1] for _ in range(fire_cont_frame + 1))
+                self.assertEqual(data, "€".encode("utf-8"))
+                # The message fails on its first fragment, before it is complete
+                s.add_packet(b"\x01\x02\xe2\xff")
+                self.assertRaises(ws.WebSocketPayloadException, sock.recv)
+
     def test_recv_with_fire_event_of_fragmentation(self):
         sock = ws.WebSocket(fire_cont_frame=True)
         s = sock.sock = SockMock()